@@ -0,0 +1,13 @@
+"""
+Committee of the best models, with the uncertainty of their predictions.
+"""
+
+from .committee import (
+    Committee,
+    COMMITTEE_DIR_NAME,
+    COMMITTEE_POT_NAME,
+    UNCERTAINTY_NAME,
+    COMMITTEE_OVERHEAD_NAME,
+    COMMITTEE_SUMMARY_NAME,
+    write_committee_potential,
+    )
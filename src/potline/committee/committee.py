@@ -0,0 +1,201 @@
+"""
+Committee of the best deep-trained models, giving the uncertainty of the energies and forces
+on MD trajectories.
+"""
+
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+import yaml
+import numpy as np
+
+from ..model import read_pair_cmds
+from ..inference_bencher import MicroBencher
+
+COMMITTEE_DIR_NAME: str = 'committee'
+COMMITTEE_POT_NAME: str = 'committee.in'
+UNCERTAINTY_NAME: str = 'uncertainty.csv'
+COMMITTEE_OVERHEAD_NAME: str = 'committee_overhead.csv'
+COMMITTEE_SUMMARY_NAME: str = 'committee.yaml'
+UNCERTAINTY_FIELDS: list[str] = ['step', 'temperature', 'energy_mean', 'energy_std',
+                                 'force_dev_max', 'force_dev_mean', 'flagged']
+OVERHEAD_FIELDS: list[str] = ['structure', 'n_atoms', 'member_latency', 'committee_latency',
+                              'members_latency', 'overhead']
+
+def write_committee_potential(member_paths: list[Path], out_path: Path) -> Path:
+    """
+    Write the committee potential: the members combined by pair_style hybrid/scaled,
+    each scaled by 1/k, so that the energies and forces are the mean of the members.
+
+    Args:
+        - member_paths: potential files of the members
+        - out_path: path of the committee potential file
+
+    Returns:
+        Path: path of the committee potential file.
+    """
+    if len(member_paths) < 2:
+        raise ValueError('A committee needs at least 2 members.')
+    styles: list[tuple[str, str]] = [read_pair_cmds(path) for path in member_paths]
+    weight: float = 1 / len(styles)
+    lines: list[str] = [
+        '# Committee of the potentials, mean of the energies and forces of the members',
+        'pair_style hybrid/scaled ' + ' '.join(f'{weight:.17g} {style}' for style, _ in styles),
+    ] + [f'pair_coeff * * {style.split()[0]} {i+1} {coeff}' for i, (style, coeff) in enumerate(styles)]
+    with out_path.open('w', encoding='utf-8') as file:
+        file.write('\n'.join(lines) + '\n')
+    return out_path
+
+class Committee():
+    """
+    Class packaging the best models as a committee and running it through the LAMMPS Python module.
+    The MD trajectory is driven by the committee potential, every sample_interval steps each member
+    evaluates the current configuration in its own LAMMPS instance. The deviations of the members
+    give the uncertainty: the standard deviation of the energies per atom and the deviation of
+    the forces of each atom (root mean square distance of the members to their mean force).
+    The configurations beyond the thresholds are flagged, for the fallback DFT checks.
+
+    Args:
+        - member_paths: potential files of the members
+        - out_path: directory of the committee
+        - energy_threshold: energy deviation above which a configuration is flagged, in eV/atom
+        - force_threshold: maximum force deviation above which a configuration is flagged, in eV/angstrom
+        - lmp_args: additional command line arguments for LAMMPS (e.g. accelerator suffix)
+    """
+    def __init__(self, member_paths: list[Path], out_path: Path, energy_threshold: float = 0.005,
+                 force_threshold: float = 0.1, lmp_args: list[str] | None = None):
+        self._member_paths = member_paths
+        self._out_path = out_path
+        self._energy_threshold = energy_threshold
+        self._force_threshold = force_threshold
+        self._lmp_args = lmp_args
+        self._pot_path: Path = out_path / COMMITTEE_POT_NAME
+
+    def export(self) -> Path:
+        """
+        Write the committee potential in the committee directory.
+        """
+        self._out_path.mkdir(parents=True, exist_ok=True)
+        return write_committee_potential(self._member_paths, self._pot_path)
+
+    def run_md(self, structure_cmds: str, temperature: float = 600, n_steps: int = 1000,
+               sample_interval: int = 20, timestep: float = 0.001, seed: int = 4242) -> list[dict]:
+        """
+        Run NVT MD with the committee and write the uncertainty of the sampled configurations.
+
+        Args:
+            - structure_cmds: LAMMPS commands creating the structure
+            - temperature: temperature of the MD, in K
+            - n_steps: number of MD steps
+            - sample_interval: steps between two evaluations of the members
+            - timestep: timestep of the MD, in ps
+            - seed: seed of the initial velocities
+
+        Returns:
+            list: one row of uncertainty per sampled configuration.
+        """
+        driver = MicroBencher(self._pot_path, COMMITTEE_DIR_NAME,
+                              lmp_args=self._lmp_args).setup(structure_cmds)
+        members: list = []
+        rows: list[dict] = []
+        try:
+            for path in self._member_paths:
+                members.append(MicroBencher(path, COMMITTEE_DIR_NAME,
+                                            lmp_args=self._lmp_args).setup(structure_cmds))
+            driver.commands_string('\n'.join([
+                f'velocity        all create {temperature} {seed} mom yes rot yes dist gaussian',
+                f'fix             committee_md all nvt temp {temperature} {temperature} {100 * timestep}',
+                f'timestep        {timestep}',
+            ]))
+            n_atoms: int = int(driver.get_natoms())
+            for step in range(0, n_steps + 1, sample_interval):
+                if step > 0:
+                    driver.command(f'run {sample_interval} post no')
+                positions = driver.gather_atoms('x', 1, 3)
+                energies = np.empty(len(members))
+                forces = np.empty((len(members), n_atoms, 3))
+                for i, member in enumerate(members):
+                    member.scatter_atoms('x', 1, 3, positions)
+                    member.command('run 0 post no')
+                    energies[i] = float(member.get_thermo('pe')) / n_atoms
+                    forces[i] = np.array(member.gather_atoms('f', 1, 3), dtype=float).reshape(n_atoms, 3)
+                force_dev = np.sqrt(((forces - forces.mean(axis=0))**2).sum(axis=2).mean(axis=0))
+                energy_std: float = float(energies.std())
+                rows.append({
+                    'step': step,
+                    'temperature': float(driver.get_thermo('temp')),
+                    'energy_mean': float(energies.mean()),
+                    'energy_std': energy_std,
+                    'force_dev_max': float(force_dev.max()),
+                    'force_dev_mean': float(force_dev.mean()),
+                    'flagged': bool(energy_std > self._energy_threshold
+                                    or force_dev.max() > self._force_threshold),
+                })
+        finally:
+            for lmp in [driver] + members:
+                lmp.close()
+
+        with (self._out_path / UNCERTAINTY_NAME).open('w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=UNCERTAINTY_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        return rows
+
+    def bench_overhead(self, structures: dict[str, str], n_repeats: int = 20) -> list[dict]:
+        """
+        Time single energy and force evaluations of the committee potential and of its members.
+        The overhead is the latency of the committee relative to the mean latency of a member,
+        the latency of the members is the cost of the evaluations of the Python driver.
+
+        Args:
+            - structures: LAMMPS commands by structure name
+            - n_repeats: number of timed evaluations per structure
+
+        Returns:
+            list: one row of latencies per structure.
+        """
+        rows: list[dict] = []
+        for name, structure_cmds in structures.items():
+            n_atoms, committee_latencies = MicroBencher(self._pot_path, COMMITTEE_DIR_NAME, n_repeats,
+                                                        self._lmp_args).bench_structure(structure_cmds)
+            member_latencies: list[float] = [
+                float(MicroBencher(path, COMMITTEE_DIR_NAME, n_repeats, self._lmp_args)
+                      .bench_structure(structure_cmds)[1].mean())
+                for path in self._member_paths
+            ]
+            member_latency: float = float(np.mean(member_latencies))
+            rows.append({
+                'structure': name,
+                'n_atoms': n_atoms,
+                'member_latency': member_latency,
+                'committee_latency': float(committee_latencies.mean()),
+                'members_latency': float(np.sum(member_latencies)),
+                'overhead': float(committee_latencies.mean()) / member_latency,
+            })
+            print(f'{name}: committee {rows[-1]["overhead"]:.2f}x the latency of a member')
+
+        with (self._out_path / COMMITTEE_OVERHEAD_NAME).open('w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=OVERHEAD_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        return rows
+
+    def save_summary(self, samples: list[dict], overhead: list[dict]) -> dict:
+        """
+        Write the summary of the committee: members, thresholds, flagged configurations and overhead.
+        """
+        summary: dict = {
+            'members': [str(path) for path in self._member_paths],
+            'energy_threshold': self._energy_threshold,
+            'force_threshold': self._force_threshold,
+            'n_samples': len(samples),
+            'n_flagged': sum(row['flagged'] for row in samples),
+            'max_energy_std': max((row['energy_std'] for row in samples), default=None),
+            'max_force_dev': max((row['force_dev_max'] for row in samples), default=None),
+            'mean_overhead': float(np.mean([row['overhead'] for row in overhead])) if overhead else None,
+        }
+        with (self._out_path / COMMITTEE_SUMMARY_NAME).open('w', encoding='utf-8') as file:
+            yaml.safe_dump(summary, file, sort_keys=False)
+        return summary
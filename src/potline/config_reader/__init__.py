@@ -8,7 +8,15 @@ from .config_reader import (
     PropConfig,
     HyperConfig,
     DeepTrainConfig,
+    CommitteeConfig,
     JobConfig,
     MainSectionKW,
     GeneralKW,
+    MicroBenchKW,
+    LaunchTuningKW,
+    VariantsKW,
+    EarlyStoppingKW,
+    CommitteeKW,
+    ValidationKW,
+    FinetuningKW,
     )
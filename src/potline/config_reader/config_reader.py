@@ -16,6 +16,7 @@ class MainSectionKW(Enum):
     INFERENCE = 'inference'
     PROP_SIM = 'data_analysis'
     HYPER_SEARCH = 'hyper_search'
+    COMMITTEE = 'committee'
 
 class SlurmJobKW(Enum):
     """
@@ -37,12 +38,33 @@ class GeneralKW(Enum):
     CLUSTER = 'cluster'
     SWEEP_PATH = 'sweep_path'
     REPO_PATH = 'repo_path'
+    SELECTION = 'selection'
+    VALIDATION = 'validation'
+
+class ValidationKW(Enum):
+    """
+    Keywords of the evaluation of the converted potentials on a common test set.
+    """
+    DATASET_PATH = 'dataset_path'
+    BATCH_SIZE = 'batch_size'
+    ENERGY_KEY = 'energy_key'
+    FORCES_KEY = 'forces_key'
 
 class DeepTrainKW(Enum):
     """
     Deep training keywords for the configuration file.
     """
     MAX_EPOCHS = 'max_epochs'
+    EARLY_STOPPING = 'early_stopping'
+
+class EarlyStoppingKW(Enum):
+    """
+    Early stopping keywords of the deep training.
+    """
+    MIN_IMPROVEMENT = 'min_improvement'
+    TOP_K = 'top_k'
+    MIN_POINTS = 'min_points'
+    INTERVAL = 'interval'
 
 class InferenceKW(Enum):
     """
@@ -50,11 +72,44 @@ class InferenceKW(Enum):
     """
     PRE_STEPS = 'prerun_steps'
     MAX_STEPS = 'max_steps'
+    MICRO_BENCH = 'micro_bench'
+    PERF_HISTORY = 'perf_history_path'
+    LAUNCH_TUNING = 'launch_tuning'
+    VARIANTS = 'variants'
+
+class MicroBenchKW(Enum):
+    """
+    Micro-benchmark keywords for the configuration file.
+    """
+    N_REPEATS = 'n_repeats'
+    BULK_SIZES = 'bulk_sizes'
+    LATTICE = 'lattice'
+
+class VariantsKW(Enum):
+    """
+    Deployment variants keywords for the configuration file.
+    """
+    ENERGY_TOL = 'energy_tol'
+    FORCE_TOL = 'force_tol'
+    N_REPEATS = 'n_repeats'
+    LATTICE = 'lattice'
+
+class LaunchTuningKW(Enum):
+    """
+    Launch tuning keywords for the configuration file.
+    """
+    SUFFIXES = 'suffixes'
+    PROBE_STEPS = 'probe_steps'
+    CACHE_PATH = 'cache_path'
 
 class PropSimKW(Enum):
     """
     Keywords for the property simulation configuration.
     """
+    SCORE_WEIGHTS = 'score_weights'
+    PRESCREEN = 'prescreen'
+    CACHE_PATH = 'cache_path'
+    MATERIALS = 'materials'
 
 class HyperSearchKW(Enum):
     """
@@ -67,6 +122,34 @@ class HyperSearchKW(Enum):
     ENERGY_WEIGHT = 'energy_weight'
     OPTIMIZER_PARAMS = 'optimizer_params'
     HANDLE_COLLECT_ERRORS = 'handle_collect_errors'
+    SPEED_WEIGHT = 'speed_weight'
+    COST_SWEEP_PATHS = 'cost_sweep_paths'
+    DATASET_CACHE = 'dataset_cache'
+    SHARED_PREPROCESSING = 'shared_preprocessing'
+    MAX_PREPROCESSED_GROUPS = 'max_preprocessed_groups'
+    FINETUNING = 'finetuning'
+
+class FinetuningKW(Enum):
+    """
+    Keywords of the fine-tuning of a pretrained checkpoint by the hyperparameter search.
+    """
+    CHECKPOINT_PATH = 'checkpoint_path'
+    MAX_EPOCHS = 'max_epochs'
+
+class CommitteeKW(Enum):
+    """
+    Keywords for the committee configuration.
+    """
+    N_MEMBERS = 'n_members'
+    ENERGY_THRESHOLD = 'energy_threshold'
+    FORCE_THRESHOLD = 'force_threshold'
+    TEMPERATURE = 'temperature'
+    N_STEPS = 'n_steps'
+    SAMPLE_INTERVAL = 'sample_interval'
+    TIMESTEP = 'timestep'
+    LATTICE = 'lattice'
+    BULK_SIZE = 'bulk_size'
+    N_REPEATS = 'n_repeats'
 
 class JobConfig():
     """
@@ -93,7 +176,11 @@ class BenchConfig():
                  sweep_path: Path,
                  job_config: JobConfig,
                  model_name: str,
-                 best_n_models: int):
+                 best_n_models: int,
+                 micro_bench: dict | None = None,
+                 perf_history_path: Path | None = None,
+                 launch_tuning: dict | None = None,
+                 variants: dict | None = None):
         self.lammps_bin_path: Path = lammps_bin_path
         self.prerun_steps: int = prerun_steps
         self.max_steps: int = max_steps
@@ -101,6 +188,10 @@ class BenchConfig():
         self.job_config: JobConfig = job_config
         self.model_name: str = model_name
         self.best_n_models: int = best_n_models
+        self.micro_bench: dict | None = micro_bench
+        self.perf_history_path: Path | None = perf_history_path
+        self.launch_tuning: dict | None = launch_tuning
+        self.variants: dict | None = variants
 
 class PropConfig():
     """
@@ -110,12 +201,20 @@ class PropConfig():
                  sweep_path: Path,
                  job_config: JobConfig,
                  model_name: str,
-                 best_n_models: int):
+                 best_n_models: int,
+                 score_weights: dict | None = None,
+                 prescreen: dict | None = None,
+                 cache_path: Path | None = None,
+                 materials: list | None = None):
         self.lammps_bin_path: Path = lammps_bin_path
         self.sweep_path: Path = sweep_path
         self.job_config: JobConfig = job_config
         self.model_name: str = model_name
         self.best_n_models: int = best_n_models
+        self.score_weights: dict | None = score_weights
+        self.prescreen: dict | None = prescreen
+        self.cache_path: Path | None = cache_path
+        self.materials: list | None = materials
 
 class HyperConfig():
     """
@@ -130,7 +229,13 @@ class HyperConfig():
                  energy_weight: float,
                  optimizer_params: dict,
                  job_config: JobConfig,
-                 handle_collect_errors: bool,):
+                 handle_collect_errors: bool,
+                 speed_weight: float = 0.0,
+                 cost_sweep_paths: list[Path] | None = None,
+                 dataset_cache: bool = False,
+                 shared_preprocessing: bool = False,
+                 max_preprocessed_groups: int = 8,
+                 finetuning: dict | None = None):
         self.model_name: str = model_name
         self.sweep_path: Path = sweep_path
         self.max_iter: int = max_iter
@@ -141,6 +246,12 @@ class HyperConfig():
         self.optimizer_params: dict = optimizer_params
         self.job_config: JobConfig = job_config
         self.handle_collect_errors: bool = handle_collect_errors
+        self.speed_weight: float = speed_weight
+        self.cost_sweep_paths: list[Path] = cost_sweep_paths if cost_sweep_paths is not None else []
+        self.dataset_cache: bool = dataset_cache
+        self.shared_preprocessing: bool = shared_preprocessing
+        self.max_preprocessed_groups: int = max_preprocessed_groups
+        self.finetuning: dict | None = finetuning
 
 class DeepTrainConfig():
     """
@@ -151,13 +262,46 @@ class DeepTrainConfig():
                  job_config: JobConfig,
                  model_name: str,
                  energy_weight: float,
-                 best_n_models: int):
+                 best_n_models: int,
+                 early_stopping: dict | None = None):
         self.max_epochs: int = max_epochs
         self.sweep_path: Path = sweep_path
         self.job_config: JobConfig = job_config
         self.model_name: str = model_name
         self.energy_weight: float = energy_weight
         self.best_n_models: int = best_n_models
+        self.early_stopping: dict | None = early_stopping
+
+class CommitteeConfig():
+    """
+    Configuration class for the committee step.
+    """
+    def __init__(self, sweep_path: Path,
+                 job_config: JobConfig,
+                 model_name: str,
+                 n_members: int,
+                 energy_threshold: float = 0.005,
+                 force_threshold: float = 0.1,
+                 temperature: float = 600,
+                 n_steps: int = 1000,
+                 sample_interval: int = 20,
+                 timestep: float = 0.001,
+                 lattice: float | None = None,
+                 bulk_size: int = 4,
+                 n_repeats: int = 20):
+        self.sweep_path: Path = sweep_path
+        self.job_config: JobConfig = job_config
+        self.model_name: str = model_name
+        self.n_members: int = n_members
+        self.energy_threshold: float = energy_threshold
+        self.force_threshold: float = force_threshold
+        self.temperature: float = temperature
+        self.n_steps: int = n_steps
+        self.sample_interval: int = sample_interval
+        self.timestep: float = timestep
+        self.lattice: float | None = lattice
+        self.bulk_size: int = bulk_size
+        self.n_repeats: int = n_repeats
 
 class GeneralConfig():
     """
@@ -170,7 +314,9 @@ class GeneralConfig():
                  cluster: str,
                  sweep_path: Path,
                  job_config: JobConfig,
-                 repo_path: Path):
+                 repo_path: Path,
+                 selection: str = 'loss',
+                 validation: dict | None = None):
         self.lammps_bin_path: Path = lammps_bin_path
         self.model_name: str = model_name
         self.best_n_models: int = best_n_models
@@ -179,6 +325,8 @@ class GeneralConfig():
         self.sweep_path: Path = sweep_path
         self.job_config: JobConfig = job_config
         self.repo_path: Path = repo_path
+        self.selection: str = selection
+        self.validation: dict | None = validation
 
 def patify(config_dict: dict[str, Any]) -> dict:
     """
@@ -198,6 +346,7 @@ class ConfigReader():
     - deep_training: configuration for the deep training after the hyperparameter search.
     - inference: configuration for the inference benchmark with LAMMPS.
     - data_analysis: configuration for the data analysis on mechanical properties with LAMMPS.
+    - committee: (optional) configuration for the committee of the best models.
     """
     def __init__(self, file_path: Path):
         if not file_path.exists() or not file_path.is_file():
@@ -263,6 +412,17 @@ class ConfigReader():
             self.get_config_section(MainSectionKW.HYPER_SEARCH.value)[HyperSearchKW.OPTIMIZER_PARAMS.value],
             self.get_slurm_config(MainSectionKW.HYPER_SEARCH.value),
             bool(str(self.get_config_section(MainSectionKW.HYPER_SEARCH.value)[HyperSearchKW.HANDLE_COLLECT_ERRORS.value])),
+            float(str(self.get_config_section(
+                MainSectionKW.HYPER_SEARCH.value).get(HyperSearchKW.SPEED_WEIGHT.value, 0.0))),
+            [Path(str(path)) for path in self.get_config_section(
+                MainSectionKW.HYPER_SEARCH.value).get(HyperSearchKW.COST_SWEEP_PATHS.value, [])],
+            bool(self.get_config_section(MainSectionKW.HYPER_SEARCH.value).get(
+                HyperSearchKW.DATASET_CACHE.value, False)),
+            bool(self.get_config_section(MainSectionKW.HYPER_SEARCH.value).get(
+                HyperSearchKW.SHARED_PREPROCESSING.value, False)),
+            int(str(self.get_config_section(MainSectionKW.HYPER_SEARCH.value).get(
+                HyperSearchKW.MAX_PREPROCESSED_GROUPS.value, 8))),
+            self.get_config_section(MainSectionKW.HYPER_SEARCH.value).get(HyperSearchKW.FINETUNING.value),
         )
 
     def get_bench_config(self) -> BenchConfig:
@@ -276,6 +436,10 @@ class ConfigReader():
             self.get_slurm_config(MainSectionKW.INFERENCE.value),
             str(self.get_config_section(MainSectionKW.GENERAL.value)[GeneralKW.MODEL.value]),
             int(str(self.get_config_section(MainSectionKW.GENERAL.value)[GeneralKW.BEST_N.value])),
+            self.get_config_section(MainSectionKW.INFERENCE.value).get(InferenceKW.MICRO_BENCH.value),
+            self.get_config_section(MainSectionKW.INFERENCE.value).get(InferenceKW.PERF_HISTORY.value),
+            self.get_config_section(MainSectionKW.INFERENCE.value).get(InferenceKW.LAUNCH_TUNING.value),
+            self.get_config_section(MainSectionKW.INFERENCE.value).get(InferenceKW.VARIANTS.value),
         )
 
     def get_prop_config(self) -> PropConfig:
@@ -287,6 +451,10 @@ class ConfigReader():
             self.get_slurm_config(MainSectionKW.PROP_SIM.value),
             str(self.get_config_section(MainSectionKW.GENERAL.value)[GeneralKW.MODEL.value]),
             int(str(self.get_config_section(MainSectionKW.GENERAL.value)[GeneralKW.BEST_N.value])),
+            self.get_config_section(MainSectionKW.PROP_SIM.value).get(PropSimKW.SCORE_WEIGHTS.value),
+            self.get_config_section(MainSectionKW.PROP_SIM.value).get(PropSimKW.PRESCREEN.value),
+            self.get_config_section(MainSectionKW.PROP_SIM.value).get(PropSimKW.CACHE_PATH.value),
+            self.get_config_section(MainSectionKW.PROP_SIM.value).get(PropSimKW.MATERIALS.value),
         )
 
     def get_deep_train_config(self) -> DeepTrainConfig:
@@ -298,7 +466,34 @@ class ConfigReader():
             self.get_slurm_config(MainSectionKW.DEEP_TRAINING.value),
             str(self.get_config_section(MainSectionKW.GENERAL.value)[GeneralKW.MODEL.value]),
             float(str(self.get_config_section(MainSectionKW.HYPER_SEARCH.value)[HyperSearchKW.ENERGY_WEIGHT.value])),
-            int(str(self.get_config_section(MainSectionKW.GENERAL.value)[GeneralKW.BEST_N.value]))
+            int(str(self.get_config_section(MainSectionKW.GENERAL.value)[GeneralKW.BEST_N.value])),
+            self.get_config_section(MainSectionKW.DEEP_TRAINING.value).get(DeepTrainKW.EARLY_STOPPING.value),
+        )
+
+    def get_committee_config(self) -> CommitteeConfig:
+        if MainSectionKW.COMMITTEE.value not in self.config_data:
+            raise ValueError('No committee configuration found in the config file.')
+        committee_config: dict = self.get_config_section(MainSectionKW.COMMITTEE.value)
+        best_n: int = int(str(self.get_config_section(MainSectionKW.GENERAL.value)[GeneralKW.BEST_N.value]))
+        n_members: int = int(str(committee_config.get(CommitteeKW.N_MEMBERS.value, best_n)))
+        if n_members > best_n:
+            # only the best models are deep-trained and converted
+            raise ValueError(f'The committee has {n_members} members, more than the {best_n} best models.')
+        return CommitteeConfig(
+            Path(str(self.get_config_section(MainSectionKW.GENERAL.value)[GeneralKW.SWEEP_PATH.value])),
+            self.get_slurm_config(MainSectionKW.COMMITTEE.value),
+            str(self.get_config_section(MainSectionKW.GENERAL.value)[GeneralKW.MODEL.value]),
+            n_members,
+            float(str(committee_config.get(CommitteeKW.ENERGY_THRESHOLD.value, 0.005))),
+            float(str(committee_config.get(CommitteeKW.FORCE_THRESHOLD.value, 0.1))),
+            float(str(committee_config.get(CommitteeKW.TEMPERATURE.value, 600))),
+            int(str(committee_config.get(CommitteeKW.N_STEPS.value, 1000))),
+            int(str(committee_config.get(CommitteeKW.SAMPLE_INTERVAL.value, 20))),
+            float(str(committee_config.get(CommitteeKW.TIMESTEP.value, 0.001))),
+            float(str(committee_config[CommitteeKW.LATTICE.value])) \
+                if CommitteeKW.LATTICE.value in committee_config else None,
+            int(str(committee_config.get(CommitteeKW.BULK_SIZE.value, 4))),
+            int(str(committee_config.get(CommitteeKW.N_REPEATS.value, 20))),
         )
 
     def get_general_config(self) -> GeneralConfig:
@@ -312,5 +507,7 @@ class ConfigReader():
             str(self.get_config_section(MainSectionKW.GENERAL.value)[GeneralKW.CLUSTER.value]),
             Path(str(self.get_config_section(MainSectionKW.GENERAL.value)[GeneralKW.SWEEP_PATH.value])),
             self.get_slurm_config(MainSectionKW.GENERAL.value),
-            Path(str(self.get_config_section(MainSectionKW.GENERAL.value)[GeneralKW.REPO_PATH.value]))
+            Path(str(self.get_config_section(MainSectionKW.GENERAL.value)[GeneralKW.REPO_PATH.value])),
+            str(self.get_config_section(MainSectionKW.GENERAL.value).get(GeneralKW.SELECTION.value, 'loss')),
+            self.get_config_section(MainSectionKW.GENERAL.value).get(GeneralKW.VALIDATION.value),
         )
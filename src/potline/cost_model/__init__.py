@@ -0,0 +1,11 @@
+"""
+Inference cost model.
+"""
+
+from .cost_model import (
+    InferenceCostModel,
+    COST_MODEL_NAME,
+    collect_bench_results,
+    get_measured_costs,
+    read_bench_cost,
+    )
@@ -0,0 +1,211 @@
+"""
+Inference cost model fitted on the results of the LAMMPS inference benchmark.
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+from pathlib import Path
+
+import yaml
+import numpy as np
+
+from ..inference_bencher import (
+    INFERENCE_BENCH_DIR_NAME,
+    BENCH_TIMINGS_NAME,
+    COST_FEATURES_NAME,
+    BENCH_N_ATOMS,
+    )
+from ..loss_logger import INFO_FILENAME
+
+COST_MODEL_NAME: str = 'cost_model.yaml'
+
+def read_bench_cost(bench_model_path: Path) -> float | None:
+    """
+    Read the measured inference cost of a benchmarked model.
+
+    Args:
+        - bench_model_path: path to the benchmark directory of the model
+
+    Returns:
+        float | None: time per atom-step in seconds, None if not available.
+    """
+    timings_path: Path = bench_model_path / BENCH_TIMINGS_NAME
+    if not timings_path.exists():
+        return None
+    with timings_path.open('r', encoding='utf-8') as file:
+        timings: dict = next(csv.DictReader(file))
+
+    n_steps: int = int(timings['max_steps']) - int(timings['prerun_steps'])
+    time_diff: float = float(timings['time_diff'])
+    # timings are measured in whole seconds, too short runs are not informative
+    if n_steps <= 0 or time_diff <= 0:
+        return None
+    return time_diff / (n_steps * BENCH_N_ATOMS)
+
+def _get_bench_dirs(sweep_path: Path) -> list[Path]:
+    bench_path: Path = sweep_path / INFERENCE_BENCH_DIR_NAME
+    if not bench_path.is_dir():
+        return []
+    return sorted(d for d in bench_path.iterdir() if d.is_dir())
+
+def collect_bench_results(sweep_path: Path) -> list[tuple[dict[str, float], float]]:
+    """
+    Collect the cost features and the measured inference cost of the benchmarked models of a sweep.
+
+    Args:
+        - sweep_path: path to the sweep
+
+    Returns:
+        list: pairs of cost features and time per atom-step in seconds.
+    """
+    results: list[tuple[dict[str, float], float]] = []
+    for model_path in _get_bench_dirs(sweep_path):
+        features_path: Path = model_path / COST_FEATURES_NAME
+        cost: float | None = read_bench_cost(model_path)
+        if cost is None or not features_path.exists():
+            continue
+        with features_path.open('r', encoding='utf-8') as file:
+            features: dict = yaml.safe_load(file)
+        results.append((features, cost))
+    return results
+
+def get_measured_costs(sweep_path: Path) -> dict[tuple[int, int], float]:
+    """
+    Get the measured inference cost of the benchmarked models of a sweep.
+
+    Args:
+        - sweep_path: path to the sweep
+
+    Returns:
+        dict: time per atom-step in seconds, by (iteration, subiteration) of the model.
+    """
+    costs: dict[tuple[int, int], float] = {}
+    for model_path in _get_bench_dirs(sweep_path):
+        cost: float | None = read_bench_cost(model_path)
+        if cost is None or not (model_path / INFO_FILENAME).exists():
+            continue
+        with (model_path / INFO_FILENAME).open('r', encoding='utf-8') as file:
+            info: dict = yaml.safe_load(file)
+        costs[(int(info['iteration']), int(info['subiteration']))] = cost
+    return costs
+
+class InferenceCostModel():
+    """
+    Power-law model of the inference time per atom-step as a function of the model hyperparameters.
+    Fitted as a ridge regression in log space.
+
+    Args:
+        - feature_names: names of the cost features
+        - coeffs: regression coefficients, the first one is the intercept
+        - reference_cost: typical cost of the training samples, used to normalize predictions
+    """
+    def __init__(self, feature_names: list[str], coeffs: list[float], reference_cost: float):
+        self.feature_names: list[str] = feature_names
+        self.coeffs: list[float] = coeffs
+        self.reference_cost: float = reference_cost
+
+    def predict(self, features: dict[str, float]) -> float:
+        """
+        Predict the inference cost of a model.
+
+        Args:
+            - features: cost features of the model
+
+        Returns:
+            float: predicted time per atom-step in seconds.
+        """
+        x = InferenceCostModel._design_row(self.feature_names, features)
+        return float(math.exp(float(np.dot(self.coeffs, x))))
+
+    def predict_relative(self, features: dict[str, float]) -> float:
+        """
+        Predict the inference cost of a model relative to the reference cost.
+
+        Args:
+            - features: cost features of the model
+
+        Returns:
+            float: predicted cost divided by the reference cost.
+        """
+        return self.predict(features) / self.reference_cost
+
+    @staticmethod
+    def fit(samples: list[tuple[dict[str, float], float]], ridge: float = 1e-3) -> InferenceCostModel:
+        """
+        Fit the cost model.
+
+        Args:
+            - samples: pairs of cost features and measured time per atom-step
+            - ridge: regularization strength, the intercept is not regularized
+
+        Returns:
+            InferenceCostModel: the fitted model.
+        """
+        if not samples:
+            raise ValueError("No benchmark results available to fit the cost model.")
+
+        feature_names: list[str] = sorted({name for features, _ in samples for name in features})
+        x = np.array([InferenceCostModel._design_row(feature_names, features) for features, _ in samples])
+        y = np.log(np.array([cost for _, cost in samples]))
+
+        penalty = ridge * np.eye(x.shape[1])
+        penalty[0, 0] = 0.0
+        coeffs = np.linalg.solve(x.T @ x + penalty, x.T @ y)
+
+        return InferenceCostModel(feature_names, [float(c) for c in coeffs], float(np.exp(np.median(y))))
+
+    @staticmethod
+    def from_sweeps(sweep_paths: list[Path]) -> InferenceCostModel:
+        """
+        Fit the cost model on the inference benchmarks of previous sweeps.
+
+        Args:
+            - sweep_paths: paths to the sweeps
+
+        Returns:
+            InferenceCostModel: the fitted model.
+        """
+        samples: list[tuple[dict[str, float], float]] = []
+        for sweep_path in sweep_paths:
+            samples.extend(collect_bench_results(sweep_path))
+        print(f"Fitting cost model on {len(samples)} benchmark results.")
+        return InferenceCostModel.fit(samples)
+
+    def save(self, filepath: Path):
+        """
+        Save the cost model to a file.
+
+        Args:
+            - filepath: path to the file
+        """
+        with filepath.open('w', encoding='utf-8') as file:
+            yaml.safe_dump({
+                'feature_names': self.feature_names,
+                'coeffs': self.coeffs,
+                'reference_cost': self.reference_cost,
+            }, file)
+
+    @staticmethod
+    def load(filepath: Path) -> InferenceCostModel:
+        """
+        Load the cost model from a file.
+
+        Args:
+            - filepath: path to the file
+
+        Returns:
+            InferenceCostModel: the loaded model.
+        """
+        with filepath.open('r', encoding='utf-8') as file:
+            data: dict = yaml.safe_load(file)
+        return InferenceCostModel(data['feature_names'], data['coeffs'], float(data['reference_cost']))
+
+    @staticmethod
+    def _design_row(feature_names: list[str], features: dict[str, float]) -> np.ndarray:
+        """
+        Build the regression row of a model: intercept followed by the log-scaled features.
+        """
+        values = [float(features.get(name, 0.0)) for name in feature_names]
+        return np.concatenate(([1.0], np.log1p(np.maximum(values, 0.0))))
@@ -0,0 +1,9 @@
+"""
+Per-sweep cache of the training datasets.
+"""
+
+from .dataset_cache import (
+    DatasetCache,
+    DATASET_CACHE_DIR_NAME,
+    DATASET_KEYS,
+    )
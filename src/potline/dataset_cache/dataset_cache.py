@@ -0,0 +1,91 @@
+"""
+Per-sweep cache of the training datasets, prepared once and shared by all the fits.
+"""
+
+from __future__ import annotations
+
+import os
+import gzip
+import shutil
+import hashlib
+from pathlib import Path
+
+DATASET_CACHE_DIR_NAME: str = 'dataset_cache'
+COMPRESSED_SUFFIXES: list[str] = ['.gzip', '.gz']
+# Only the pickled dataframes are decompressed: pacemaker reads them with the gzip compression only
+# if the name ends with gzip and gracemaker with the compression inferred from the extension,
+# so both read the uncompressed .pckl as a plain pickle
+PICKLE_SUFFIXES: list[str] = ['.pckl', '.pkl']
+# Dataset paths in the fit configurations: pacemaker and gracemaker, then MACE
+DATASET_KEYS: list[tuple[str, ...]] = [
+    ('data', 'filename'),
+    ('data', 'test_filename'),
+    ('train_file',),
+    ('valid_file',),
+    ('test_file',),
+]
+
+class DatasetCache():
+    """
+    Class preparing the datasets of the fits once per sweep. The compressed pickled datasets
+    (e.g. pckl.gzip) are stored uncompressed with the .pckl extension, so that the fits skip
+    the decompression and the fits packed on a node share the dataset through the page cache.
+    The other datasets are used as they are.
+    An entry is keyed on the path, size and modification time of the source dataset.
+
+    Args:
+        - cache_path: directory of the cache
+    """
+    def __init__(self, cache_path: Path):
+        self._cache_path = cache_path
+
+    @staticmethod
+    def get_key(dataset_path: Path) -> str:
+        stat = dataset_path.stat()
+        return hashlib.sha256(
+            f'{dataset_path.resolve()} {stat.st_size} {stat.st_mtime_ns}'.encode()).hexdigest()[:16]
+
+    def prepare(self, dataset_path: Path) -> Path:
+        """
+        Get the prepared dataset, prepare it if not cached.
+
+        Args:
+            - dataset_path: path to the source dataset
+
+        Returns:
+            Path: path to the dataset used by the fits.
+        """
+        stem: Path = Path(dataset_path.stem)
+        if dataset_path.suffix not in COMPRESSED_SUFFIXES or stem.suffix not in PICKLE_SUFFIXES \
+                or not dataset_path.exists():
+            return dataset_path
+
+        cached_path: Path = self._cache_path / f'{stem.stem}.{self.get_key(dataset_path)}{stem.suffix}'
+        if cached_path.exists():
+            return cached_path
+
+        print(f'Preparing {dataset_path} in {cached_path}')
+        self._cache_path.mkdir(parents=True, exist_ok=True)
+        tmp_path: Path = cached_path.with_name(f'.{cached_path.name}.{os.getpid()}')
+        with gzip.open(dataset_path, 'rb') as file_in, tmp_path.open('wb') as file_out:
+            shutil.copyfileobj(file_in, file_out, 1 << 24)
+        os.replace(tmp_path, cached_path)
+        return cached_path
+
+    def prepare_params(self, params: dict) -> dict:
+        """
+        Point the datasets of the fit parameters to the prepared ones.
+
+        Args:
+            - params: parameters of the fits, see DATASET_KEYS
+
+        Returns:
+            dict: the parameters, updated in place.
+        """
+        for keys in DATASET_KEYS:
+            section: dict = params
+            for key in keys[:-1]:
+                section = section.get(key) if isinstance(section.get(key), dict) else {}
+            if isinstance(section.get(keys[-1]), str):
+                section[keys[-1]] = str(self.prepare(Path(section[keys[-1]])))
+        return params
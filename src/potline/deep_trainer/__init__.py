@@ -3,3 +3,4 @@ Deep trainer.
 """
 
 from .deep_trainer import DeepTrainer, DEEP_TRAIN_DIR_NAME
+from .curve_monitor import CurveMonitor, CURVE_MONITOR_NAME, fit_learning_curve
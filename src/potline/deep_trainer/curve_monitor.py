@@ -0,0 +1,200 @@
+"""
+Monitor of the validation curve of a deep training run, stopping it once converged.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import signal
+import subprocess
+from pathlib import Path
+from typing import Callable
+
+import yaml
+import numpy as np
+from scipy.optimize import curve_fit # type: ignore
+from xpot import maths # type: ignore
+
+from ..model import PotModel, create_model, convert_model
+
+CURVE_MONITOR_NAME: str = 'curve_monitor.yaml'
+
+def power_law(t: np.ndarray, a: float, b: float, c: float) -> np.ndarray:
+    return a + b * t**-c
+
+def exp_decay(t: np.ndarray, a: float, b: float, c: float) -> np.ndarray:
+    return a + b * np.exp(-c * t)
+
+LEARNING_CURVES: dict[str, Callable[..., np.ndarray]] = {
+    'power_law': power_law,
+    'exp_decay': exp_decay,
+}
+
+def fit_learning_curve(epochs: np.ndarray, losses: np.ndarray,
+                       max_epochs: float | None = None) -> tuple[str, float] | None:
+    """
+    Fit the learning curve models to a validation curve, the predicted loss is the best fit
+    evaluated at the end of the training budget, or its asymptote without budget.
+    The evaluations before the training (epoch 0) are not fitted, the power law diverges there.
+
+    Args:
+        - epochs: epochs of the evaluations
+        - losses: validation losses
+        - max_epochs: training budget, None for an infinite training
+
+    Returns:
+        tuple | None: name of the best model and its predicted loss, None if no model could be fitted.
+    """
+    trained: np.ndarray = epochs > 0
+    epochs, losses = epochs[trained], losses[trained]
+    if len(losses) < 3: # as many points as parameters
+        return None
+    t: np.ndarray = epochs / epochs[-1] # scaled, so that the initial guesses fit all budgets
+    best: tuple[str, float] | None = None
+    best_sse: float = np.inf
+    for name, curve in LEARNING_CURVES.items():
+        try:
+            params, _ = curve_fit(curve, t, losses,
+                                  p0=(0.9 * losses.min(), max(losses[0] - losses.min(), 1e-12), 1.0),
+                                  bounds=([0, 0, 0], [losses.min(), np.inf, np.inf]), maxfev=5000)
+        except (RuntimeError, ValueError):
+            continue
+        sse: float = float(np.sum((curve(t, *params) - losses)**2))
+        if sse < best_sse:
+            predicted: float = float(params[0]) if max_epochs is None \
+                else float(curve(np.array(max_epochs / epochs[-1]), *params))
+            best, best_sse = (name, predicted), sse
+    return best
+
+def get_curve(model: PotModel, energy_weight: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get the validation curve of a model with the total loss of the sweep, missing losses are dropped.
+    """
+    epochs, losses = model.collect_loss_curve()
+    total = np.array([maths.calculate_loss(loss.energy, loss.force, energy_weight) for loss in losses],
+                     dtype=float)
+    valid = np.isfinite(total) & (total < np.finfo(np.float32).max)
+    return np.array(epochs, dtype=float)[valid], total[valid]
+
+class CurveMonitor():
+    """
+    Class running the fit of a deep training run while following its validation curve.
+    The learning curve models are fitted to the curve, the run is stopped once the
+    improvement predicted by the end of the training budget is under a threshold, or once its
+    predicted loss cannot reach the current best losses of the other runs. The stopped
+    model is then finalized and converted, without waiting for the other runs.
+
+    Args:
+        - model: model trained in its output directory
+        - model_name: name of the model, to read the other runs
+        - energy_weight: weight of the energy loss
+        - min_improvement: relative improvement of the validation loss under which the run is stopped
+        - top_k: rank the run must be able to reach among the runs, None to disable
+        - min_points: number of evaluations before the first extrapolation
+        - interval: seconds between two checks
+        - max_epochs: training budget of the run, None to extrapolate to an infinite training
+    """
+    def __init__(self, model: PotModel, model_name: str, energy_weight: float, min_improvement: float = 0.01,
+                 top_k: int | None = None, min_points: int = 10, interval: float = 300,
+                 max_epochs: int | None = None):
+        self._model = model
+        self._model_name = model_name
+        self._energy_weight = energy_weight
+        self._min_improvement = min_improvement
+        self._top_k = top_k
+        self._min_points = min_points
+        self._interval = interval
+        self._max_epochs = max_epochs
+
+    def get_other_best_losses(self) -> list[float]:
+        """
+        Get the best validation losses reached so far by the other runs of the deep training.
+        """
+        out_path: Path = self._model.get_out_path()
+        best_losses: list[float] = []
+        for run_path in out_path.parent.iterdir():
+            if not run_path.is_dir() or run_path == out_path:
+                continue
+            try:
+                _, losses = get_curve(create_model(self._model_name, run_path), self._energy_weight)
+            except (OSError, ValueError, KeyError, TypeError, yaml.YAMLError):
+                continue
+            if len(losses) > 0:
+                best_losses.append(float(losses.min()))
+        return best_losses
+
+    def check(self) -> dict | None:
+        """
+        Check whether the run has to be stopped.
+
+        Returns:
+            dict | None: the state of the run and the reason to stop it, None to continue.
+        """
+        epochs, losses = get_curve(self._model, self._energy_weight)
+        if len(losses) < self._min_points:
+            return None
+        fit: tuple[str, float] | None = fit_learning_curve(epochs, losses, self._max_epochs)
+        if fit is None:
+            return None
+
+        best_loss: float = float(losses.min())
+        state: dict = {
+            'epoch': int(epochs[-1]),
+            'best_loss': best_loss,
+            'curve': fit[0],
+            'predicted_loss': fit[1],
+        }
+        if best_loss - fit[1] < self._min_improvement * best_loss:
+            return {**state, 'reason': 'converged'}
+        if self._top_k is not None:
+            n_better: int = sum(loss < fit[1] for loss in self.get_other_best_losses())
+            if n_better >= self._top_k:
+                return {**state, 'reason': f'cannot reach the top {self._top_k}'}
+        return None
+
+    def run(self, fit_cmd: str) -> int:
+        """
+        Run the fit, stop it if needed, then finalize and convert the model.
+
+        Args:
+            - fit_cmd: fitting command, run in the output directory of the model
+
+        Returns:
+            int: return code of the fit, 0 if stopped.
+        """
+        out_path: Path = self._model.get_out_path()
+        process = subprocess.Popen(fit_cmd, shell=True, cwd=out_path, start_new_session=True)
+        stop: dict | None = None
+        while process.poll() is None:
+            time.sleep(self._interval)
+            if process.poll() is not None:
+                break
+            try:
+                stop = self.check()
+            except (OSError, ValueError, KeyError, TypeError, yaml.YAMLError) as exc:
+                print(f'Learning curve check failed: {exc}')
+                continue
+            if stop is not None:
+                print(f'Stopping the fit at epoch {stop["epoch"]}: {stop["reason"]}')
+                os.killpg(process.pid, signal.SIGINT)
+                process.wait()
+                try:
+                    self._model.finalize_stopped_fit(stop['epoch'])
+                    stop['finalized'] = True
+                except subprocess.CalledProcessError as exc:
+                    print(f'Finalization of the stopped fit failed: {exc}')
+                    stop['finalized'] = False
+                break
+
+        with (out_path / CURVE_MONITOR_NAME).open('w', encoding='utf-8') as file:
+            yaml.safe_dump({'stopped': stop is not None, **(stop or {})}, file, sort_keys=False)
+
+        return_code: int = 0 if stop is not None else process.returncode
+        if return_code == 0 and (stop is None or stop['finalized']):
+            try:
+                convert_model(self._model)
+                self._model.create_potential()
+            except Exception as exc: # pylint: disable=broad-except
+                print(f'Conversion of {out_path} failed, left to the conversion job: {exc}')
+        return return_code
@@ -3,9 +3,11 @@ DeepTrainer class for training after hyperparameter search.
 """
 
 from pathlib import Path
+from functools import partial
 
 from ..config_reader import ConfigReader
 from ..loss_logger import LossLogger, ModelTracker
+from ..stager import Stager, RunDir
 
 DEEP_TRAIN_DIR_NAME: str = 'deep_train'
 
@@ -25,12 +27,13 @@ class DeepTrainer():
 
     def prep_deep(self) -> None:
         self._out_path.mkdir(exist_ok=True)
-        for i, tracker in enumerate(self._tracker_list):
-            iter_path = self._out_path / str(i+1)
-            iter_path.mkdir(exist_ok=True)
-            tracker.model.switch_out_path(iter_path)
-            tracker.model.set_config_maxiter(self._config.max_epochs)
-            tracker.save_info(iter_path)
+        Stager().stage([RunDir(self._out_path / str(i+1), writers=[partial(self._prep_model, tracker)])
+                        for i, tracker in enumerate(self._tracker_list)])
+
+    def _prep_model(self, tracker: ModelTracker, iter_path: Path):
+        tracker.model.switch_out_path(iter_path)
+        tracker.model.set_config_maxiter(self._config.max_epochs)
+        tracker.save_info(iter_path)
 
     def collect(self):
         loss_logger = LossLogger(self._out_path)
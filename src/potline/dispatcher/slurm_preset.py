@@ -26,6 +26,7 @@ class JobType(Enum):
     SIM = 'sim'
     WATCH_SIM = 'w_sim'
     CONV = 'conv'
+    COMM = 'comm'
 
 class SlurmCluster(Enum):
     """
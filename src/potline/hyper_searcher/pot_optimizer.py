@@ -4,7 +4,10 @@ Custom optimizer class for XPOT, based on the skopt.Optimizer class.
 
 from __future__ import annotations
 
+import os
+import copy
 import pickle
+import hashlib
 from pathlib import Path
 import math
 
@@ -12,11 +15,15 @@ import yaml
 from skopt import Optimizer # type: ignore
 import xpot.loaders as load # type: ignore
 
-from ..config_reader import ConfigReader
-from ..model import create_model, CONFIG_NAME, Losses
+from ..config_reader import ConfigReader, FinetuningKW
+from ..model import create_model, get_preprocess_params, set_finetuning, CONFIG_NAME, Losses
 from ..loss_logger import LossLogger, ModelTracker
+from ..cost_model import InferenceCostModel, COST_MODEL_NAME
+from ..dataset_cache import DatasetCache, DATASET_CACHE_DIR_NAME
 
 OPTIM_DIR_NAME: str = "hyper_search"
+PREPROCESSED_DIR_NAME: str = "preprocessed_data"
+PREPROCESSED_NAME: str = "preprocessed.yaml"
 
 class PotOptimizer():
     """
@@ -38,6 +45,9 @@ class PotOptimizer():
 
         self._mlp_total = load.merge_hypers({}, self._config.optimizer_params)
         load.validate_hypers(self._mlp_total, self._config.optimizer_params)
+        if self._config.dataset_cache:
+            # prepared on the first iteration, found in the cache on the following ones
+            DatasetCache(self._config.sweep_path / DATASET_CACHE_DIR_NAME).prepare_params(self._mlp_total)
         self._optimizable_params = load.get_optimisable_params(self._mlp_total)
         if self._iteration == 1:
             # Create a new optimizer only if it is the first iteration
@@ -52,6 +62,9 @@ class PotOptimizer():
             print("Loading optimizer...")
             self.load_optimizer()
 
+        self._cost_model: InferenceCostModel | None = \
+            self._init_cost_model() if self._config.speed_weight > 0 else None
+
         self._loss_logger = LossLogger(self._out_path, self._get_keys(), no_init=(self._iteration != 1))
 
     def run(self) -> None:
@@ -78,9 +91,11 @@ class PotOptimizer():
         for next_params in next_params_list:
             self._iter_path = self._out_path / str(self._iteration) / str(self._subiter)
             self._prep_fit(next_params)
-            new_tracker = ModelTracker(
-                create_model(self._config.model_name, self._iter_path),
-                self._iteration, self._subiter, next_params)
+            model = create_model(self._config.model_name, self._iter_path)
+            predicted_cost: float | None = self._cost_model.predict_relative(model.get_cost_features()) \
+                if self._cost_model is not None else None
+            new_tracker = ModelTracker(model, self._iteration, self._subiter, next_params,
+                                       predicted_cost=predicted_cost)
             new_tracker.save_info(self._iter_path)
             fit_trackers.append(new_tracker)
             self._subiter += 1
@@ -113,7 +128,7 @@ class PotOptimizer():
 
         # Tell the optimizer the results
         self._tell([fit_tr.params for fit_tr in fit_trackers],
-                  [fit_tr.get_total_valid_loss(self._config.energy_weight) for fit_tr in fit_trackers])
+                  [self._get_objective(fit_tr) for fit_tr in fit_trackers])
 
         # Write the results to the parameters.csv file
         for fit_tr in fit_trackers:
@@ -122,6 +137,44 @@ class PotOptimizer():
             key_values: list[str] = [str(i) for i in self._optimizer.Xi[-i]]
             self._loss_logger.write_param_result(fit_tr.iteration, fit_tr.subiter, loss, key_values)
 
+    def _get_objective(self, fit_tr: ModelTracker) -> float:
+        """
+        Get the value minimized by the optimizer.
+        In multi-objective mode the loss is scaled by the predicted relative inference cost,
+        raised to the power of the speed weight.
+
+        Args:
+            - fit_tr: tracker of the fitted model.
+
+        Returns:
+            float: the objective value.
+        """
+        loss: float = fit_tr.get_total_valid_loss(self._config.energy_weight)
+        if self._cost_model is None or fit_tr.predicted_cost is None:
+            return loss
+        return loss * fit_tr.predicted_cost ** self._config.speed_weight
+
+    def _init_cost_model(self) -> InferenceCostModel | None:
+        """
+        Fit the inference cost model on the first iteration and load it on the following ones,
+        so that the objective does not change during the sweep.
+
+        Returns:
+            InferenceCostModel | None: the cost model, None if it could not be fitted.
+        """
+        filepath: Path = self._out_path / COST_MODEL_NAME
+        if self._iteration != 1:
+            return InferenceCostModel.load(filepath) if filepath.exists() else None
+
+        try:
+            cost_model = InferenceCostModel.from_sweeps(self._config.cost_sweep_paths)
+        except ValueError as e:
+            print("Cost model not available, optimizing the loss only.")
+            print(e)
+            return None
+        cost_model.save(filepath)
+        return cost_model
+
     def _get_keys(self) -> list[str]:
         """
         Get the keys of the optimizable parameters.
@@ -144,15 +197,126 @@ class PotOptimizer():
         """
         self._iter_path.mkdir(parents=True, exist_ok=True)
 
+        params: dict = self._fill_params(opt_values)
+        if self._config.shared_preprocessing:
+            params = self._use_preprocessed(copy.deepcopy(params))
+        if self._config.finetuning is not None:
+            params = self._use_checkpoint(copy.deepcopy(params))
+
+        out_filepath: Path = self._iter_path / CONFIG_NAME
+        with out_filepath.open("w+", encoding='utf-8') as f:
+            yaml.safe_dump(params, f)
+        if self._config.finetuning is not None \
+                and FinetuningKW.MAX_EPOCHS.value in self._config.finetuning:
+            create_model(self._config.model_name, self._iter_path).set_config_maxiter(
+                int(self._config.finetuning[FinetuningKW.MAX_EPOCHS.value]))
+        return out_filepath
+
+    def _fill_params(self, opt_values: dict) -> dict:
+        """
+        Fill the parameters of a fit with the values of the optimizable parameters.
+
+        Args:
+            - opt_values: dictionary of hyperparameters.
+
+        Returns:
+            dict: parameters of the fit.
+        """
         self._mlp_total = load.reconstitute_lists(self._mlp_total, opt_values)
         self._mlp_total = load.prep_dict_for_dump(self._mlp_total)
         self._mlp_total = load.trim_empty_values(self._mlp_total)  # type: ignore
         self._mlp_total = load.convert_numpy_types(self._mlp_total)
+        return dict(self._mlp_total)
 
-        out_filepath: Path = self._iter_path / CONFIG_NAME
-        with out_filepath.open("w+", encoding='utf-8') as f:
-            yaml.safe_dump(dict(self._mlp_total), f)
-        return out_filepath
+    def _use_checkpoint(self, params: dict) -> dict:
+        """
+        Start the fit from the pretrained checkpoint of the fine-tuning, e.g. a foundation model.
+        A local checkpoint is given by its absolute path, otherwise the name is passed to the framework.
+
+        Args:
+            - params: parameters of the fit.
+
+        Returns:
+            dict: the parameters, updated in place.
+        """
+        if self._config.finetuning is None \
+                or FinetuningKW.CHECKPOINT_PATH.value not in self._config.finetuning:
+            raise ValueError('No checkpoint_path found in the finetuning configuration.')
+        checkpoint_path: Path = Path(str(self._config.finetuning[FinetuningKW.CHECKPOINT_PATH.value]))
+        if checkpoint_path.exists():
+            checkpoint_path = checkpoint_path.resolve()
+        return set_finetuning(self._config.model_name, params, checkpoint_path)
+
+    def _get_preprocessed_path(self, params: dict) -> Path | None:
+        """
+        Get the directory of the preprocessed dataset of a fit, keyed on its preprocessing parameters
+        (e.g. the cutoff of PACE).
+
+        Args:
+            - params: parameters of the fit.
+
+        Returns:
+            Path | None: directory of the preprocessed dataset, None if the dataset is not preprocessed.
+        """
+        preprocess_params: dict | None = get_preprocess_params(self._config.model_name, params)
+        if preprocess_params is None:
+            return None
+        key: str = hashlib.sha256(
+            yaml.safe_dump(preprocess_params, sort_keys=True).encode()).hexdigest()[:16]
+        return self._config.sweep_path / PREPROCESSED_DIR_NAME / key
+
+    def _preprocess(self, group_path: Path, params: dict) -> None:
+        """
+        Preprocess the dataset of a group of fits, with the parameters of the first fit of the group.
+
+        Args:
+            - group_path: directory of the preprocessed dataset.
+            - params: parameters of the fit.
+        """
+        print(f"Preprocessing the dataset in {group_path}...")
+        group_path.mkdir(parents=True, exist_ok=True)
+        with (group_path / CONFIG_NAME).open("w", encoding='utf-8') as f:
+            yaml.safe_dump(params, f)
+        data: dict = create_model(self._config.model_name, group_path).preprocess_dataset()
+        if self._config.dataset_cache:
+            data = DatasetCache(self._config.sweep_path / DATASET_CACHE_DIR_NAME).prepare_params(
+                {'data': data})['data']
+        record_path: Path = group_path / PREPROCESSED_NAME
+        tmp_path: Path = record_path.with_name(f'.{PREPROCESSED_NAME}.{os.getpid()}')
+        with tmp_path.open("w", encoding='utf-8') as f:
+            yaml.safe_dump({'params': get_preprocess_params(self._config.model_name, params),
+                            'data': data}, f)
+        os.replace(tmp_path, record_path)
+
+    def _use_preprocessed(self, params: dict) -> dict:
+        """
+        Point the dataset of the fit to the preprocessed one of its group, the group is preprocessed
+        the first time it is needed. Beyond max_preprocessed_groups groups (e.g. an optimized cutoff),
+        the new groups are preprocessed by the fits themselves.
+
+        Args:
+            - params: parameters of the fit.
+
+        Returns:
+            dict: the parameters, updated in place.
+        """
+        group_path: Path | None = self._get_preprocessed_path(params)
+        if group_path is None:
+            return params
+        if not (group_path / PREPROCESSED_NAME).exists():
+            n_groups: int = len(list(group_path.parent.glob(f'*/{PREPROCESSED_NAME}'))) \
+                if group_path.parent.is_dir() else 0
+            if n_groups >= self._config.max_preprocessed_groups:
+                print(f"{n_groups} preprocessed datasets already, the dataset is preprocessed by the fit.")
+                return params
+            self._preprocess(group_path, params)
+        with (group_path / PREPROCESSED_NAME).open("r", encoding='utf-8') as f:
+            data: dict = yaml.safe_load(f)['data']
+
+        # the split is already done, the other data options (e.g. reference energy) are kept
+        params['data'] = {**{name: value for name, value in params.get('data', {}).items()
+                             if name not in ('filename', 'test_filename', 'test_size')}, **data}
+        return params
 
     def _ask(self) -> list[dict]:
         """
@@ -2,4 +2,24 @@
 This module contains the functions to run LAMMPS benchmarks.
 """
 
-from .lammps_runner import InferenceBencher, INFERENCE_BENCH_DIR_NAME, BENCH_SCRIPT_NAME
+from .lammps_runner import (
+    InferenceBencher,
+    INFERENCE_BENCH_DIR_NAME,
+    BENCH_SCRIPT_NAME,
+    LAMMPS_IN_NAME,
+    BENCH_TIMINGS_NAME,
+    COST_FEATURES_NAME,
+    BENCH_N_ATOMS,
+    )
+from .micro_bench import (
+    MicroBencher,
+    MICRO_BENCH_NAME,
+    MICRO_BENCH_SUMMARY_NAME,
+    get_structures,
+    collect_micro_bench,
+    summarize_micro_bench,
+    )
+from .variant_selector import (
+    VariantSelector,
+    VARIANTS_NAME,
+    )
@@ -3,18 +3,28 @@ This module is responsible for running LAMMPS benchmarks.
 """
 
 from pathlib import Path
-import shutil
+from functools import partial
+
+import yaml
 
 from ..config_reader import ConfigReader
 from ..loss_logger import ModelTracker
+from ..model import POTENTIAL_NAME
+from ..stager import Stager, RunDir, write_atomic
 
 INFERENCE_BENCH_DIR_NAME: str = 'inference_bench'
 LAMMPS_IN_NAME: str = 'bench.in'
 BENCH_SCRIPT_NAME: str = 'run.sh'
+BENCH_TIMINGS_NAME: str = 'bench_timings.csv'
+COST_FEATURES_NAME: str = 'cost_features.yaml'
+BENCH_N_ATOMS: int = 2 * 20**3 # bcc lattice of 20x20x20 unit cells in bench.in
 INF_BENCH_TEMPLATE_PATH: Path = Path(__file__).parent / 'template'
 LAMMPS_IN_PATH: Path =  INF_BENCH_TEMPLATE_PATH / LAMMPS_IN_NAME
 BENCH_SCRIPT_TEMPLATE_PATH: Path = INF_BENCH_TEMPLATE_PATH / BENCH_SCRIPT_NAME
 
+def write_cost_features(tracker: ModelTracker, out_path: Path):
+    write_atomic(out_path / COST_FEATURES_NAME, yaml.safe_dump(tracker.model.get_cost_features()))
+
 class InferenceBencher():
     """
     Class for running the LAMMPS inference benchmark.
@@ -34,10 +44,10 @@ class InferenceBencher():
         """
         self._out_path.mkdir(exist_ok=True)
 
-        for i, tracker in enumerate(self._tracker_list):
-            iter_path = self._out_path / str(i+1)
-            iter_path.mkdir(exist_ok=True)
-            shutil.copy(LAMMPS_IN_PATH, iter_path)
-            shutil.copy(BENCH_SCRIPT_TEMPLATE_PATH, iter_path)
-            shutil.copy(tracker.model.get_pot_path(), iter_path)
-            tracker.save_info(iter_path)
+        # the potential is copied, the launch tuning may replace it
+        Stager().stage([RunDir(
+            self._out_path / str(i+1),
+            links={LAMMPS_IN_NAME: LAMMPS_IN_PATH, BENCH_SCRIPT_NAME: BENCH_SCRIPT_TEMPLATE_PATH},
+            copies={POTENTIAL_NAME: tracker.model.get_pot_path()},
+            writers=[partial(write_cost_features, tracker), tracker.save_info],
+        ) for i, tracker in enumerate(self._tracker_list)])
@@ -0,0 +1,227 @@
+"""
+Micro-benchmark of the latency of single energy and force evaluations in LAMMPS.
+"""
+
+from __future__ import annotations
+
+import csv
+import time
+from pathlib import Path
+from string import Template
+
+import numpy as np
+import pandas as pd
+
+from .lammps_runner import INFERENCE_BENCH_DIR_NAME
+
+MICRO_BENCH_NAME: str = 'micro_bench.csv'
+MICRO_BENCH_SUMMARY_NAME: str = 'micro_bench_summary.csv'
+MICRO_BENCH_FIELDS: list[str] = ['model_name', 'structure', 'n_atoms', 'n_repeats',
+                                 'latency_mean', 'latency_std', 'latency_min',
+                                 'calls_per_s', 'atoms_per_s']
+
+# Structures built as in the properties simulation inputs (lmps_inputs)
+BULK_TEMPLATE: Template = Template('''
+lattice         ${structure} ${lat} orient x 1 0 0 orient y 0 1 0 orient z 0 0 1
+region          box block 0 ${size} 0 ${size} 0 ${size} units lattice
+create_box      1 box
+create_atoms    1 box
+mass            1 ${mass}
+''')
+SURF_TEMPLATE: Template = Template('''
+lattice         ${structure} ${lat} orient x ${orient_x} orient y ${orient_y} orient z ${orient_z}
+region          box block 0 1 0 1 0 ${layers} units lattice
+create_box      1 box
+create_atoms    1 box
+mass            1 ${mass}
+change_box      all z delta -${vacuum} ${vacuum} units box
+''')
+VACANCY_TEMPLATE: Template = Template('''
+lattice         ${structure} ${lat} orient x 1 0 0 orient y 0 1 0 orient z 0 0 1
+region          box block 0 4 0 4 0 4 units lattice
+create_box      1 box
+create_atoms    1 box
+mass            1 ${mass}
+group           deleted id 1
+delete_atoms    group deleted
+''')
+
+def get_structures(structure: str, lattice: float, mass: float, bulk_sizes: list[int]) -> dict[str, str]:
+    """
+    Get the LAMMPS commands creating the benchmark structures of a material.
+
+    Args:
+        - structure: crystal structure, bcc or fcc
+        - lattice: lattice constant
+        - mass: atomic mass, in g/mol
+        - bulk_sizes: sizes of the bulk cells, in unit cells per direction
+
+    Returns:
+        dict: LAMMPS commands by structure name.
+    """
+    material: dict = {'structure': structure, 'lat': lattice, 'mass': mass}
+    structures: dict[str, str] = {
+        f'bulk_{size}': BULK_TEMPLATE.substitute(material, size=size) for size in bulk_sizes
+    }
+    structures['surf_100'] = SURF_TEMPLATE.substitute(
+        material, orient_x='1 0 0', orient_y='0 1 0', orient_z='0 0 1', layers=10, vacuum=10)
+    structures['surf_110'] = SURF_TEMPLATE.substitute(
+        material, orient_x='1 0 0', orient_y='0 1 -1', orient_z='0 1 1', layers=10, vacuum=10)
+    structures['surf_112'] = SURF_TEMPLATE.substitute(
+        material, orient_x='-1 1 0', orient_y='1 1 1', orient_z='1 1 -2', layers=15, vacuum=5)
+    structures['vacancy'] = VACANCY_TEMPLATE.substitute(material)
+    return structures
+
+class MicroBencher():
+    """
+    Class measuring the latency of single energy and force evaluations through the LAMMPS Python module.
+
+    Args:
+        - pot_path: path to the potential file included in LAMMPS
+        - model_name: name of the model
+        - n_repeats: number of timed evaluations per structure
+        - lmp_args: additional command line arguments for LAMMPS (e.g. accelerator suffix)
+    """
+    def __init__(self, pot_path: Path, model_name: str, n_repeats: int = 20,
+                 lmp_args: list[str] | None = None):
+        self._pot_path = pot_path
+        self._model_name = model_name
+        self._n_repeats = n_repeats
+        self._lmp_args = lmp_args if lmp_args is not None else []
+
+    def setup(self, structure_cmds: str):
+        """
+        Create the structure with the potential in a LAMMPS instance and evaluate it once,
+        the evaluation includes the model setup. The instance is closed by the caller.
+        """
+        from lammps import lammps # type: ignore # pylint: disable=import-outside-toplevel
+
+        lmp = lammps(cmdargs=['-screen', 'none', '-log', 'none'] + self._lmp_args)
+        try:
+            lmp.commands_string('\n'.join([
+                'units           metal',
+                'atom_style      atomic',
+                'atom_modify     map yes',
+                'boundary        p p p',
+                structure_cmds,
+                f'include         {self._pot_path}',
+                'neighbor        2.0 bin',
+                'neigh_modify    every 1 delay 0 check yes',
+                'thermo_style    custom step pe',
+                'run             0',
+            ]))
+        except Exception:
+            lmp.close()
+            raise
+        return lmp
+
+    def bench_structure(self, structure_cmds: str) -> tuple[int, np.ndarray]:
+        """
+        Time single energy and force evaluations on a structure.
+        The first evaluation includes the model setup and is excluded.
+
+        Args:
+            - structure_cmds: LAMMPS commands creating the structure
+
+        Returns:
+            tuple: number of atoms and latencies in seconds.
+        """
+        lmp = self.setup(structure_cmds)
+        try:
+            latencies = np.empty(self._n_repeats)
+            for i in range(self._n_repeats):
+                start: float = time.perf_counter()
+                lmp.command('run 0 pre no post no')
+                latencies[i] = time.perf_counter() - start
+            n_atoms: int = int(lmp.get_natoms())
+        finally:
+            lmp.close()
+        return n_atoms, latencies
+
+    def evaluate(self, structure_cmds: str) -> tuple[float, np.ndarray]:
+        """
+        Evaluate the energy and the forces of a structure.
+
+        Args:
+            - structure_cmds: LAMMPS commands creating the structure
+
+        Returns:
+            tuple: energy per atom and forces sorted by atom id, shape (n_atoms, 3).
+        """
+        lmp = self.setup(structure_cmds)
+        try:
+            n_atoms: int = int(lmp.get_natoms())
+            energy: float = float(lmp.get_thermo('pe')) / n_atoms
+            forces = np.array(lmp.gather_atoms('f', 1, 3), dtype=float).reshape(n_atoms, 3)
+        finally:
+            lmp.close()
+        return energy, forces
+
+    def run(self, structures: dict[str, str], out_path: Path) -> list[dict]:
+        """
+        Run the micro-benchmark and write the results.
+
+        Args:
+            - structures: LAMMPS commands by structure name
+            - out_path: directory where the results are written
+
+        Returns:
+            list: one row of results per structure.
+        """
+        rows: list[dict] = []
+        for name, structure_cmds in structures.items():
+            n_atoms, latencies = self.bench_structure(structure_cmds)
+            mean: float = float(latencies.mean())
+            rows.append({
+                'model_name': self._model_name,
+                'structure': name,
+                'n_atoms': n_atoms,
+                'n_repeats': self._n_repeats,
+                'latency_mean': mean,
+                'latency_std': float(latencies.std()),
+                'latency_min': float(latencies.min()),
+                'calls_per_s': 1 / mean,
+                'atoms_per_s': n_atoms / mean,
+            })
+            print(f"{name}: {n_atoms} atoms, {mean:.3e} s per call")
+
+        with (out_path / MICRO_BENCH_NAME).open('w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=MICRO_BENCH_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        return rows
+
+def collect_micro_bench(sweep_paths: list[Path]) -> pd.DataFrame:
+    """
+    Collect the micro-benchmark results of the models of several sweeps in one table.
+    Allows to compare the latency across the supported models.
+
+    Args:
+        - sweep_paths: paths to the sweeps
+
+    Returns:
+        pd.DataFrame: one row per (sweep, model, structure).
+    """
+    frames: list[pd.DataFrame] = []
+    for sweep_path in sweep_paths:
+        for results_path in sorted((sweep_path / INFERENCE_BENCH_DIR_NAME).glob(f'*/{MICRO_BENCH_NAME}')):
+            frame = pd.read_csv(results_path)
+            frame.insert(0, 'model_index', results_path.parent.name)
+            frame.insert(0, 'sweep_path', str(sweep_path))
+            frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=['sweep_path', 'model_index'] + MICRO_BENCH_FIELDS)
+    return pd.concat(frames, ignore_index=True)
+
+def summarize_micro_bench(results: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summarize the micro-benchmark results as the best latency of each model type per structure.
+
+    Args:
+        - results: table returned by collect_micro_bench
+
+    Returns:
+        pd.DataFrame: latency in seconds, structures as rows and model names as columns.
+    """
+    return results.pivot_table(index=['structure', 'n_atoms'], columns='model_name',
+                               values='latency_mean', aggfunc='min')
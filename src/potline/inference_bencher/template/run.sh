@@ -5,16 +5,23 @@ n_cpu=$1
 lammps_bin_path=$2
 prerun_steps=$3
 max_steps=$4
+launch_script=$5
 
 export MKL_NUM_THREADS=${n_cpu}
 export OMP_NUM_THREADS=${n_cpu}
+LMP_LAUNCH="mpirun -np 1 --bind-to core"
+LMP_ARGS=""
+# Tuned launch configuration
+if [ -f "${launch_script}" ]; then
+    source ${launch_script}
+fi
 
 echo "start"
 start_time=`date +%s`
-eval mpirun -np 1 --bind-to core ${lammps_bin_path} -in "bench.in" -v steps ${prerun_steps}
+eval ${LMP_LAUNCH} ${lammps_bin_path} ${LMP_ARGS} -in "bench.in" -v steps ${prerun_steps}
 echo "prerun done"
 mid_time=`date +%s`
-eval mpirun -np 1 --bind-to core ${lammps_bin_path} -in "bench.in" -v steps ${max_steps}
+eval ${LMP_LAUNCH} ${lammps_bin_path} ${LMP_ARGS} -in "bench.in" -v steps ${max_steps}
 end_time=`date +%s`
 echo "finished"
 
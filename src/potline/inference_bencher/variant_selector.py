@@ -0,0 +1,164 @@
+"""
+Selection of the deployment variant of a converted model, the fastest one within the
+tolerances on the test set errors of the reference variant.
+"""
+
+from __future__ import annotations
+
+import csv
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from ..model import PotModel, Losses, POTENTIAL_NAME, ModelConverter
+from ..validator import BatchEvaluator
+from .micro_bench import MicroBencher
+
+VARIANTS_DIR_NAME: str = 'variants'
+VARIANTS_NAME: str = 'variants.csv'
+VARIANTS_FIELDS: list[str] = ['variant', 'energy_rmse', 'force_rmse', 'energy_error', 'force_error',
+                              'latency', 'speedup', 'selected']
+
+class VariantSelector():
+    """
+    Class converting the deployment variants of the models (e.g. float32 MACE, PACE with coarser
+    radial splines) in the conversion pool, evaluating them on the held-out test set and
+    timing them with the micro-benchmark. The fastest variant whose errors exceed the ones of
+    the reference variant by less than the tolerances is selected.
+
+    Args:
+        - test_set: path to the test set, or test split in the pacemaker format
+        - evaluator: evaluator of the potentials on the test set
+        - structures: structures on which the variants are timed, LAMMPS commands by name
+        - energy_tol: tolerance on the increase of the energy RMSE, in eV/atom
+        - force_tol: tolerance on the increase of the force RMSE, in eV/angstrom
+        - n_repeats: number of timed evaluations per structure
+        - lmp_args: additional command line arguments for LAMMPS (e.g. accelerator suffix)
+        - converter: conversion pool of the variants
+    """
+    def __init__(self, test_set: Path | pd.DataFrame, evaluator: BatchEvaluator, structures: dict[str, str],
+                 energy_tol: float = 1e-3, force_tol: float = 1e-2, n_repeats: int = 10,
+                 lmp_args: list[str] | None = None, converter: ModelConverter | None = None):
+        self._test_set = test_set
+        self._evaluator = evaluator
+        self._structures = structures
+        self._energy_tol = energy_tol
+        self._force_tol = force_tol
+        self._n_repeats = n_repeats
+        self._lmp_args = lmp_args
+        self._converter = converter if converter is not None else ModelConverter()
+
+    def measure(self, pot_path: Path, model_name: str) -> float:
+        """
+        Time a variant on the micro-benchmark structures.
+
+        Args:
+            - pot_path: potential file of the variant
+            - model_name: name of the model
+
+        Returns:
+            float: mean latency summed over the structures.
+        """
+        bencher = MicroBencher(pot_path, model_name, self._n_repeats, self._lmp_args)
+        return sum(float(bencher.bench_structure(cmds)[1].mean()) for cmds in self._structures.values())
+
+    def select(self, models: list[PotModel]) -> dict[Path, str]:
+        """
+        Select the variant of the models and create their potentials.
+        The comparison is written in the output directory of each model.
+
+        Args:
+            - models: converted models
+
+        Returns:
+            dict: the selected variant by output path of the model.
+        """
+        selected: dict[Path, str] = {model.get_out_path(): model.get_variants()[0]
+                                     for model in models if len(model.get_variants()) == 1}
+        models = [model for model in models if len(model.get_variants()) > 1]
+        artifacts: dict[Path, dict[str, Path | None]] = self._converter.convert_variants(models)
+
+        pot_paths: dict[Path, dict[str, Path]] = {}
+        for model in models:
+            variants: list[str] = [variant for variant in model.get_variants()
+                                   if artifacts[model.get_out_path()].get(variant) is not None]
+            if model.get_variants()[0] not in variants:
+                print(f'Reference variant of {model.get_out_path()} not converted, variant unchanged.')
+                continue
+            work_path: Path = model.get_out_path() / VARIANTS_DIR_NAME
+            pot_paths[model.get_out_path()] = {}
+            for variant in variants:
+                model.set_variant(variant)
+                pot_path: Path = work_path / variant / POTENTIAL_NAME
+                pot_path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy(model.create_potential(), pot_path)
+                pot_paths[model.get_out_path()][variant] = pot_path
+
+        if not pot_paths:
+            return selected
+
+        # the test set is read once for the variants of all the models
+        raw_losses = self._evaluator.evaluate(
+            [path for paths in pot_paths.values() for path in paths.values()], self._test_set)
+        for model in models:
+            if model.get_out_path() in pot_paths:
+                paths: dict[str, Path] = pot_paths[model.get_out_path()]
+                selected[model.get_out_path()] = self.select_variant(
+                    model, paths, {variant: raw_losses[path].get_losses() for variant, path in paths.items()})
+        return selected
+
+    def select_variant(self, model: PotModel, pot_paths: dict[str, Path], losses: dict[str, Losses]) -> str:
+        """
+        Time the variants of a model and select the fastest one within the tolerances.
+
+        Args:
+            - model: converted model
+            - pot_paths: potential file by variant, the reference variant first
+            - losses: test set errors by variant
+
+        Returns:
+            str: the selected variant.
+        """
+        reference: str = next(iter(pot_paths))
+        rows: list[dict] = []
+        ref_latency: float = float('nan')
+        for variant, pot_path in pot_paths.items():
+            try:
+                latency: float = self.measure(pot_path, model.get_name().value)
+            except Exception as exc: # pylint: disable=broad-except
+                if variant == reference:
+                    raise
+                print(f'Variant {variant} of {model.get_out_path()} failed: {exc}')
+                continue
+
+            if variant == reference:
+                ref_latency = latency
+            energy_error: float = losses[variant].energy - losses[reference].energy
+            force_error: float = losses[variant].force - losses[reference].force
+            rows.append({
+                'variant': variant,
+                'energy_rmse': losses[variant].energy,
+                'force_rmse': losses[variant].force,
+                'energy_error': energy_error,
+                'force_error': force_error,
+                'latency': latency,
+                'speedup': ref_latency / latency,
+                'selected': False,
+            })
+            print(f'{variant}: energy RMSE {losses[variant].energy:.2e} eV/atom ({energy_error:+.2e}), '
+                  f'force RMSE {losses[variant].force:.2e} eV/A ({force_error:+.2e}), '
+                  f'speedup {ref_latency / latency:.2f}')
+
+        valid: list[dict] = [row for row in rows if row['energy_error'] <= self._energy_tol
+                             and row['force_error'] <= self._force_tol]
+        best: dict = min(valid, key=lambda row: row['latency'])
+        best['selected'] = True
+        model.set_variant(best['variant'])
+        model.create_potential()
+
+        with (model.get_out_path() / VARIANTS_NAME).open('w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=VARIANTS_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        return best['variant']
@@ -0,0 +1,13 @@
+"""
+Launch configuration tuning of LAMMPS.
+"""
+
+from .launch_tuner import (
+    LaunchTuner,
+    LaunchConfig,
+    LAUNCH_SCRIPT_NAME,
+    LAUNCH_CACHE_NAME,
+    LAUNCH_CONFIG_NAME,
+    get_candidates,
+    write_launch_script,
+    )
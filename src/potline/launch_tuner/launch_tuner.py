@@ -0,0 +1,241 @@
+"""
+Tuning of the MPI ranks, OpenMP threads and accelerator suffix of the LAMMPS runs.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import yaml
+
+from ..loss_logger import ModelTracker
+from ..model import POTENTIAL_NAME
+from ..perf_history import get_machine_id
+
+LAUNCH_SCRIPT_NAME: str = 'launch.sh'
+LAUNCH_CACHE_NAME: str = 'launch_cache.yaml'
+LAUNCH_CONFIG_NAME: str = 'launch.yaml'
+PROBE_DIR_NAME: str = 'launch_probe'
+SUPPORTED_SUFFIXES: list[str] = ['none', 'omp', 'kk']
+LOOP_TIME_PATTERN: re.Pattern = re.compile(r'Loop time of ([0-9.eE+-]+) on')
+
+class LaunchConfig():
+    """
+    Launch configuration of LAMMPS on a node.
+
+    Args:
+        - n_ranks: number of MPI ranks
+        - n_threads: number of OpenMP threads per rank
+        - suffix: accelerator suffix, one of SUPPORTED_SUFFIXES
+    """
+    def __init__(self, n_ranks: int, n_threads: int, suffix: str):
+        if suffix not in SUPPORTED_SUFFIXES:
+            raise ValueError(f'Unsupported suffix: {suffix}')
+        self.n_ranks: int = n_ranks
+        self.n_threads: int = n_threads
+        self.suffix: str = suffix
+
+    def get_launcher(self) -> str:
+        """
+        Get the MPI launcher, each rank is bound to its threads.
+        """
+        return f'mpirun -np {self.n_ranks} --bind-to core --map-by slot:PE={self.n_threads}'
+
+    def get_lammps_args(self) -> str:
+        """
+        Get the LAMMPS command line arguments enabling the accelerator.
+        """
+        if self.suffix == 'omp':
+            return f'-sf omp -pk omp {self.n_threads}'
+        if self.suffix == 'kk':
+            return f'-k on t {self.n_threads} -sf kk -pk kokkos newton on neigh half'
+        return ''
+
+    def for_cores(self, n_cores: int) -> LaunchConfig:
+        """
+        Scale the launch to a partition of the node, keeping the threads per rank.
+
+        Args:
+            - n_cores: number of cores of the partition
+
+        Returns:
+            LaunchConfig: launch using all the cores of the partition.
+        """
+        n_threads: int = max(1, min(self.n_threads, n_cores))
+        return LaunchConfig(max(1, n_cores // n_threads), n_threads, self.suffix)
+
+    def get_env(self) -> dict[str, str]:
+        """
+        Get the environment variables of the run.
+        """
+        return {'OMP_NUM_THREADS': str(self.n_threads), 'MKL_NUM_THREADS': str(self.n_threads)}
+
+    def to_dict(self) -> dict:
+        return {'n_ranks': self.n_ranks, 'n_threads': self.n_threads, 'suffix': self.suffix}
+
+    @staticmethod
+    def from_dict(data: dict) -> LaunchConfig:
+        return LaunchConfig(int(data['n_ranks']), int(data['n_threads']), str(data['suffix']))
+
+    def save(self, out_path: Path):
+        with out_path.open('w', encoding='utf-8') as file:
+            yaml.safe_dump(self.to_dict(), file)
+
+    @staticmethod
+    def load(in_path: Path) -> LaunchConfig:
+        with in_path.open('r', encoding='utf-8') as file:
+            return LaunchConfig.from_dict(yaml.safe_load(file))
+
+    def __str__(self) -> str:
+        return f'{self.n_ranks} ranks x {self.n_threads} threads, suffix {self.suffix}'
+
+def get_candidates(n_cpu: int, suffixes: list[str]) -> list[LaunchConfig]:
+    """
+    Get the launch configurations using all the cores of the node.
+
+    Args:
+        - n_cpu: number of allocated cores
+        - suffixes: accelerator suffixes to probe
+
+    Returns:
+        list: candidate launch configurations.
+    """
+    n_ranks_list: list[int] = [n for n in range(1, n_cpu+1) if n_cpu % n == 0]
+    return [LaunchConfig(n_ranks, n_cpu // n_ranks, suffix)
+            for suffix in suffixes for n_ranks in n_ranks_list]
+
+def write_launch_script(launch: LaunchConfig, out_path: Path):
+    """
+    Write the launch script sourced by the benchmark script.
+
+    Args:
+        - launch: launch configuration
+        - out_path: path to the script
+    """
+    lines: list[str] = [
+        '#!/bin/bash',
+        f'# {launch}',
+        f'LMP_LAUNCH="{launch.get_launcher()}"',
+        f'LMP_ARGS="{launch.get_lammps_args()}"',
+    ] + [f'export {key}={value}' for key, value in launch.get_env().items()]
+    out_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+class LaunchTuner():
+    """
+    Class probing short LAMMPS runs with different launch configurations on the allocated node.
+    The best configuration is cached by model and node type, so that it is tuned only once.
+
+    Args:
+        - model_name: name of the model
+        - lammps_bin_path: path to the LAMMPS binary, with the model specific parameters
+        - n_cpu: number of allocated cores
+        - cache_path: path to the cache of the tuned configurations
+        - suffixes: accelerator suffixes to probe
+        - probe_steps: number of MD steps of each probe
+    """
+    def __init__(self, model_name: str, lammps_bin_path: str, n_cpu: int, cache_path: Path,
+                 suffixes: list[str] | None = None, probe_steps: int = 20):
+        self._model_name = model_name
+        self._lammps_bin_path = lammps_bin_path
+        self._n_cpu = n_cpu
+        self._cache_path = cache_path
+        self._suffixes = suffixes if suffixes is not None else ['none', 'omp']
+        self._probe_steps = probe_steps
+        self._cache_key = f'{model_name}/{get_machine_id()}'
+
+    def get_cached(self) -> LaunchConfig | None:
+        """
+        Get the cached launch configuration of the model on the current node type.
+        """
+        if not self._cache_path.exists():
+            return None
+        with self._cache_path.open('r', encoding='utf-8') as file:
+            cache: dict = yaml.safe_load(file) or {}
+        return LaunchConfig.from_dict(cache[self._cache_key]) if self._cache_key in cache else None
+
+    def probe(self, launch: LaunchConfig, bench_in_path: Path, work_path: Path) -> float:
+        """
+        Time a short benchmark run.
+
+        Args:
+            - launch: launch configuration
+            - bench_in_path: path to the LAMMPS input, including ./potential.in
+            - work_path: directory of the run, containing the potential
+
+        Returns:
+            float: loop time in seconds, inf if the run failed.
+        """
+        log_path: Path = work_path / 'log.lammps'
+        cmd: str = ' '.join([launch.get_launcher(), self._lammps_bin_path, launch.get_lammps_args(),
+                             '-in', str(bench_in_path), '-v', 'steps', str(self._probe_steps),
+                             '-log', str(log_path), '-screen', 'none'])
+        result = subprocess.run(cmd, shell=True, cwd=work_path, env={**os.environ, **launch.get_env()},
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=False)
+        if result.returncode != 0 or not log_path.exists():
+            return float('inf')
+        match = LOOP_TIME_PATTERN.search(log_path.read_text(encoding='utf-8'))
+        return float(match.group(1)) if match else float('inf')
+
+    def tune(self, tracker: ModelTracker, bench_in_path: Path, work_path: Path) -> LaunchConfig:
+        """
+        Find the fastest launch configuration of a model.
+
+        Args:
+            - tracker: model to run
+            - bench_in_path: path to the LAMMPS input, including ./potential.in
+            - work_path: directory where the probes are run
+
+        Returns:
+            LaunchConfig: the fastest configuration.
+        """
+        probe_path: Path = work_path / PROBE_DIR_NAME
+        probe_path.mkdir(exist_ok=True)
+        timings: list[tuple[float, LaunchConfig]] = []
+        for launch in get_candidates(self._n_cpu, self._suffixes):
+            shutil.copy(tracker.model.create_potential(launch.n_ranks), probe_path / POTENTIAL_NAME)
+            loop_time: float = self.probe(launch, bench_in_path, probe_path)
+            print(f'{launch}: {loop_time:.3f} s')
+            timings.append((loop_time, launch))
+        shutil.rmtree(probe_path)
+
+        best_time, best = min(timings, key=lambda timing: timing[0])
+        if best_time == float('inf'):
+            raise RuntimeError('All the launch configurations failed.')
+        return best
+
+    def run(self, tracker_list: list[ModelTracker], bench_in_path: Path,
+            work_path: Path, sweep_path: Path) -> LaunchConfig:
+        """
+        Tune the launch configuration on the best model, or get it from the cache.
+        Writes the launch script of the sweep and updates the potentials of all the models.
+
+        Args:
+            - tracker_list: models of the sweep, the first one is probed
+            - bench_in_path: path to the LAMMPS input, including ./potential.in
+            - work_path: directory where the probes are run
+            - sweep_path: path to the sweep
+
+        Returns:
+            LaunchConfig: the launch configuration of the sweep.
+        """
+        launch: LaunchConfig | None = self.get_cached()
+        if launch is None:
+            launch = self.tune(tracker_list[0], bench_in_path, work_path)
+            cache: dict = {}
+            if self._cache_path.exists():
+                with self._cache_path.open('r', encoding='utf-8') as file:
+                    cache = yaml.safe_load(file) or {}
+            cache[self._cache_key] = launch.to_dict()
+            with self._cache_path.open('w', encoding='utf-8') as file:
+                yaml.safe_dump(cache, file)
+        print(f'Launch configuration: {launch}')
+
+        for tracker in tracker_list:
+            tracker.model.create_potential(launch.n_ranks)
+        write_launch_script(launch, sweep_path / LAUNCH_SCRIPT_NAME)
+        launch.save(sweep_path / LAUNCH_CONFIG_NAME)
+        return launch
@@ -2,4 +2,4 @@
 Loss logger
 """
 
-from .loss_logger import LossLogger, ModelTracker
+from .loss_logger import LossLogger, ModelTracker, INFO_FILENAME
@@ -27,14 +27,17 @@ class ModelTracker():
         - subiter: subiteration number
         - params: parameters of the model
         - valid_losses: valid losses of the model
+        - predicted_cost: inference cost predicted from the hyperparameters, relative to the reference cost
     """
     def __init__(self, model: PotModel, iteration: int, subiter: int,
-                 params: dict, valid_losses: Losses | None = None) -> None:
+                 params: dict, valid_losses: Losses | None = None,
+                 predicted_cost: float | None = None) -> None:
         self.model = model
         self.iteration = iteration
         self.subiter = subiter
         self.params = params
         self.valid_losses = valid_losses
+        self.predicted_cost = predicted_cost
 
     def get_total_valid_loss(self, energy_weight: float) -> float:
         """
@@ -59,10 +62,14 @@ class ModelTracker():
                 'valid_energy_loss': self.valid_losses.energy,
                 'valid_force_loss': self.valid_losses.force
             } if self.valid_losses is not None else {}
+            cost = {
+                'predicted_cost': self.predicted_cost
+            } if self.predicted_cost is not None else {}
             data = {
                 'iteration': self.iteration,
                 'subiteration': self.subiter,
                 **loss,
+                **cost,
             }
             yaml.dump(data, f)
 
@@ -90,10 +97,12 @@ class ModelTracker():
             force_loss: str | None = data.get('valid_force_loss')
             valid_losses = Losses(float(data['valid_energy_loss']), float(data['valid_force_loss'])) \
                 if energy_loss and force_loss else None
+            predicted_cost: float | None = float(data['predicted_cost']) \
+                if data.get('predicted_cost') is not None else None
         with (model_path / INFO_PARM_FILENAME).open("rb") as f:
             params = pickle.load(f)
 
-        return ModelTracker(model, iteration, subiter, params, valid_losses)
+        return ModelTracker(model, iteration, subiter, params, valid_losses, predicted_cost)
 
 class LossLogger():
     """
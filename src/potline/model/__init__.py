@@ -5,10 +5,14 @@ Models.
 from .model import (
     PotModel,
     Losses,
+    RawLosses,
     YACE_NAME,
     POTENTIAL_NAME,
     CONFIG_NAME,
+    VARIANT_NAME,
     POTENTIAL_TEMPLATE_PATH,
+    read_pair_cmds,
     )
 from .pace import PotPACE
-from .model_factory import create_model, get_fit_cmd, get_lammps_params
+from .model_factory import create_model, get_fit_cmd, get_lammps_params, get_preprocess_params, set_finetuning
+from .model_converter import ModelConverter, convert_model, CONVERSION_NAME
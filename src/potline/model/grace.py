@@ -9,7 +9,7 @@ import shutil
 
 import yaml
 
-from .model import PotModel, POTENTIAL_TEMPLATE_PATH, CONFIG_NAME, Losses, gen_from_template
+from .model import PotModel, POTENTIAL_TEMPLATE_PATH, CONFIG_NAME, Losses, gen_from_template, link_file
 from ..dispatcher import SupportedModel
 
 LAST_POTENTIAL_NAME: str = 'output_potential.yaml'
@@ -40,13 +40,24 @@ class PotGRACE(PotModel):
 
         return Losses(rmse_de, rmse_f_comp)
 
-    def lampify(self) -> Path:
+    def collect_loss_curve(self) -> tuple[list[int], list[Losses]]:
+        train_metrics_path: Path = self._seed_path / 'train_metrics.yaml'
+        if not train_metrics_path.exists():
+            return [], []
+        with train_metrics_path.open('r', encoding='utf-8') as file:
+            train_metrics: list[dict] = yaml.safe_load(file) or []
+
+        return [int(metrics.get('epoch', i + 1)) for i, metrics in enumerate(train_metrics)], \
+            [Losses(float(metrics['rmse/depa']), float(metrics['rmse/f_comp'])) for metrics in train_metrics]
+
+    def lampify(self, variant: str | None = None) -> Path:
         return self._yace_path
 
-    def create_potential(self) -> Path:
+    def create_potential(self, n_ranks: int = 1) -> Path:
         potential_values: dict = {
             'pstyle': 'grace pad_verbose',
             'yace_path': str(self._yace_path),
+            'elements': ' '.join(self.get_elements()),
         }
         gen_from_template(POTENTIAL_TEMPLATE_PATH, potential_values, self._lmp_pot_path)
         return self._lmp_pot_path
@@ -60,6 +71,29 @@ class PotGRACE(PotModel):
         with self._config_filepath.open('w', encoding='utf-8') as file:
             yaml.safe_dump(config, file)
 
+    def get_cost_features(self) -> dict[str, float]:
+        config: dict = self.get_params()
+        potential: dict = config.get('potential', {})
+        preset_kwargs: dict = potential.get('kwargs', {})
+
+        return {
+            'cutoff': float(config.get('cutoff', 6.0)),
+            'lmax': float(preset_kwargs.get('lmax', 0)),
+            'n_rad_max': float(preset_kwargs.get('n_rad_max', 0)),
+            'max_order': float(preset_kwargs.get('max_order', 0)),
+            'n_mlp_dens': float(preset_kwargs.get('n_mlp_dens', 0)),
+            'n_layers': float(2 if '2LAYER' in str(potential.get('preset', '')) else 1),
+            'float64': float(str(potential.get('float_dtype', 'float64')) == 'float64'),
+        }
+
+    @staticmethod
+    def set_finetuning(params: dict, checkpoint_path: Path) -> dict:
+        # the foundation model is reduced to the elements of the dataset
+        potential: dict = params.setdefault('potential', {})
+        potential['finetune_foundation_model'] = str(checkpoint_path)
+        potential.setdefault('reduce_elements', True)
+        return params
+
     @staticmethod
     def get_lammps_params() -> str:
         return ''
@@ -68,7 +102,15 @@ class PotGRACE(PotModel):
         return SupportedModel.GRACE
 
     def switch_out_path(self, out_path: Path):
-        shutil.copytree(self._out_path, out_path, dirs_exist_ok=True)
+        # the restart needs the checkpoints, linked, and the model description of the seed
+        seed_path: Path = out_path / 'seed' / f'{self._seed_number}'
+        for checkpoint_path in (self._seed_path / 'checkpoints').rglob('*'):
+            if checkpoint_path.is_file():
+                link_file(checkpoint_path, seed_path / 'checkpoints' / checkpoint_path.relative_to(
+                    self._seed_path / 'checkpoints'))
+        seed_path.mkdir(parents=True, exist_ok=True)
+        for seed_file_path in self._seed_path.glob('*.yaml'):
+            shutil.copy(seed_file_path, seed_path)
         super().switch_out_path(out_path)
         self._seed_path = self._out_path / 'seed' / f'{self._seed_number}'
         self._yace_path = self._seed_path / 'final_model'
@@ -4,18 +4,39 @@ Pacemaker wrapper for fitting ACE potentials using XPOT in HPC.
 
 from __future__ import annotations
 
+import os
+import re
 import sys
-import shutil
+import subprocess
+import tempfile
 import json
 from pathlib import Path
 
 import yaml
+from ase.data import chemical_symbols # type: ignore
 from mace.cli.create_lammps_model import main as create_lammps_model
 
-from .model import PotModel, POTENTIAL_TEMPLATE_PATH, CONFIG_NAME, Losses, gen_from_template
+from .model import PotModel, POTENTIAL_TEMPLATE_PATH, CONFIG_NAME, Losses, gen_from_template, link_file
 from ..dispatcher import SupportedModel
 
 LAST_POTENTIAL_NAME: str = 'output_potential.yaml'
+# deployment variants, by name: dtype of the exported model
+DTYPE_VARIANTS: dict[str, str] = {'float64': 'float64', 'float32': 'float32'}
+CHECKPOINT_PATTERN: re.Pattern = re.compile(r'_epoch-(\d+)(_swa)?\.pt$')
+
+def get_restart_checkpoints(checkpoints_path: Path) -> list[Path]:
+    """
+    Get the checkpoints loaded by --restart_latest: the latest one, and the latest SWA one if any.
+    """
+    latest: dict[bool, tuple[int, Path]] = {}
+    for path in checkpoints_path.glob('*.pt'):
+        match = CHECKPOINT_PATTERN.search(path.name)
+        if match is None:
+            continue
+        epoch, swa = int(match.group(1)), match.group(2) is not None
+        if swa not in latest or epoch > latest[swa][0]:
+            latest[swa] = (epoch, path)
+    return [path for _, path in latest.values()]
 
 class PotMACE(PotModel):
     """
@@ -43,29 +64,81 @@ class PotMACE(PotModel):
 
         return Losses(rmse_e, rmse_f)
 
-    def lampify(self) -> Path:
+    def collect_loss_curve(self) -> tuple[list[int], list[Losses]]:
+        results_path: Path | None = next((self._out_path / "results").glob("*.txt"), None)
+        if results_path is None:
+            return [], []
+        with results_path.open('r', encoding='utf-8') as file:
+            # the last line may be partially written during the fit
+            eval_data: list[dict] = [json.loads(line) for line in file
+                                     if '"mode": "eval"' in line and line.endswith('\n')]
+        # the evaluation before the first epoch is logged with a null epoch
+        eval_data = [data for data in eval_data if data.get('epoch', 0) is not None]
+
+        return [int(data.get('epoch', i + 1)) for i, data in enumerate(eval_data)], \
+            [Losses(float(data["rmse_e"]), float(data["rmse_f"])) for data in eval_data]
+
+    def finalize_stopped_fit(self, epoch: int):
+        # resumed with the budget reached, the latest checkpoint is evaluated and the model saved
+        self.set_config_maxiter(epoch)
+        subprocess.run(self.get_fit_cmd(deep=True), shell=True, cwd=self._out_path, check=True)
+
+    def lampify(self, variant: str | None = None) -> Path:
+        variant = variant if variant is not None else self.get_variant()
+        model_filepath: Path = self.get_lampify_source()
+        yace_path: Path = self.get_variant_path(variant)
+
+        # the model is converted next to a link to it, so that the output appears complete
+        with tempfile.TemporaryDirectory(dir=self._out_path, prefix='.lampify_') as tmp_dir:
+            tmp_model_path: Path = Path(tmp_dir) / yace_path.name.removesuffix('-lammps.pt')
+            tmp_model_path.symlink_to(model_filepath)
+            old_argv = sys.argv
+            sys.argv = ["program", str(tmp_model_path), '--dtype', DTYPE_VARIANTS[variant]]
+            try:
+                create_lammps_model()
+            finally:
+                sys.argv = old_argv
+            os.replace(Path(tmp_dir) / yace_path.name, yace_path)
+
+        return yace_path
+
+    def get_lampify_source(self) -> Path:
         with self._config_filepath.open('r', encoding='utf-8') as file:
             model_name: str = yaml.safe_load(file)['name']
 
         # if the model is trained with swa, names are different
         if (self._out_path / (model_name + '_stagetwo.model')).exists():
-            model_filepath = self._out_path / (model_name + '_stagetwo.model')
-            self._yace_path = self._out_path / f'{model_name}_stagetwo.model-lammps.pt'
+            return self._out_path / (model_name + '_stagetwo.model')
+        return self._out_path / (model_name + '.model')
+
+    def get_elements(self) -> list[str]:
+        # the elements of the fit (atomic_numbers or E0s), otherwise the ones of the trained model
+        config: dict = self.get_params()
+        atomic_numbers: list[int] = []
+        if config.get('atomic_numbers') is not None:
+            atomic_numbers = [int(z) for z in re.findall(r'\d+', str(config['atomic_numbers']))]
+        elif isinstance(config.get('E0s'), dict):
+            atomic_numbers = sorted(int(z) for z in config['E0s'])
         else:
-            model_filepath: Path = self._out_path / (model_name + '.model')
-            self._yace_path = self._out_path / f'{model_name}.model-lammps.pt'
+            import torch # type: ignore # pylint: disable=import-outside-toplevel
+            model = torch.load(self.get_lampify_source(), map_location='cpu', weights_only=False)
+            atomic_numbers = [int(z) for z in model.atomic_numbers]
+        return [chemical_symbols[z] for z in atomic_numbers]
 
-        old_argv = sys.argv
-        sys.argv = ["program", str(model_filepath)]
-        create_lammps_model()
-        sys.argv = old_argv
+    def get_variants(self) -> list[str]:
+        return list(DTYPE_VARIANTS)
 
-        return self._yace_path
+    def get_variant_path(self, variant: str) -> Path:
+        model_filepath: Path = self.get_lampify_source()
+        if variant == self.get_variants()[0]:
+            return self._out_path / f'{model_filepath.name}-lammps.pt'
+        return self._out_path / f'{model_filepath.stem}.{variant}{model_filepath.suffix}-lammps.pt'
 
-    def create_potential(self) -> Path:
+    def create_potential(self, n_ranks: int = 1) -> Path:
         potential_values: dict = {
-            'pstyle': 'mace no_domain_decomposition',
-            'yace_path': str(self._yace_path),
+            'pstyle': 'mace' if n_ranks > 1 else 'mace no_domain_decomposition',
+            'yace_path': str(self.get_variant_path(self.get_variant())),
+            'elements': ' '.join(self.get_elements()),
         }
         gen_from_template(POTENTIAL_TEMPLATE_PATH, potential_values, self._lmp_pot_path)
         return self._lmp_pot_path
@@ -79,6 +152,26 @@ class PotMACE(PotModel):
         with self._config_filepath.open('w', encoding='utf-8') as file:
             yaml.safe_dump(config, file)
 
+    def get_cost_features(self) -> dict[str, float]:
+        config: dict = self.get_params()
+
+        return {
+            'cutoff': float(config.get('r_max', 5.0)),
+            'n_channels': float(config.get('num_channels', 128)),
+            'max_L': float(config.get('max_L', 1)),
+            'max_ell': float(config.get('max_ell', 3)),
+            'correlation': float(config.get('correlation', 3)),
+            'n_interactions': float(config.get('num_interactions', 2)),
+            'float64': float(str(config.get('default_dtype', 'float64')) == 'float64'),
+        }
+
+    @staticmethod
+    def set_finetuning(params: dict, checkpoint_path: Path) -> dict:
+        # the architecture comes from the foundation model, a single head keeps the conversion unchanged
+        params['foundation_model'] = str(checkpoint_path)
+        params.setdefault('multiheads_finetuning', False)
+        return params
+
     @staticmethod
     def get_lammps_params() -> str:
         return ''
@@ -87,5 +180,6 @@ class PotMACE(PotModel):
         return SupportedModel.MACE
 
     def switch_out_path(self, out_path: Path):
-        shutil.copytree(self._out_path / 'checkpoints', out_path / 'checkpoints', dirs_exist_ok=True)
+        for checkpoint_path in get_restart_checkpoints(self._out_path / 'checkpoints'):
+            link_file(checkpoint_path, out_path / 'checkpoints' / checkpoint_path.name)
         super().switch_out_path(out_path)
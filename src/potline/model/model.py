@@ -4,18 +4,22 @@ Base class for MLPs in XPOT using HPC.
 
 from __future__ import annotations
 
+import os
 import math
 import shutil
 from pathlib import Path
 from abc import ABC, abstractmethod
-from string import Template
 
 import yaml
 import numpy as np
+import pandas as pd
+
+from ..stager import render_template, write_atomic
 
 YACE_NAME: str = 'model.yace'
 POTENTIAL_NAME: str = 'potential.in'
 CONFIG_NAME: str = "optimized_params.yaml"
+VARIANT_NAME: str = 'variant.yaml'
 POTENTIAL_TEMPLATE_PATH: Path = Path(__file__).parent / 'template' / POTENTIAL_NAME
 
 class Losses():
@@ -45,15 +49,57 @@ class RawLosses():
         self.forces: list[float] = forces
         self.atom_counts: list[float] = atom_counts
 
+    def get_losses(self) -> Losses:
+        """
+        Get the losses over the structures: the RMSE of the energy per atom,
+        and the RMSE of the force components, each structure weighted by its atoms.
+        """
+        energies = np.asarray(self.energies, dtype=float)
+        forces = np.asarray(self.forces, dtype=float)
+        atom_counts = np.asarray(self.atom_counts, dtype=float)
+        if len(energies) == 0:
+            return Losses(math.nan, math.nan)
+        return Losses(float(np.sqrt(np.mean(energies**2))),
+                      float(np.sqrt(np.sum(forces**2 * atom_counts) / np.sum(atom_counts))))
+
 def gen_from_template(template_path: Path, values: dict[str, str | int | float | Path], out_filepath: Path):
     """
-    Generate a file from a template file.
+    Generate a file from a template file, the template is compiled once and the file is replaced atomically.
+    """
+    write_atomic(out_filepath, render_template(template_path, values))
+
+def link_file(src_path: Path, dst_path: Path):
+    """
+    Hard link a file, copied if the destination is on another file system.
+    Only used for the files that the fit replaces instead of rewriting in place
+    (e.g. checkpoints), so that the linked source is never modified.
+    """
+    dst_path.parent.mkdir(parents=True, exist_ok=True)
+    dst_path.unlink(missing_ok=True)
+    try:
+        os.link(src_path, dst_path)
+    except OSError:
+        shutil.copy2(src_path, dst_path)
+
+def read_pair_cmds(pot_path: Path) -> tuple[str, str]:
+    """
+    Read the pair style and the arguments of the pair coefficients of a potential written by create_potential.
+
+    Returns:
+        tuple: pair style with its arguments, pair coefficients after the atom types.
     """
-    with template_path.open('r', encoding='utf-8') as file_template:
-        template: Template = Template(file_template.read())
-        content: str = template.safe_substitute(values)
-        with out_filepath.open('w', encoding='utf-8') as file_out:
-            file_out.write(content)
+    pair_style: str | None = None
+    pair_coeff: str | None = None
+    with pot_path.open('r', encoding='utf-8') as file:
+        for line in file:
+            tokens: list[str] = line.split()
+            if tokens and tokens[0] == 'pair_style':
+                pair_style = ' '.join(tokens[1:])
+            elif tokens and tokens[0] == 'pair_coeff':
+                pair_coeff = ' '.join(tokens[3:])
+    if pair_style is None or pair_coeff is None:
+        raise ValueError(f'No pair style found in {pot_path}')
+    return pair_style, pair_coeff
 
 class PotModel(ABC):
     """
@@ -88,19 +134,99 @@ class PotModel(ABC):
         """
 
     @abstractmethod
-    def lampify(self) -> Path:
+    def collect_loss_curve(self) -> tuple[list[int], list[Losses]]:
+        """
+        Collect the validation losses logged so far by the fitting process, can be called during the fit.
+
+        Returns:
+            tuple: the epochs (or iterations) of the evaluations and their losses.
+        """
+
+    def finalize_stopped_fit(self, epoch: int):
+        """
+        Write the outputs of a fit interrupted at an epoch, as if it had reached its budget.
+        The trainers saving their current state when interrupted need nothing more.
+
+        Args:
+            - epoch: last evaluated epoch.
+        """
+
+    @abstractmethod
+    def lampify(self, variant: str | None = None) -> Path:
         """
         Convert the model to a LAMMPS compatible format.
 
+        Args:
+            - variant: deployment variant to convert, the selected one by default.
+
         Returns:
             Path: The path to the converted model.
         """
 
+    def get_variants(self) -> list[str]:
+        """
+        Get the deployment variants lampify can produce, the first one is the reference.
+
+        Returns:
+            list: the names of the variants.
+        """
+        return ['default']
+
+    def get_variant_path(self, variant: str) -> Path:
+        """
+        Get the path to a converted variant of the model.
+
+        Args:
+            - variant: name of the variant.
+
+        Returns:
+            Path: the path to the converted variant.
+        """
+        return self._yace_path
+
+    def get_variant(self) -> str:
+        """
+        Get the variant used by the potential, the reference one unless another was selected.
+        """
+        variant_path: Path = self._out_path / VARIANT_NAME
+        if variant_path.exists():
+            with variant_path.open('r', encoding='utf-8') as file:
+                variant: str = yaml.safe_load(file)['variant']
+            if variant in self.get_variants():
+                return variant
+        return self.get_variants()[0]
+
+    def set_variant(self, variant: str):
+        """
+        Select the variant used by the potential, the choice is kept in the output directory.
+
+        Args:
+            - variant: name of the variant, one of get_variants.
+        """
+        if variant not in self.get_variants():
+            raise ValueError(f'Unknown variant {variant}, expected one of {self.get_variants()}')
+        tmp_path: Path = self._out_path / f'.{VARIANT_NAME}.{os.getpid()}'
+        with tmp_path.open('w', encoding='utf-8') as file:
+            yaml.safe_dump({'variant': variant}, file)
+        os.replace(tmp_path, self._out_path / VARIANT_NAME)
+
+    def get_lampify_source(self) -> Path | None:
+        """
+        Get the trained model converted by lampify.
+
+        Returns:
+            Path | None: the path to the trained model, None if it is used by LAMMPS as is.
+        """
+        return None
+
     @abstractmethod
-    def create_potential(self) -> Path:
+    def create_potential(self, n_ranks: int = 1) -> Path:
         """
         Create the potential file that will be included in the LAMMPS scripts.
 
+        Args:
+            - n_ranks: number of MPI ranks the potential is run with.
+
         Returns:
             Path: The path to the potential.
         """
@@ -115,6 +241,65 @@ class PotModel(ABC):
             - maxiter: the maximum number of iterations.
         """
 
+    @abstractmethod
+    def get_cost_features(self) -> dict[str, float]:
+        """
+        Get the hyperparameters that determine the inference cost of the model.
+
+        Returns:
+            dict: the cost features of the model, by name.
+        """
+
+    def collect_test_set(self) -> pd.DataFrame | None:
+        """
+        Get the test split of the fit, with the structures (ase_atoms) and their reference
+        energies and forces.
+
+        Returns:
+            pd.DataFrame | None: the test split, None if not available.
+        """
+        return None
+
+    @staticmethod
+    def get_preprocess_params(params: dict) -> dict | None:
+        """
+        Get the parameters of a fit that determine the preprocessing of its dataset,
+        the fits with the same ones can share the preprocessed dataset.
+
+        Args:
+            - params: parameters of the fit.
+
+        Returns:
+            dict | None: the preprocessing parameters, None if the dataset is not preprocessed.
+        """
+        return None
+
+    def preprocess_dataset(self) -> dict:
+        """
+        Preprocess the dataset of the configuration in the output directory,
+        by default the dataset is not preprocessed.
+
+        Returns:
+            dict: the data section of the fits pointing to the preprocessed dataset,
+                by default the one of the configuration unchanged.
+        """
+        with self._config_filepath.open('r', encoding='utf-8') as file:
+            return dict((yaml.safe_load(file) or {}).get('data', {}))
+
+    @staticmethod
+    @abstractmethod
+    def set_finetuning(params: dict, checkpoint_path: Path) -> dict:
+        """
+        Start the fit from a pretrained checkpoint (e.g. a foundation model) instead of a new model.
+
+        Args:
+            - params: parameters of the fit, updated in place
+            - checkpoint_path: path to the pretrained checkpoint
+
+        Returns:
+            dict: the parameters of the fine-tuning.
+        """
+
     @staticmethod
     @abstractmethod
     def get_lammps_params() -> str:
@@ -157,6 +342,19 @@ class PotModel(ABC):
         with self._config_filepath.open('r', encoding='utf-8') as file:
             return yaml.safe_load(file)
 
+    def get_elements(self) -> list[str]:
+        """
+        Get the chemical symbols of the elements of the model, in the order of the atom types
+        of the potential. Read from potential.elements of the configuration by default.
+
+        Returns:
+            list: the chemical symbols.
+        """
+        elements: list | None = (self.get_params().get('potential') or {}).get('elements')
+        if not elements:
+            raise ValueError(f'No potential.elements found in {self._config_filepath}.')
+        return [str(element) for element in elements]
+
     def get_pot_path(self) -> Path:
         """
         Get the path to the potential file.
@@ -0,0 +1,150 @@
+"""
+Parallel conversion of the trained models to their LAMMPS format.
+"""
+
+from __future__ import annotations
+
+import os
+import hashlib
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+
+from .model import PotModel
+
+CONVERSION_NAME: str = 'conversion.yaml'
+
+def get_file_hash(path: Path) -> str:
+    sha = hashlib.sha256()
+    with path.open('rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def convert_model(model: PotModel, force: bool = False, variant: str | None = None) -> tuple[Path, bool]:
+    """
+    Convert a variant of a model, unless it is up to date with the trained model,
+    according to the hash recorded at the last conversion.
+
+    Args:
+        - model: model to convert
+        - force: convert even if the converted model is up to date
+        - variant: variant to convert, the selected one by default
+
+    Returns:
+        tuple: path to the converted model and whether it was converted.
+    """
+    variant = variant if variant is not None else model.get_variant()
+    source_path: Path | None = model.get_lampify_source()
+    record_path: Path = model.get_out_path() / CONVERSION_NAME
+    source_hash: str | None = get_file_hash(source_path) if source_path is not None else None
+
+    record: dict = {}
+    if record_path.exists():
+        with record_path.open('r', encoding='utf-8') as file:
+            record = yaml.safe_load(file) or {}
+    # records without artifacts by variant (single artifact records) are treated as outdated
+    if record.get('source_hash') != source_hash or not isinstance(record.get('artifacts'), dict):
+        record = {'source': str(source_path), 'source_hash': source_hash, 'artifacts': {}}
+    artifact: str | None = record['artifacts'].get(variant)
+    if not force and source_hash is not None and artifact is not None and Path(artifact).exists():
+        return Path(artifact), False
+
+    artifact_path: Path = model.lampify(variant)
+    record['artifacts'][variant] = str(artifact_path)
+    tmp_path: Path = record_path.with_name(f'.{CONVERSION_NAME}.{os.getpid()}')
+    with tmp_path.open('w', encoding='utf-8') as file:
+        yaml.safe_dump(record, file)
+    os.replace(tmp_path, record_path)
+    return artifact_path, True
+
+def convert_variants(model: PotModel, force: bool = False) -> dict[str, Path | None]:
+    """
+    Convert all the variants of a model, in turn since they share the conversion record of the model.
+
+    Args:
+        - model: model to convert
+        - force: convert even if the converted variants are up to date
+
+    Returns:
+        dict: path to the converted model by variant, None if the conversion failed.
+    """
+    artifacts: dict[str, Path | None] = {}
+    for variant in model.get_variants():
+        try:
+            artifacts[variant], _ = convert_model(model, force, variant)
+        except Exception as exc: # pylint: disable=broad-except
+            print(f'Conversion of the variant {variant} of {model.get_out_path()} failed: {exc}')
+            artifacts[variant] = None
+    return artifacts
+
+class ModelConverter():
+    """
+    Class converting the selected variant, or all the variants, of many models in a pool of processes
+    sized to the allocated cores. The models are converted in spawned processes, each with its own
+    converter state (e.g. the TorchScript compilation of MACE), their potentials are then created.
+
+    Args:
+        - n_workers: number of conversion processes, the number of allocated cores by default
+    """
+    def __init__(self, n_workers: int | None = None):
+        self._n_workers: int = n_workers if n_workers is not None else len(os.sched_getaffinity(0))
+
+    def convert(self, models: list[PotModel], force: bool = False) -> dict[Path, Path | None]:
+        """
+        Convert the models, the up to date ones are skipped.
+
+        Args:
+            - models: models to convert
+            - force: convert all the models
+
+        Returns:
+            dict: path to the potential of each model by output path, None if the conversion failed.
+        """
+        potentials: dict[Path, Path | None] = {}
+        if not models:
+            return potentials
+
+        with ProcessPoolExecutor(max_workers=min(self._n_workers, len(models)),
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = [(model, executor.submit(convert_model, model, force)) for model in models]
+            for model, future in futures:
+                try:
+                    _, converted = future.result()
+                    potential_path: Path = model.create_potential()
+                except Exception as exc: # pylint: disable=broad-except
+                    print(f'Conversion of {model.get_out_path()} failed: {exc}')
+                    potentials[model.get_out_path()] = None
+                    continue
+                print(f'{model.get_out_path()}: {"converted" if converted else "up to date"}')
+                potentials[model.get_out_path()] = potential_path
+        return potentials
+
+    def convert_variants(self, models: list[PotModel],
+                         force: bool = False) -> dict[Path, dict[str, Path | None]]:
+        """
+        Convert all the deployment variants of the models, one process per model.
+
+        Args:
+            - models: models to convert
+            - force: convert all the variants
+
+        Returns:
+            dict: path to the converted model by variant, by output path of the model.
+        """
+        artifacts: dict[Path, dict[str, Path | None]] = {}
+        if not models:
+            return artifacts
+
+        with ProcessPoolExecutor(max_workers=min(self._n_workers, len(models)),
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = [(model, executor.submit(convert_variants, model, force)) for model in models]
+            for model, future in futures:
+                try:
+                    artifacts[model.get_out_path()] = future.result()
+                except Exception as exc: # pylint: disable=broad-except
+                    print(f'Conversion of the variants of {model.get_out_path()} failed: {exc}')
+                    artifacts[model.get_out_path()] = {}
+        return artifacts
@@ -65,3 +65,44 @@ def get_lammps_params(model_name: str) -> str:
         return PotGRACE.get_lammps_params()
 
     raise ValueError(f"Unsupported model: {model_name}")
+
+def get_preprocess_params(model_name: str, params: dict) -> dict | None:
+    """
+    Get the parameters of a fit that determine the preprocessing of its dataset
+
+    Args:
+        - model_name: name of the model
+        - params: parameters of the fit
+    """
+    if model_name == SupportedModel.PACE.value:
+        from .pace import PotPACE
+        return PotPACE.get_preprocess_params(params)
+    elif model_name == SupportedModel.MACE.value:
+        from .mace import PotMACE
+        return PotMACE.get_preprocess_params(params)
+    elif model_name == SupportedModel.GRACE.value:
+        from .grace import PotGRACE
+        return PotGRACE.get_preprocess_params(params)
+
+    raise ValueError(f"Unsupported model: {model_name}")
+
+def set_finetuning(model_name: str, params: dict, checkpoint_path: Path) -> dict:
+    """
+    Set the parameters of a fit to fine-tune a pretrained checkpoint
+
+    Args:
+        - model_name: name of the model
+        - params: parameters of the fit
+        - checkpoint_path: path to the pretrained checkpoint
+    """
+    if model_name == SupportedModel.PACE.value:
+        from .pace import PotPACE
+        return PotPACE.set_finetuning(params, checkpoint_path)
+    elif model_name == SupportedModel.MACE.value:
+        from .mace import PotMACE
+        return PotMACE.set_finetuning(params, checkpoint_path)
+    elif model_name == SupportedModel.GRACE.value:
+        from .grace import PotGRACE
+        return PotGRACE.set_finetuning(params, checkpoint_path)
+
+    raise ValueError(f"Unsupported model: {model_name}")
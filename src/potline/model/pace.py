@@ -4,6 +4,7 @@ Pacemaker wrapper for fitting ACE potentials using XPOT in HPC.
 
 from __future__ import annotations
 
+import os
 import subprocess
 from pathlib import Path
 import shutil
@@ -15,6 +16,10 @@ from .model import PotModel, POTENTIAL_TEMPLATE_PATH, CONFIG_NAME, Losses, gen_f
 from ..dispatcher import SupportedModel
 
 LAST_POTENTIAL_NAME: str = 'output_potential.yaml'
+FITTING_DATA_NAME: str = 'fitting_data_info.pckl.gzip'
+TEST_DATA_NAME: str = 'test_data_info.pckl.gzip'
+# deployment variants, by name: factor applied to the spline bin size of the radial functions
+SPLINE_VARIANTS: dict[str, float] = {'default': 1.0, 'coarse_spline': 5.0}
 
 class PotPACE(PotModel):
     """
@@ -34,17 +39,57 @@ class PotPACE(PotModel):
 
         return Losses(rmse_de, rmse_f_comp)
 
-    def lampify(self) -> Path:
-        subprocess.run(['pace_yaml2yace', '-o',
-                        str(self._yace_path),
-                        str(self._out_path / LAST_POTENTIAL_NAME)],
-                        check=True)
-        return self._yace_path
-
-    def create_potential(self) -> Path:
+    def collect_loss_curve(self) -> tuple[list[int], list[Losses]]:
+        test_metrics_path: Path = self._out_path / 'test_metrics.txt'
+        if not test_metrics_path.exists():
+            return [], []
+        # the last line may be partially written during the fit
+        train_metrics = pd.read_csv(test_metrics_path, sep=r'\s+').dropna()
+        epochs: list[int] = train_metrics['iter_num'].astype(int).tolist() if 'iter_num' in train_metrics \
+            else list(range(1, len(train_metrics) + 1))
+        return epochs, [Losses(float(row['rmse_epa']), float(row['rmse_f_comp']))
+                        for row in train_metrics.to_dict(orient='records')]
+
+    def lampify(self, variant: str | None = None) -> Path:
+        variant = variant if variant is not None else self.get_variant()
+        yace_path: Path = self.get_variant_path(variant)
+        source_path: Path = self._out_path / LAST_POTENTIAL_NAME
+        tmp_path: Path = yace_path.with_name(f'.{yace_path.name}.{os.getpid()}')
+        tmp_source_path: Path = source_path.with_name(f'.{variant}.{os.getpid()}.{source_path.name}')
+        if SPLINE_VARIANTS[variant] != 1.0:
+            with source_path.open('r', encoding='utf-8') as file:
+                potential: dict = yaml.safe_load(file)
+            potential['deltaSplineBins'] = \
+                float(potential.get('deltaSplineBins', 0.001)) * SPLINE_VARIANTS[variant]
+            with tmp_source_path.open('w', encoding='utf-8') as file:
+                yaml.safe_dump(potential, file, sort_keys=False)
+            source_path = tmp_source_path
+        try:
+            subprocess.run(['pace_yaml2yace', '-o',
+                            str(tmp_path),
+                            str(source_path)],
+                            check=True)
+        finally:
+            tmp_source_path.unlink(missing_ok=True)
+        os.replace(tmp_path, yace_path)
+        return yace_path
+
+    def get_lampify_source(self) -> Path | None:
+        return self._out_path / LAST_POTENTIAL_NAME
+
+    def get_variants(self) -> list[str]:
+        return list(SPLINE_VARIANTS)
+
+    def get_variant_path(self, variant: str) -> Path:
+        if variant == self.get_variants()[0]:
+            return self._yace_path
+        return self._yace_path.with_suffix(f'.{variant}{self._yace_path.suffix}')
+
+    def create_potential(self, n_ranks: int = 1) -> Path:
         potential_values: dict = {
             'pstyle': 'pace',
-            'yace_path': str(self._yace_path),
+            'yace_path': str(self.get_variant_path(self.get_variant())),
+            'elements': ' '.join(self.get_elements()),
         }
         gen_from_template(POTENTIAL_TEMPLATE_PATH, potential_values, self._lmp_pot_path)
         return self._lmp_pot_path
@@ -58,6 +103,48 @@ class PotPACE(PotModel):
         with self._config_filepath.open('w', encoding='utf-8') as file:
             yaml.safe_dump(config, file)
 
+    def get_cost_features(self) -> dict[str, float]:
+        config: dict = self.get_params()
+        potential: dict = config.get('potential', {})
+        functions: dict = potential.get('functions', {})
+        unary: dict = functions.get('UNARY', functions.get('ALL', {}))
+        bonds: dict = potential.get('bonds', {}).get('ALL', {})
+        nradmax: list[int] = unary.get('nradmax_by_orders', [])
+        lmax: list[int] = unary.get('lmax_by_orders', [])
+
+        return {
+            'cutoff': float(bonds.get('rcut', config.get('cutoff', 0.0))),
+            'n_functions': float(functions.get('number_of_functions_per_element', 0)),
+            'rank': float(len(nradmax)),
+            'nradmax': float(sum(nradmax)),
+            'lmax': float(max(lmax, default=0)),
+            'n_elements': float(len(potential.get('elements', []))),
+        }
+
+    @staticmethod
+    def get_preprocess_params(params: dict) -> dict | None:
+        # the neighbour lists depend on the global cutoff, the weights on the weighting policy
+        return {
+            'cutoff': params.get('cutoff'),
+            'data': params.get('data'),
+            'elements': params.get('potential', {}).get('elements'),
+            'weighting': params.get('fit', {}).get('weighting'),
+            'seed': params.get('seed'),
+        }
+
+    def preprocess_dataset(self) -> dict:
+        subprocess.run(['pacemaker', CONFIG_NAME, '--dry-run'], cwd=self._out_path, check=True)
+        data: dict[str, str] = {'filename': str(self._out_path / FITTING_DATA_NAME)}
+        if (self._out_path / TEST_DATA_NAME).exists():
+            data['test_filename'] = str(self._out_path / TEST_DATA_NAME)
+        return data
+
+    @staticmethod
+    def set_finetuning(params: dict, checkpoint_path: Path) -> dict:
+        # the basis of the initial potential is extended by the functions of the config, if any
+        params.setdefault('potential', {})['initial_potential'] = str(checkpoint_path)
+        return params
+
     @staticmethod
     def get_lammps_params() -> str:
         return ''
@@ -69,6 +156,11 @@ class PotPACE(PotModel):
         shutil.copy(self._out_path / LAST_POTENTIAL_NAME, out_path / LAST_POTENTIAL_NAME)
         super().switch_out_path(out_path)
 
+    def collect_test_set(self) -> pd.DataFrame | None:
+        if not (self._out_path / "test_pred.pckl.gzip").exists():
+            return None
+        return self._collect_raw_errors()
+
     def _collect_raw_errors(self) -> pd.DataFrame:
         """
         Collect errors from the fitting process.
@@ -0,0 +1,13 @@
+"""
+Model selection.
+"""
+
+from .pareto import (
+    SelectionStrategy,
+    pareto_ranks,
+    crowding_distance,
+    hypervolume,
+    select_pareto,
+    get_costs,
+    filter_best_pareto,
+    )
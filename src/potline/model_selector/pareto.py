@@ -0,0 +1,225 @@
+"""
+Multi-objective selection of the models over validation errors and inference cost.
+"""
+
+from enum import Enum
+
+import numpy as np
+
+from ..loss_logger import ModelTracker
+
+class SelectionStrategy(Enum):
+    """
+    Supported strategies to select the best models.
+    """
+    LOSS = 'loss'
+    CROWDING = 'crowding'
+    HYPERVOLUME = 'hypervolume'
+
+def pareto_ranks(objectives: np.ndarray) -> np.ndarray:
+    """
+    Non-dominated sorting of the points, all the objectives are minimized.
+
+    Args:
+        - objectives: array of shape (n_points, n_objectives)
+
+    Returns:
+        np.ndarray: front index of each point, 0 is the Pareto front.
+    """
+    # dominates[i, j] is True if point i dominates point j
+    dominates = np.all(objectives[:, None, :] <= objectives[None, :, :], axis=2) \
+        & np.any(objectives[:, None, :] < objectives[None, :, :], axis=2)
+    dominated_count: np.ndarray = dominates.sum(axis=0)
+    ranks = np.full(len(objectives), -1, dtype=int)
+    remaining = np.ones(len(objectives), dtype=bool)
+
+    rank: int = 0
+    while remaining.any():
+        front = remaining & (dominated_count == 0)
+        ranks[front] = rank
+        remaining &= ~front
+        dominated_count = dominated_count - dominates[front].sum(axis=0)
+        rank += 1
+    return ranks
+
+def crowding_distance(objectives: np.ndarray) -> np.ndarray:
+    """
+    Crowding distance of the points of a front, as defined in NSGA-II.
+
+    Args:
+        - objectives: array of shape (n_points, n_objectives)
+
+    Returns:
+        np.ndarray: crowding distance of each point, boundary points have infinite distance.
+    """
+    n_points, n_objectives = objectives.shape
+    if n_points <= 2:
+        return np.full(n_points, np.inf)
+
+    distance = np.zeros(n_points)
+    for k in range(n_objectives):
+        order = np.argsort(objectives[:, k], kind='stable')
+        span: float = float(objectives[order[-1], k] - objectives[order[0], k])
+        distance[order[0]] = distance[order[-1]] = np.inf
+        if span > 0:
+            distance[order[1:-1]] += (objectives[order[2:], k] - objectives[order[:-2], k]) / span
+    return distance
+
+def hypervolume(objectives: np.ndarray, reference: np.ndarray) -> float:
+    """
+    Hypervolume dominated by the points and bounded by the reference point, all the objectives are minimized.
+    Computed exactly by slicing along the first objective.
+
+    Args:
+        - objectives: array of shape (n_points, n_objectives)
+        - reference: reference point of shape (n_objectives,)
+
+    Returns:
+        float: the hypervolume.
+    """
+    points = objectives[np.all(objectives < reference, axis=1)]
+    if len(points) == 0:
+        return 0.0
+    points = points[np.argsort(points[:, 0], kind='stable')]
+
+    if points.shape[1] == 1:
+        return float(reference[0] - points[0, 0])
+    if points.shape[1] == 2:
+        widths = np.diff(np.append(points[:, 0], reference[0]))
+        heights = reference[1] - np.minimum.accumulate(points[:, 1])
+        return float(np.sum(widths * heights))
+
+    volume: float = 0.0
+    upper_bounds = np.append(points[1:, 0], reference[0])
+    for i, upper in enumerate(upper_bounds):
+        width: float = float(upper - points[i, 0])
+        if width > 0:
+            volume += width * hypervolume(points[:i+1, 1:], reference[1:])
+    return volume
+
+def _truncate_front(objectives: np.ndarray, n: int, strategy: str) -> list[int]:
+    """
+    Select n points of a front, preferring the ones that keep the front diverse.
+
+    Args:
+        - objectives: array of shape (n_points, n_objectives) of the front
+        - n: number of points to keep
+        - strategy: selection strategy
+
+    Returns:
+        list: indices of the kept points.
+    """
+    if strategy == SelectionStrategy.CROWDING.value:
+        order = np.argsort(-crowding_distance(objectives), kind='stable')
+        return [int(i) for i in order[:n]]
+
+    if strategy == SelectionStrategy.HYPERVOLUME.value:
+        # Greedily drop the point with the smallest exclusive hypervolume contribution
+        reference = np.full(objectives.shape[1], 1.1)
+        kept: list[int] = list(range(len(objectives)))
+        while len(kept) > n:
+            total: float = hypervolume(objectives[kept], reference)
+            contributions = [total - hypervolume(objectives[kept[:i] + kept[i+1:]], reference)
+                             for i in range(len(kept))]
+            kept.pop(int(np.argmin(contributions)))
+        return kept
+
+    raise ValueError(f"Unsupported selection strategy: {strategy}")
+
+def select_pareto(objectives: np.ndarray, n: int, strategy: str) -> list[int]:
+    """
+    Select n points front by front, the last partially selected front is truncated by the given strategy.
+
+    Args:
+        - objectives: array of shape (n_points, n_objectives), all the objectives are minimized
+        - n: number of points to select
+        - strategy: selection strategy used on the last front
+
+    Returns:
+        list: indices of the selected points.
+    """
+    if n >= len(objectives):
+        return list(range(len(objectives)))
+
+    # Compare the objectives on a common log scale normalized to [0, 1]
+    scaled = np.log10(np.maximum(objectives, np.finfo(np.float64).tiny))
+    span = scaled.max(axis=0) - scaled.min(axis=0)
+    scaled = (scaled - scaled.min(axis=0)) / np.where(span > 0, span, 1.0)
+
+    ranks = pareto_ranks(scaled)
+    selected: list[int] = []
+    for rank in range(int(ranks.max()) + 1):
+        front = np.flatnonzero(ranks == rank)
+        if len(selected) + len(front) <= n:
+            selected.extend(int(i) for i in front)
+            continue
+        kept: list[int] = _truncate_front(scaled[front], n - len(selected), strategy)
+        selected.extend(int(front[i]) for i in kept)
+        break
+    return selected
+
+def get_costs(model_list: list[ModelTracker],
+              measured_costs: dict[tuple[int, int], float]) -> list[float] | None:
+    """
+    Get the inference cost of each model: the measured one if the model has been benchmarked,
+    otherwise the predicted one. The predicted costs are relative to the reference cost of the cost model,
+    they are brought to the measured scale by the median ratio of the models having both,
+    or of the medians of the two groups if none has both.
+
+    Args:
+        - model_list: models to get the cost of
+        - measured_costs: measured inference costs by (iteration, subiteration)
+
+    Returns:
+        list | None: cost of each model, None if a model has neither cost.
+    """
+    measured: list[float | None] = [measured_costs.get((model.iteration, model.subiter))
+                                    for model in model_list]
+    predicted: list[float | None] = [model.predicted_cost for model in model_list]
+    if any(cost is None and prediction is None for cost, prediction in zip(measured, predicted)):
+        return None
+    if all(cost is not None for cost in measured):
+        return [float(cost) for cost in measured] # type: ignore
+    if all(cost is None for cost in measured):
+        return [float(prediction) for prediction in predicted] # type: ignore
+
+    ratios: list[float] = [cost / prediction for cost, prediction in zip(measured, predicted)
+                           if cost is not None and prediction is not None and prediction > 0]
+    scale: float = float(np.median(ratios)) if ratios \
+        else float(np.median([cost for cost in measured if cost is not None])
+                   / np.median([prediction for cost, prediction in zip(measured, predicted) if cost is None]))
+    return [float(cost) if cost is not None else float(prediction) * scale # type: ignore
+            for cost, prediction in zip(measured, predicted)]
+
+def filter_best_pareto(model_list: list[ModelTracker], energy_weight: float, n: int, strategy: str,
+                       measured_costs: dict[tuple[int, int], float] | None = None) -> list[ModelTracker]:
+    """
+    Select the best models over the validation energy and force errors and the inference cost.
+    Each model uses its measured cost if it has been benchmarked, otherwise its predicted one,
+    so that a model is ranked the same way by all the stages. When a model has neither,
+    only the errors are considered.
+
+    Args:
+        - model_list: models to select from
+        - energy_weight: weight of the energy loss, used to sort the selected models
+        - n: number of models to select
+        - strategy: selection strategy on the last front, crowding or hypervolume
+        - measured_costs: measured inference costs by (iteration, subiteration)
+
+    Returns:
+        list: the selected models, sorted by validation loss.
+    """
+    if any(model.valid_losses is None for model in model_list):
+        raise ValueError("valid loss not calculated.")
+
+    columns: list[list[float]] = [
+        [model.valid_losses.energy for model in model_list], # type: ignore
+        [model.valid_losses.force for model in model_list], # type: ignore
+    ]
+    costs: list[float] | None = get_costs(model_list, measured_costs or {})
+    if costs is not None:
+        columns.append(costs)
+
+    selected: list[int] = select_pareto(np.array(columns).T, n, strategy)
+    return sorted([model_list[i] for i in selected],
+                  key=lambda model: model.get_total_valid_loss(energy_weight))
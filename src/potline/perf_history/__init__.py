@@ -0,0 +1,13 @@
+"""
+Performance history of the inference benchmarks.
+"""
+
+from .perf_history import (
+    PerfHistory,
+    MACHINE_INFO_NAME,
+    TREND_REPORT_NAME,
+    write_machine_info,
+    get_machine_id,
+    get_lammps_build,
+    get_package_versions,
+    )
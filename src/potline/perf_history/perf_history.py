@@ -0,0 +1,276 @@
+"""
+Performance history of the inference benchmarks across sweeps.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import shutil
+import socket
+import hashlib
+from pathlib import Path
+from importlib import metadata
+
+import yaml
+import numpy as np
+import pandas as pd
+from scipy.stats import mannwhitneyu # type: ignore
+from tabulate import tabulate
+
+from ..inference_bencher import INFERENCE_BENCH_DIR_NAME, COST_FEATURES_NAME
+from ..loss_logger import INFO_FILENAME
+from ..cost_model import InferenceCostModel, read_bench_cost
+from ..dispatcher import SupportedModel
+
+MACHINE_INFO_NAME: str = 'machine_info.yaml'
+TREND_REPORT_NAME: str = 'perf_trend.md'
+MODEL_PACKAGES: dict[str, list[str]] = {
+    SupportedModel.PACE.value: ['pyace', 'tensorpotential', 'tensorflow'],
+    SupportedModel.MACE.value: ['mace-torch', 'torch'],
+    SupportedModel.GRACE.value: ['tensorpotential', 'tensorflow'],
+}
+HISTORY_FIELDS: list[str] = ['ingest_time', 'sweep_path', 'model_name', 'model_index',
+                             'iteration', 'subiteration', 'params_hash', 'cost_features',
+                             'machine', 'hostname', 'cpu_model', 'n_cpu',
+                             'lammps_build', 'packages', 'cost']
+
+def _short_hash(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+
+def get_cpu_model() -> str:
+    """
+    Get the CPU model of the current node.
+    """
+    cpuinfo_path: Path = Path('/proc/cpuinfo')
+    if cpuinfo_path.exists():
+        with cpuinfo_path.open('r', encoding='utf-8') as file:
+            for line in file:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    return 'unknown'
+
+def get_lammps_build(lammps_bin_path: Path) -> str:
+    """
+    Identify the LAMMPS build by the hash of its binary.
+
+    Args:
+        - lammps_bin_path: path to the LAMMPS binary
+
+    Returns:
+        str: short hash of the binary, 'unknown' if not found.
+    """
+    if not lammps_bin_path.is_file():
+        found: str | None = shutil.which(str(lammps_bin_path))
+        if found is None:
+            return 'unknown'
+        lammps_bin_path = Path(found)
+    digest = hashlib.sha256()
+    with lammps_bin_path.open('rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+def get_package_versions(model_name: str) -> str:
+    """
+    Get the versions of the packages used by the model.
+
+    Args:
+        - model_name: name of the model
+
+    Returns:
+        str: package versions, formatted as name=version separated by semicolons.
+    """
+    versions: list[str] = []
+    for package in MODEL_PACKAGES.get(model_name, []):
+        try:
+            versions.append(f'{package}={metadata.version(package)}')
+        except metadata.PackageNotFoundError:
+            versions.append(f'{package}=none')
+    return ';'.join(versions)
+
+def get_machine_id() -> str:
+    """
+    Identify the type of the current node by its CPU model and available cores.
+    """
+    return _short_hash(f'{get_cpu_model()};{len(os.sched_getaffinity(0))}')
+
+def write_machine_info(out_path: Path, lammps_bin_path: Path, model_name: str):
+    """
+    Write the fingerprint of the current node and software stack.
+    Has to run on the benchmarking node.
+
+    Args:
+        - out_path: directory where the information is written
+        - lammps_bin_path: path to the LAMMPS binary
+        - model_name: name of the model
+    """
+    info: dict = {
+        'machine': get_machine_id(),
+        'hostname': socket.gethostname(),
+        'cpu_model': get_cpu_model(),
+        'n_cpu': len(os.sched_getaffinity(0)),
+        'lammps_build': get_lammps_build(lammps_bin_path),
+        'packages': get_package_versions(model_name),
+    }
+    with (out_path / MACHINE_INFO_NAME).open('w', encoding='utf-8') as file:
+        yaml.safe_dump(info, file)
+
+class PerfHistory():
+    """
+    Store of the inference benchmark results of all the sweeps.
+    Detects performance regressions between LAMMPS builds or package updates.
+
+    Args:
+        - history_path: path to the history file (csv)
+    """
+    def __init__(self, history_path: Path):
+        self._history_path = history_path
+
+    def load(self) -> pd.DataFrame:
+        """
+        Load the history.
+
+        Returns:
+            pd.DataFrame: one row per benchmarked model.
+        """
+        if not self._history_path.exists():
+            return pd.DataFrame(columns=HISTORY_FIELDS)
+        return pd.read_csv(self._history_path)
+
+    def ingest(self, sweep_path: Path, model_name: str) -> int:
+        """
+        Add the inference benchmark results of a sweep to the history.
+        A sweep already in the history is skipped, so that its results are not counted twice.
+
+        Args:
+            - sweep_path: path to the sweep
+            - model_name: name of the model
+
+        Returns:
+            int: number of ingested results.
+        """
+        if str(sweep_path) in set(self.load()['sweep_path'].astype(str)):
+            print(f"{sweep_path} is already in the history, skipping.")
+            return 0
+
+        ingest_time: float = time.time()
+        rows: list[dict] = []
+        bench_path: Path = sweep_path / INFERENCE_BENCH_DIR_NAME
+        for model_path in sorted(d for d in bench_path.iterdir() if d.is_dir()):
+            cost: float | None = read_bench_cost(model_path)
+            if cost is None or not (model_path / MACHINE_INFO_NAME).exists():
+                continue
+            with (model_path / MACHINE_INFO_NAME).open('r', encoding='utf-8') as file:
+                machine_info: dict = yaml.safe_load(file)
+            with (model_path / INFO_FILENAME).open('r', encoding='utf-8') as file:
+                model_info: dict = yaml.safe_load(file)
+            with (model_path / COST_FEATURES_NAME).open('r', encoding='utf-8') as file:
+                features: str = json.dumps(yaml.safe_load(file), sort_keys=True)
+
+            rows.append({
+                'ingest_time': ingest_time,
+                'sweep_path': str(sweep_path),
+                'model_name': model_name,
+                'model_index': model_path.name,
+                'iteration': model_info['iteration'],
+                'subiteration': model_info['subiteration'],
+                'params_hash': _short_hash(features),
+                'cost_features': features,
+                **machine_info,
+                'cost': cost,
+            })
+
+        if rows:
+            self._history_path.parent.mkdir(parents=True, exist_ok=True)
+            pd.DataFrame(rows, columns=HISTORY_FIELDS).to_csv(
+                self._history_path, mode='a', index=False, header=not self._history_path.exists())
+        print(f"Ingested {len(rows)} benchmark results from {sweep_path}.")
+        return len(rows)
+
+    def detect_regressions(self, alpha: float = 0.05, min_slowdown: float = 0.05) -> pd.DataFrame:
+        """
+        Compare the latest ingestion of each (model, machine) pair against all the previous ones.
+        The effect of the hyperparameters is removed with a cost model fitted on the baseline,
+        then a one-sided Mann-Whitney U test checks whether the latest costs are higher.
+
+        Args:
+            - alpha: significance level
+            - min_slowdown: minimum relative slowdown reported as a regression
+
+        Returns:
+            pd.DataFrame: one row per (model, machine) pair with the test results.
+        """
+        history: pd.DataFrame = self.load()
+        results: list[dict] = []
+        for (model_name, machine), group in history.groupby(['model_name', 'machine']):
+            latest_time: float = group['ingest_time'].max()
+            latest: pd.DataFrame = group[group['ingest_time'] == latest_time]
+            baseline: pd.DataFrame = group[group['ingest_time'] < latest_time]
+            if len(latest) < 3 or len(baseline) < 3:
+                continue
+
+            latest_res, baseline_res = PerfHistory._residuals(latest, baseline)
+            p_value: float = float(mannwhitneyu(latest_res, baseline_res, alternative='greater').pvalue)
+            slowdown: float = float(np.exp(np.median(latest_res) - np.median(baseline_res)) - 1)
+            results.append({
+                'model_name': model_name,
+                'machine': machine,
+                'cpu_model': latest['cpu_model'].iloc[0],
+                'latest_build': latest['lammps_build'].iloc[0],
+                'latest_packages': latest['packages'].iloc[0],
+                'baseline_builds': ','.join(sorted(baseline['lammps_build'].unique())),
+                'n_latest': len(latest),
+                'n_baseline': len(baseline),
+                'slowdown': slowdown,
+                'p_value': p_value,
+                'regression': bool(p_value < alpha and slowdown > min_slowdown),
+            })
+        return pd.DataFrame(results)
+
+    def trend_report(self) -> str:
+        """
+        Build the trend of the inference cost over the ingested sweeps and write it next to the history.
+
+        Returns:
+            str: the report, as markdown tables.
+        """
+        history: pd.DataFrame = self.load()
+        trend = history.groupby(['model_name', 'machine', 'ingest_time', 'sweep_path',
+                                 'lammps_build', 'packages'])['cost'] \
+            .agg(['median', 'min', 'count']).reset_index() \
+            .sort_values(['model_name', 'machine', 'ingest_time'])
+        trend['change'] = trend.groupby(['model_name', 'machine'])['median'].pct_change()
+        trend['ingest_time'] = pd.to_datetime(trend['ingest_time'], unit='s').dt.strftime('%Y-%m-%d %H:%M')
+
+        regressions: pd.DataFrame = self.detect_regressions()
+        report: str = '# Inference cost trend (s per atom-step)\n\n' \
+            + tabulate(trend, headers='keys', tablefmt='github', showindex=False) \
+            + '\n\n# Regressions of the latest sweep\n\n' \
+            + tabulate(regressions, headers='keys', tablefmt='github', showindex=False) + '\n'
+        with (self._history_path.parent / TREND_REPORT_NAME).open('w', encoding='utf-8') as file:
+            file.write(report)
+
+        if regressions.empty:
+            return report
+        for _, row in regressions[regressions['regression']].iterrows():
+            print(f"REGRESSION: {row['model_name']} on {row['cpu_model']} is {row['slowdown']:.1%} slower "
+                  f"with LAMMPS build {row['latest_build']} ({row['latest_packages']}).")
+        return report
+
+    @staticmethod
+    def _residuals(latest: pd.DataFrame, baseline: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the log costs corrected for the hyperparameters of the models.
+        """
+        latest_cost = np.log(latest['cost'].to_numpy(dtype=float))
+        baseline_cost = np.log(baseline['cost'].to_numpy(dtype=float))
+        baseline_features: list[dict] = [json.loads(f) for f in baseline['cost_features']]
+        cost_model = InferenceCostModel.fit(list(zip(baseline_features, np.exp(baseline_cost))))
+
+        def predict(features: pd.Series) -> np.ndarray:
+            return np.log([cost_model.predict(json.loads(f)) for f in features])
+
+        return (latest_cost - predict(latest['cost_features']),
+                baseline_cost - predict(baseline['cost_features']))
@@ -3,4 +3,31 @@ This module contains the functions to analyze the properties of the simulation
 results obtained from LAMMPS.
 """
 
-from .lammps_analysis import PropertiesSimulator, PROPERTIES_BENCH_DIR_NAME, SUBMIT_SCRIPT_NAME
+from .lammps_analysis import PropertiesSimulator, PROPERTIES_BENCH_DIR_NAME
+from .property_engine import (
+    PropertyEngine,
+    PropertyTask,
+    PROPERTY_TASKS,
+    DATA_DIR_NAME,
+    get_task_levels,
+    run_materials,
+    )
+from .eos_fit import (
+    EOSResult,
+    EOS_NAMES,
+    fit_eos,
+    fit_all_eos,
+    read_eos_data,
+    write_eos_results,
+    )
+from .property_record import (
+    PropertyRecord,
+    PROPERTY_FIELDS,
+    PROPERTIES_RECORD_NAME,
+    PROPERTIES_SUMMARY_NAME,
+    collect_properties,
+    )
+from .property_score import PropertyScorer, ScoredCurve, SCORED_CURVES, REF_MATERIAL
+from .property_plots import PropertyPlotter, PlotSpec, PLOT_SPECS, PLOTS_DIR_NAME
+from .property_cache import PropertyCache, PROPERTY_CACHE_DIR_NAME, get_potential_hash
+from .material import Material, MATERIALS, DEFAULT_MATERIAL, get_materials
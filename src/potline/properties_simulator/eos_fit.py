@@ -0,0 +1,253 @@
+"""
+Vectorised fitting of equations of state (EOS) on energy-volume curves.
+Adapted from eos-fit.py by Davide Ceresoli, with analytic Jacobians and batches of curves.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+EV_A3_TO_GPA: float = 160.21765
+ATOMS_PER_CELL: int = 2 # bcc, default structure
+EOS_NAMES: list[str] = ['murnaghan', 'birch_murnaghan', 'birch', 'vinet']
+EOS_LABELS: dict[str, str] = {
+    'murnaghan': 'Murnaghan',
+    'birch_murnaghan': 'Birch-Murnaghan',
+    'birch': 'Birch',
+    'vinet': 'Vinet',
+}
+
+# Each EOS takes the parameters (E0, B0, Bp, V0) with shape (n_curves, 1) and the volumes
+# with shape (n_curves, n_points), returns the energies and the Jacobian (n_curves, n_points, 4).
+EOSFunction = Callable[[np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]]
+
+def eos_murnaghan(params: np.ndarray, vol: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    From Phys. Rev. B 28, 5480 (1983)
+    """
+    e0, b0, bp, v0 = params.T[..., None]
+    ratio = v0 / vol
+    x = ratio**bp
+    energy = e0 + b0/bp * vol * (x/(bp-1) + 1) - v0*b0/(bp-1)
+    d_b0 = vol/bp * (x/(bp-1) + 1) - v0/(bp-1)
+    d_bp = b0 * vol * (-(x/(bp-1) + 1)/bp**2 + (x*np.log(ratio)/(bp-1) - x/(bp-1)**2)/bp) \
+        + v0*b0/(bp-1)**2
+    d_v0 = b0/(bp-1) * (ratio**(bp-1) - 1)
+    return energy, np.stack([np.ones_like(energy), d_b0, d_bp, d_v0], axis=-1)
+
+def eos_birch_murnaghan(params: np.ndarray, vol: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    From Phys. Rev. B 70, 224107
+    """
+    e0, b0, bp, v0 = params.T[..., None]
+    t = (vol/v0)**(2/3)
+    f = t - 1
+    g = 2*f**2 + (bp-4)*f**3
+    energy = e0 + 9*b0*v0/16 * g
+    d_b0 = 9*v0/16 * g
+    d_bp = 9*b0*v0/16 * f**3
+    d_v0 = 9*b0/16 * g + 9*b0*v0/16 * (4*f + 3*(bp-4)*f**2) * (-2/3 * t/v0)
+    return energy, np.stack([np.ones_like(energy), d_b0, d_bp, d_v0], axis=-1)
+
+def eos_birch(params: np.ndarray, vol: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    From Intermetallic compounds: Principles and Practice, Vol. I: Princples
+    Chapter 9 pages 195-210 by M. Mehl. B. Klein, D. Papaconstantopoulos
+    """
+    e0, b0, bp, v0 = params.T[..., None]
+    u = (v0/vol)**(2/3) - 1
+    energy = e0 + 9/8*b0*v0*u**2 + 9/16*b0*v0*(bp-4)*u**3
+    d_b0 = 9/8*v0*u**2 + 9/16*v0*(bp-4)*u**3
+    d_bp = 9/16*b0*v0*u**3
+    d_v0 = 9/8*b0*u**2 + 9/16*b0*(bp-4)*u**3 \
+        + b0*v0 * (9/4*u + 27/16*(bp-4)*u**2) * (2/3 * (u+1)/v0)
+    return energy, np.stack([np.ones_like(energy), d_b0, d_bp, d_v0], axis=-1)
+
+def eos_vinet(params: np.ndarray, vol: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    From Phys. Rev. B 70, 224107
+    """
+    e0, b0, bp, v0 = params.T[..., None]
+    eta = (vol/v0)**(1/3)
+    x = eta - 1
+    c = 3*(bp-1)/2
+    exp = np.exp(-c*x)
+    poly = 5 + 3*bp*x - 3*eta
+    h = poly * exp
+    k = 2*v0/(bp-1)**2
+    energy = e0 + b0*k*(2 - h)
+    d_b0 = k*(2 - h)
+    d_h_bp = 3*x*exp - 1.5*x*h
+    d_bp = -4*b0*v0/(bp-1)**3 * (2 - h) - b0*k*d_h_bp
+    d_h_eta = 3*(bp-1)*exp - c*h
+    d_v0 = 2*b0/(bp-1)**2 * (2 - h) - b0*k*d_h_eta * (-eta/(3*v0))
+    return energy, np.stack([np.ones_like(energy), d_b0, d_bp, d_v0], axis=-1)
+
+EOS_FUNCTIONS: dict[str, EOSFunction] = {
+    'murnaghan': eos_murnaghan,
+    'birch_murnaghan': eos_birch_murnaghan,
+    'birch': eos_birch,
+    'vinet': eos_vinet,
+}
+
+class EOSResult():
+    """
+    Fitted parameters of a batch of energy-volume curves, energies and volumes are per atom.
+
+    Args:
+        - eos: name of the equation of state
+        - params: fitted (E0, B0, Bp, V0) of each curve, B0 in eV/A^3
+        - rmse: root mean square residual of each curve, in eV
+        - converged: whether the fit of each curve converged
+        - atoms_per_cell: atoms in the conventional cell of the crystal structure
+    """
+    def __init__(self, eos: str, params: np.ndarray, rmse: np.ndarray, converged: np.ndarray,
+                 atoms_per_cell: int = ATOMS_PER_CELL):
+        self.eos: str = eos
+        self.e0: np.ndarray = params[:, 0]
+        self.b0: np.ndarray = params[:, 1]
+        self.bp: np.ndarray = params[:, 2]
+        self.v0: np.ndarray = params[:, 3]
+        self.rmse: np.ndarray = rmse
+        self.converged: np.ndarray = converged
+        self.atoms_per_cell: int = atoms_per_cell
+
+    @property
+    def b0_gpa(self) -> np.ndarray:
+        return self.b0 * EV_A3_TO_GPA
+
+    @property
+    def a0(self) -> np.ndarray:
+        return (self.v0 * self.atoms_per_cell)**(1/3)
+
+    def to_dicts(self) -> list[dict[str, float]]:
+        """
+        Get the results of each curve.
+        """
+        return [{'E0': float(self.e0[i]), 'B0': float(self.b0_gpa[i]), 'Bp': float(self.bp[i]),
+                 'V0': float(self.v0[i]), 'a0': float(self.a0[i]), 'rmse': float(self.rmse[i])}
+                for i in range(len(self.e0))]
+
+def get_initial_params(vol: np.ndarray, ene: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    Get the initial parameters from a parabola fitted on each curve.
+    """
+    design = np.stack([vol**2, vol, np.ones_like(vol)], axis=-1) * mask[..., None]
+    coeffs = np.linalg.solve(np.einsum('npi,npj->nij', design, design),
+                             np.einsum('npi,np->ni', design, ene * mask)[..., None])[..., 0]
+    a, b, c = coeffs.T
+    v0 = -b/(2*a)
+    return np.stack([a*v0**2 + b*v0 + c, 2*a*v0, np.full_like(a, 4.0), v0], axis=-1)
+
+def fit_eos(volumes: np.ndarray, energies: np.ndarray, eos: str = 'birch_murnaghan',
+            max_iter: int = 200, tol: float = 1e-12, atoms_per_cell: int = ATOMS_PER_CELL) -> EOSResult:
+    """
+    Fit an equation of state on a batch of curves with the Levenberg-Marquardt algorithm,
+    all the curves are updated at once. Missing points are given as NaN.
+
+    Args:
+        - volumes: volumes per atom, shape (n_points,) or (n_curves, n_points)
+        - energies: energies per atom, same shape as volumes
+        - eos: name of the equation of state, one of EOS_NAMES
+        - max_iter: maximum number of iterations
+        - tol: relative decrease of the cost under which a curve is converged
+        - atoms_per_cell: atoms in the conventional cell, to get the lattice constant
+
+    Returns:
+        EOSResult: the fitted parameters.
+    """
+    if eos not in EOS_FUNCTIONS:
+        raise ValueError(f'Unsupported equation of state: {eos}')
+    function: EOSFunction = EOS_FUNCTIONS[eos]
+    vol = np.atleast_2d(np.asarray(volumes, dtype=float))
+    ene = np.atleast_2d(np.asarray(energies, dtype=float))
+    mask = np.isfinite(vol) & np.isfinite(ene)
+    vol = np.where(mask, vol, np.nanmean(vol, axis=1, keepdims=True))
+    ene = np.where(mask, ene, 0.0)
+
+    def get_cost(params: np.ndarray) -> np.ndarray:
+        with np.errstate(all='ignore'):
+            residuals = (ene - function(params, vol)[0]) * mask
+        cost = np.sum(residuals**2, axis=1)
+        return np.where(np.isfinite(cost), cost, np.inf)
+
+    params: np.ndarray = get_initial_params(vol, ene, mask)
+    damping = np.full(len(vol), 1e-3)
+    cost = get_cost(params)
+    converged = np.zeros(len(vol), dtype=bool)
+    for _ in range(max_iter):
+        energy, jac = function(params, vol)
+        residuals = (ene - energy) * mask
+        jac = jac * mask[..., None]
+        jtj = np.einsum('npi,npj->nij', jac, jac)
+        jtr = np.einsum('npi,np->ni', jac, residuals)
+        diag = np.einsum('nii->ni', jtj)
+        lhs = jtj + (damping[:, None] * np.maximum(diag, 1e-12))[..., None] * np.eye(4)
+        step = np.linalg.solve(lhs, jtr[..., None])[..., 0]
+        step[converged] = 0
+
+        new_params = params + step
+        new_cost = get_cost(new_params)
+        improved = new_cost < cost
+        params = np.where(improved[:, None], new_params, params)
+        converged |= improved & (cost - new_cost <= tol * np.maximum(cost, 1e-30))
+        cost = np.where(improved, new_cost, cost)
+        damping = np.where(improved, damping / 3, damping * 5)
+        converged |= damping > 1e12
+        if converged.all():
+            break
+
+    rmse = np.sqrt(cost / mask.sum(axis=1))
+    return EOSResult(eos, params, rmse, converged, atoms_per_cell)
+
+def fit_all_eos(volumes: np.ndarray, energies: np.ndarray) -> dict[str, EOSResult]:
+    """
+    Fit all the supported equations of state on a batch of curves.
+
+    Args:
+        - volumes: volumes per atom, shape (n_points,) or (n_curves, n_points)
+        - energies: energies per atom, same shape as volumes
+
+    Returns:
+        dict: the fitted parameters, by equation of state.
+    """
+    return {eos: fit_eos(volumes, energies, eos) for eos in EOS_NAMES}
+
+def read_eos_data(paths: list[Path]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Read the energy-volume curves written by in.eos, shorter curves are padded with NaN.
+
+    Args:
+        - paths: files with one "volume energy" line per point
+
+    Returns:
+        tuple: volumes and energies, shape (n_curves, n_points).
+    """
+    curves: list[np.ndarray] = [np.atleast_2d(np.loadtxt(path, comments=['#', '!'], usecols=(0, 1)))
+                                for path in paths]
+    n_points: int = max(len(curve) for curve in curves)
+    data = np.full((len(curves), n_points, 2), np.nan)
+    for i, curve in enumerate(curves):
+        data[i, :len(curve)] = curve
+    return data[..., 0], data[..., 1]
+
+def write_eos_results(result: EOSResult, results_path: Path, index: int = 0):
+    """
+    Append the fitted parameters of a curve to the results of the potential.
+
+    Args:
+        - result: fitted parameters
+        - results_path: path to the results file
+        - index: index of the curve in the batch
+    """
+    with results_path.open('a', encoding='utf-8') as file:
+        file.write("============================================ \n")
+        file.write(f"{EOS_LABELS[result.eos]} \n")
+        file.write(f"E0 = {result.e0[index]:f} eV\n")
+        file.write(f"B0 = {result.b0_gpa[index]:f} GPa\n")
+        file.write(f"Bp = {result.bp[index]:f}\n")
+        file.write(f"V0 = {result.v0[index]:f} angstrom^3\n")
+        file.write(f"a0 = {result.a0[index]:f} angstrom\n")
@@ -3,15 +3,13 @@ Properties simulation.
 """
 
 from pathlib import Path
-import shutil
 
 from ..config_reader import ConfigReader
 from ..loss_logger import ModelTracker
+from ..model import POTENTIAL_NAME
+from ..stager import Stager, RunDir
 
 PROPERTIES_BENCH_DIR_NAME: str = 'properties_bench'
-SUBMIT_SCRIPT_NAME: str = 'submit.sh'
-PROP_BENCH_TEMPLATE_PATH: Path = Path(__file__).parent / 'template'
-SUBMIT_TEMPLATE_PATH: Path = PROP_BENCH_TEMPLATE_PATH / SUBMIT_SCRIPT_NAME
 
 class PropertiesSimulator():
     """
@@ -23,7 +21,6 @@ class PropertiesSimulator():
     """
 
     LAMMPS_INPS_PATH: Path = Path(__file__).parent / 'pot_testing' / 'lmps_inputs'
-    PPS_PYTHON_PATH: Path = Path(__file__).parent / 'pot_testing' / 'py_pps'
     REF_DATA_PATH: Path = Path(__file__).parent / 'pot_testing' / 'REF_DATA'
 
     def __init__(self, config_path: Path, tracker_list: list[ModelTracker]):
@@ -37,9 +34,9 @@ class PropertiesSimulator():
         """
         self._out_path.mkdir(exist_ok=True)
 
-        for i, tracker in enumerate(self._tracker_list):
-            iter_path = self._out_path / str(i+1)
-            iter_path.mkdir(exist_ok=True)
-            shutil.copy(SUBMIT_TEMPLATE_PATH, iter_path)
-            shutil.copy(tracker.model.get_pot_path(), iter_path)
-            tracker.save_info(iter_path)
+        # the LAMMPS inputs are linked in the directory of each calculation by the property engine
+        Stager().stage([RunDir(
+            self._out_path / str(i+1),
+            copies={POTENTIAL_NAME: tracker.model.get_pot_path()},
+            writers=[tracker.save_info],
+        ) for i, tracker in enumerate(self._tracker_list)])
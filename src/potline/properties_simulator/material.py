@@ -0,0 +1,108 @@
+"""
+Elements and crystal structures of the properties simulations.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import yaml
+
+MATERIAL_NAME: str = 'material.yaml'
+ATOMS_PER_STRUCTURE: dict[str, int] = {'bcc': 2, 'fcc': 4}
+
+class Material():
+    """
+    Element and crystal structure simulated with a potential.
+
+    Args:
+        - name: name of the material, used as directory name
+        - element: chemical symbol, mapped to the atom type of the potential
+        - structure: crystal structure, one of ATOMS_PER_STRUCTURE
+        - mass: atomic mass, in g/mol
+        - lattice: initial guess of the lattice constant, center of the EOS scan, in angstrom
+    """
+    def __init__(self, name: str, element: str, structure: str, mass: float, lattice: float):
+        if structure not in ATOMS_PER_STRUCTURE:
+            raise ValueError(f'Unsupported crystal structure: {structure}')
+        self.name: str = name
+        self.element: str = element
+        self.structure: str = structure
+        self.mass: float = mass
+        self.lattice: float = lattice
+
+    @property
+    def atoms_per_cell(self) -> int:
+        return ATOMS_PER_STRUCTURE[self.structure]
+
+    def get_lmp_vars(self) -> dict[str, str]:
+        """
+        Get the LAMMPS variables describing the material in the inputs.
+        """
+        return {'structure': self.structure, 'mass': str(self.mass), 'lat0': str(self.lattice)}
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'element': self.element, 'structure': self.structure,
+                'mass': self.mass, 'lattice': self.lattice}
+
+    @staticmethod
+    def from_dict(data: dict) -> Material:
+        return Material(str(data.get('name', data['element'])), str(data['element']), str(data['structure']),
+                        float(data['mass']), float(data['lattice']))
+
+    @staticmethod
+    def from_config(value: str | dict) -> Material:
+        """
+        Get a material from its name among MATERIALS, or from its definition.
+        """
+        if isinstance(value, str):
+            if value not in MATERIALS:
+                raise ValueError(f'Unknown material: {value}, '
+                                 'define its element, structure, mass and lattice')
+            return MATERIALS[value]
+        return Material.from_dict(value)
+
+    def save(self, out_path: Path):
+        with out_path.open('w', encoding='utf-8') as file:
+            yaml.safe_dump(self.to_dict(), file, sort_keys=False)
+
+    @staticmethod
+    def load(in_path: Path) -> Material:
+        with in_path.open('r', encoding='utf-8') as file:
+            return Material.from_dict(yaml.safe_load(file))
+
+MATERIALS: dict[str, Material] = {
+    'Fe': Material('Fe', 'Fe', 'bcc', 55.845, 2.834),
+    'Cr': Material('Cr', 'Cr', 'bcc', 51.996, 2.885),
+    'W': Material('W', 'W', 'bcc', 183.84, 3.165),
+    'Mo': Material('Mo', 'Mo', 'bcc', 95.95, 3.147),
+}
+DEFAULT_MATERIAL: Material = MATERIALS['Fe']
+
+def get_materials(values: list | None) -> list[Material]:
+    """
+    Get the materials of the configuration, by name or definition, the default material if none.
+    """
+    return [Material.from_config(value) for value in values] if values else [DEFAULT_MATERIAL]
+
+def write_material_potential(potential_path: Path, out_path: Path, element: str):
+    """
+    Write the potential with the single atom type of the material mapped to its element,
+    the other species of a multi-element potential are left out of the simulation.
+
+    Args:
+        - potential_path: LAMMPS potential file, 'pair_coeff * * <model> <element of each type>'
+        - out_path: path to the written potential
+        - element: chemical symbol of the atom type
+    """
+    lines: list[str] = []
+    for line in potential_path.read_text(encoding='utf-8').splitlines():
+        tokens: list[str] = line.split()
+        if tokens and tokens[0] == 'pair_coeff' and len(tokens) > 4:
+            species: list[str] = tokens[4:]
+            if element not in species:
+                raise ValueError(f'The potential {potential_path} does not describe {element}, '
+                                 f'only {" ".join(species)}.')
+            line = ' '.join(tokens[:4] + [element])
+        lines.append(line)
+    out_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
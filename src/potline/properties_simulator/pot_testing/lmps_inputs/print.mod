@@ -10,3 +10,11 @@ print "Bulk Modulus = ${bulkmodulus} ${cunits}"  append ./data/results.txt
 print "Shear Modulus 1 = ${shearmodulus1} ${cunits}"  append ./data/results.txt
 print "Shear Modulus 2 = ${shearmodulus2} ${cunits}"  append ./data/results.txt
 print "Poisson Ratio = ${poissonratio}"  append ./data/results.txt
+
+print "c11 ${C11all}"  append ./data/properties.dat
+print "c12 ${C12all}"  append ./data/properties.dat
+print "c44 ${C44all}"  append ./data/properties.dat
+print "bulk_modulus ${bulkmodulus}"  append ./data/properties.dat
+print "shear_modulus_1 ${shearmodulus1}"  append ./data/properties.dat
+print "shear_modulus_2 ${shearmodulus2}"  append ./data/properties.dat
+print "poisson_ratio ${poissonratio}"  append ./data/properties.dat
@@ -0,0 +1,132 @@
+"""
+Content-addressed cache of the properties calculations.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import hashlib
+from pathlib import Path
+from typing import Any
+
+from ..model import POTENTIAL_NAME
+from ..perf_history import get_lammps_build
+
+PROPERTY_CACHE_DIR_NAME: str = 'property_cache'
+COMPLETE_NAME: str = '.complete'
+
+def update_hash(sha: Any, path: Path):
+    """
+    Add the content of a file, or of all the files of a directory, to a hash.
+    """
+    if path.is_dir():
+        for sub_path in sorted(path.rglob('*')):
+            if sub_path.is_file():
+                sha.update(str(sub_path.relative_to(path)).encode())
+                sha.update(sub_path.read_bytes())
+    else:
+        sha.update(path.read_bytes())
+
+def get_potential_hash(potential_path: Path) -> str:
+    """
+    Get the hash of a potential, the files referenced by its commands (.yace, .pt, GRACE model
+    directory) are hashed by content, so that it does not depend on where the model is stored.
+
+    Args:
+        - potential_path: path to the LAMMPS potential file
+
+    Returns:
+        str: hash of the potential.
+    """
+    sha = hashlib.sha256()
+    for line in potential_path.read_text(encoding='utf-8').splitlines():
+        for token in line.split():
+            if token.startswith('/') and Path(token).exists():
+                update_hash(sha, Path(token))
+            else:
+                sha.update(token.encode())
+        sha.update(b'\n')
+    return sha.hexdigest()
+
+class PropertyCache():
+    """
+    Class storing the directories of the completed properties calculations, keyed on the hash
+    of the potential, of the LAMMPS inputs and variables, and of the LAMMPS binary.
+
+    Args:
+        - cache_path: directory of the cache, can be shared by several sweeps
+        - lammps_cmd: LAMMPS binary, with the model specific parameters
+    """
+    def __init__(self, cache_path: Path, lammps_cmd: str):
+        self._cache_path = cache_path
+        self._build: str = f'{get_lammps_build(Path(lammps_cmd.split()[0]))} {lammps_cmd}'
+        self._cache_path.mkdir(parents=True, exist_ok=True)
+
+    def get_key(self, potential_hash: str, input_paths: list[Path], lmp_vars: dict[str, str],
+                suffix: str) -> str:
+        """
+        Get the key of a calculation.
+
+        Args:
+            - potential_hash: hash of the potential
+            - input_paths: LAMMPS input script and included files
+            - lmp_vars: values of the LAMMPS variables, by name
+            - suffix: accelerator suffix
+
+        Returns:
+            str: key of the calculation.
+        """
+        sha = hashlib.sha256(f'{potential_hash} {self._build} {suffix}'.encode())
+        for path in input_paths:
+            sha.update(path.name.encode())
+            update_hash(sha, path)
+        for name, value in sorted(lmp_vars.items()):
+            sha.update(f'{name}={value}'.encode())
+        return sha.hexdigest()
+
+    def fetch(self, key: str, task_path: Path) -> bool:
+        """
+        Copy a cached calculation in the directory of the task.
+
+        Returns:
+            bool: whether the calculation was cached.
+        """
+        entry_path: Path = self._cache_path / key
+        if not (entry_path / COMPLETE_NAME).exists():
+            return False
+        shutil.copytree(entry_path, task_path, dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns(COMPLETE_NAME))
+        return True
+
+    def store(self, key: str, task_path: Path):
+        """
+        Add a completed calculation to the cache, the entry is visible only once fully copied.
+        The copy is renamed into place atomically, a concurrent store of the same key keeps the
+        first complete entry.
+        """
+        entry_path: Path = self._cache_path / key
+        if (entry_path / COMPLETE_NAME).exists():
+            return
+        tmp_path: Path = Path(tempfile.mkdtemp(prefix=f'.{key}.', dir=self._cache_path))
+        shutil.copytree(task_path, tmp_path, dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns(POTENTIAL_NAME))
+        (tmp_path / COMPLETE_NAME).touch()
+        try:
+            os.rename(tmp_path, entry_path)
+            return
+        except OSError:
+            if (entry_path / COMPLETE_NAME).exists():
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                return
+
+        # incomplete entry left by an interrupted store, moved aside before replacing it
+        stale_path: Path = Path(tempfile.mkdtemp(prefix=f'.{key}.', dir=self._cache_path))
+        try:
+            os.rename(entry_path, stale_path / key)
+            os.rename(tmp_path, entry_path)
+        except OSError:
+            pass
+        shutil.rmtree(stale_path, ignore_errors=True)
+        shutil.rmtree(tmp_path, ignore_errors=True)
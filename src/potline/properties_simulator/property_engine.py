@@ -0,0 +1,377 @@
+"""
+Engine running the properties simulations of a potential as a task graph.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+import numpy as np
+
+from ..model import POTENTIAL_NAME
+from ..launch_tuner import LaunchConfig
+from ..stager import link_input
+from .property_cache import PropertyCache, get_potential_hash
+from .material import Material, DEFAULT_MATERIAL, MATERIAL_NAME, write_material_potential
+from .eos_fit import fit_eos, read_eos_data, write_eos_results
+from .property_record import (
+    PropertyRecord,
+    PROPERTY_FIELDS,
+    PROPERTIES_DATA_NAME,
+    PROPERTIES_RECORD_NAME,
+    PRESCREEN_NAME,
+    DATA_DIR_NAME,
+    )
+
+TASKS_DIR_NAME: str = 'tasks'
+RESULTS_NAME: str = 'results.txt'
+EOS_DATA_NAME: str = 'volume.dat'
+PRESCREEN_TASK_NAMES: list[str] = ['eos', 'elastic'] # cheap tasks checked before the others
+
+class PropertyTask():
+    """
+    LAMMPS calculation of a property.
+
+    Args:
+        - name: name of the task
+        - input_name: LAMMPS input script
+        - depends: names of the tasks that have to be completed before
+        - outputs: files copied to the data directory once completed
+        - extra_inputs: other files included by the input script
+        - lmp_vars: LAMMPS variables of the run, values are the names of the engine variables
+        - structures: crystal structures the input applies to, all if None
+    """
+    def __init__(self, name: str, input_name: str,
+                 depends: list[str] | None = None,
+                 outputs: list[str] | None = None,
+                 extra_inputs: list[str] | None = None,
+                 lmp_vars: dict[str, str] | None = None,
+                 structures: list[str] | None = None):
+        self.name: str = name
+        self.input_name: str = input_name
+        self.depends: list[str] = depends if depends is not None else []
+        self.outputs: list[str] = outputs if outputs is not None else []
+        self.extra_inputs: list[str] = extra_inputs if extra_inputs is not None else []
+        self.lmp_vars: dict[str, str] = lmp_vars if lmp_vars is not None else {}
+        self.structures: list[str] | None = structures
+
+# Variables of the material given to all the tasks
+MATERIAL_LMP_VARS: dict[str, str] = {'structure': 'structure', 'mass': 'mass'}
+
+# Only the lattice constant, fitted on the EOS, is shared between the calculations.
+# The Bain path and the stacking faults of the <111> slip systems are specific to bcc.
+PROPERTY_TASKS: list[PropertyTask] = [
+    PropertyTask('eos', 'in.eos', lmp_vars={'lat0': 'lat0'}),
+    PropertyTask('vac', 'in.vac', ['eos'], lmp_vars={'lat': 'a0'}),
+    PropertyTask('elastic', 'in.elastic', ['eos'],
+                 extra_inputs=['init.mod', 'neigh.mod', 'displace.mod', 'print.mod'], lmp_vars={'lat': 'a0'}),
+    PropertyTask('surf1', 'in.surf1', ['eos'], lmp_vars={'lat': 'a0'}),
+    PropertyTask('surf2', 'in.surf2', ['eos'], lmp_vars={'lat': 'a0'}),
+    PropertyTask('surf3', 'in.surf3', ['eos'], lmp_vars={'lat': 'a0'}),
+    PropertyTask('surf4', 'in.surf4', ['eos'], lmp_vars={'lat': 'a0'}),
+    PropertyTask('bain_path', 'in.bain_path', ['eos'], ['bain_path.csv'], lmp_vars={'lat': 'a0'},
+                 structures=['bcc']),
+    PropertyTask('sfe_110', 'in.sfe_110', ['eos'], ['sfe_110.csv'], lmp_vars={'lat': 'a0'},
+                 structures=['bcc']),
+    PropertyTask('sfe_112', 'in.sfe_112', ['eos'], ['sfe_112.csv'], lmp_vars={'lat': 'a0'},
+                 structures=['bcc']),
+    PropertyTask('ts_100', 'in.ts_100', ['eos'], ['ts_100.csv'], lmp_vars={'lat': 'a0'}),
+    PropertyTask('ts_110', 'in.ts_110', ['eos'], ['ts_110.csv'], lmp_vars={'lat': 'a0'}),
+]
+
+def get_task_levels(tasks: list[PropertyTask], done: set[str] | None = None) -> list[list[PropertyTask]]:
+    """
+    Group the tasks in levels, each level only depends on the previous ones.
+
+    Args:
+        - tasks: tasks of the graph
+        - done: names of the tasks already completed
+
+    Returns:
+        list: levels of tasks, in execution order.
+    """
+    done = set(done) if done is not None else set()
+    levels: list[list[PropertyTask]] = []
+    remaining: list[PropertyTask] = list(tasks)
+    while remaining:
+        level = [task for task in remaining if set(task.depends) <= done]
+        if not level:
+            raise ValueError(f'Cyclic or missing dependencies: {[task.name for task in remaining]}')
+        levels.append(level)
+        done.update(task.name for task in level)
+        remaining = [task for task in remaining if task.name not in done]
+    return levels
+
+class PropertyEngine():
+    """
+    Class running the properties simulations of a material with the potential of a directory.
+    The tasks of each level of the graph run concurrently, each one in its own directory
+    and on its own partition of the allocated cores.
+    With a pre-screen, the EOS and the elastic constants are computed first and the other
+    tasks are skipped if a property is missing or out of its tolerance band.
+
+    Args:
+        - lammps_cmd: LAMMPS binary, with the model specific parameters
+        - lmp_inps_path: directory of the LAMMPS inputs
+        - launch: tuned launch configuration, scaled to the cores of each task
+        - tasks: tasks to run
+        - prescreen: tolerance bands [min, max] of the pre-screened properties, by name
+        - cache: cache of the completed calculations, the tasks found in it are not run
+        - material: element and crystal structure to simulate
+        - cores: cores to run on, all the allocated ones if None
+    """
+    def __init__(self, lammps_cmd: str, lmp_inps_path: Path,
+                 launch: LaunchConfig | None = None, tasks: list[PropertyTask] | None = None,
+                 prescreen: dict[str, list[float]] | None = None,
+                 cache: PropertyCache | None = None,
+                 material: Material | None = None,
+                 cores: list[int] | None = None):
+        self._lammps_cmd = lammps_cmd
+        self._lmp_inps_path = lmp_inps_path
+        self._launch = launch
+        self._suffix = launch.suffix if launch is not None else 'none'
+        self._tasks = tasks if tasks is not None else PROPERTY_TASKS
+        self._prescreen = prescreen if prescreen is not None else {}
+        self._cache = cache
+        self._potential_hash: str = ''
+        unknown: set[str] = set(self._prescreen) - set(PROPERTY_FIELDS)
+        if unknown:
+            raise ValueError(f'Unknown pre-screened properties: {sorted(unknown)}')
+        self._material = material if material is not None else DEFAULT_MATERIAL
+        self._cores: list[int] = cores if cores is not None else sorted(os.sched_getaffinity(0))
+
+    def run(self, work_path: Path) -> dict[str, bool]:
+        """
+        Run all the tasks and gather their results, the plots are drawn by the collect job.
+
+        Args:
+            - work_path: directory of the potential
+
+        Returns:
+            dict: whether each task succeeded, by name.
+        """
+        self._prep(work_path)
+        if self._cache is not None:
+            self._potential_hash = get_potential_hash(work_path / POTENTIAL_NAME)
+        variables: dict[str, str] = self._material.get_lmp_vars()
+        status: dict[str, bool] = {}
+        tasks: list[PropertyTask] = [
+            task for task in self._tasks
+            if task.structures is None or self._material.structure in task.structures
+        ]
+
+        tiers: list[list[PropertyTask]] = [tasks]
+        if self._prescreen:
+            tiers = [[task for task in tasks if task.name in PRESCREEN_TASK_NAMES],
+                     [task for task in tasks if task.name not in PRESCREEN_TASK_NAMES]]
+
+        for i, tier in enumerate(tiers):
+            if i > 0 and not self._check_prescreen(work_path):
+                for task in tier:
+                    status[task.name] = False
+                break
+            for level in get_task_levels(tier, set(status)):
+                runnable = [task for task in level if all(status[dep] for dep in task.depends)]
+                for task in level:
+                    if task not in runnable:
+                        print(f'Skipping {task.name}, a dependency failed.')
+                        status[task.name] = False
+                status.update(self._run_level(runnable, work_path, variables))
+
+                if status.get('eos') and 'a0' not in variables:
+                    variables['a0'] = self._fit_eos(work_path)
+            self._merge_results(work_path, status, tier)
+
+        record = PropertyRecord.from_data(work_path / DATA_DIR_NAME)
+        record.save(work_path / DATA_DIR_NAME / PROPERTIES_RECORD_NAME)
+        self._write_curve_results(work_path, record)
+        return status
+
+    def _prep(self, work_path: Path):
+        """
+        Clear the previous results and write the header of the results.
+        """
+        for dir_name in [DATA_DIR_NAME, TASKS_DIR_NAME]:
+            shutil.rmtree(work_path / dir_name, ignore_errors=True)
+        (work_path / DATA_DIR_NAME).mkdir()
+        (work_path / TASKS_DIR_NAME).mkdir()
+        self._material.save(work_path / DATA_DIR_NAME / MATERIAL_NAME)
+
+        pair_lines: list[str] = [line.strip() for line in
+                                 (work_path / POTENTIAL_NAME).read_text(encoding='utf-8').splitlines()
+                                 if line.startswith(('pair_style', 'pair_coeff'))]
+        with (work_path / DATA_DIR_NAME / RESULTS_NAME).open('w', encoding='utf-8') as file:
+            file.write('#**********************************\n')
+            file.write(f'Potential basis set: {work_path.name}\n')
+            file.write('\n'.join(pair_lines) + '\n')
+            file.write('#**********************************\n')
+
+    def _run_level(self, level: list[PropertyTask], work_path: Path,
+                   variables: dict[str, str]) -> dict[str, bool]:
+        """
+        Run independent tasks concurrently on partitions of the cores.
+        """
+        if not level:
+            return {}
+        n_slots: int = min(len(level), len(self._cores))
+        partitions: list[list[int]] = [list(part) for part in np.array_split(self._cores, n_slots)]
+        queue: deque[PropertyTask] = deque(level)
+
+        def run_slot(cores: list[int]) -> dict[str, bool]:
+            slot_status: dict[str, bool] = {}
+            while True:
+                try:
+                    task: PropertyTask = queue.popleft()
+                except IndexError:
+                    return slot_status
+                slot_status[task.name] = self._run_task(task, cores, work_path, variables)
+
+        status: dict[str, bool] = {}
+        with ThreadPoolExecutor(max_workers=n_slots) as executor:
+            for slot_status in executor.map(run_slot, partitions):
+                status.update(slot_status)
+        return status
+
+    def _run_task(self, task: PropertyTask, cores: list[int], work_path: Path,
+                  variables: dict[str, str]) -> bool:
+        """
+        Run a task in its own directory, pinned to the given cores.
+        """
+        task_path: Path = work_path / TASKS_DIR_NAME / task.name
+        (task_path / DATA_DIR_NAME).mkdir(parents=True)
+
+        task_vars: dict[str, str] = {name: variables[value]
+                                     for name, value in {**MATERIAL_LMP_VARS, **task.lmp_vars}.items()}
+        key: str = ''
+        if self._cache is not None:
+            input_paths: list[Path] = [self._lmp_inps_path / name
+                                       for name in [task.input_name] + task.extra_inputs]
+            key = self._cache.get_key(self._potential_hash, input_paths, task_vars, self._suffix)
+            if self._cache.fetch(key, task_path):
+                print(f'{task.name} found in the cache')
+                for file_name in task.outputs:
+                    shutil.copy(task_path / file_name, work_path / DATA_DIR_NAME)
+                return True
+
+        # linked once the cache is missed, so that a fetched calculation does not write through the links
+        for file_name in [task.input_name] + task.extra_inputs:
+            link_input(self._lmp_inps_path / file_name, task_path / file_name)
+        link_input(work_path / POTENTIAL_NAME, task_path / POTENTIAL_NAME)
+
+        # the MPI ranks are bound within the cores given by taskset,
+        # without tuning the task runs on one rank with a thread per core
+        launch: LaunchConfig = self._launch.for_cores(len(cores)) if self._launch is not None \
+            else LaunchConfig(1, len(cores), 'none')
+        lmp_vars: str = ' '.join(f'-v {name} {value}' for name, value in task_vars.items())
+        cmd: str = ' '.join([
+            'taskset -c', ','.join(str(core) for core in cores),
+            launch.get_launcher() if launch.n_ranks > 1 else '',
+            self._lammps_cmd, launch.get_lammps_args(),
+            '-in', task.input_name, lmp_vars, '-screen none',
+        ])
+        print(f'Running {task.name} on cores {cores[0]}-{cores[-1]}, {launch}')
+        with (task_path / 'stdout.txt').open('w', encoding='utf-8') as out_file:
+            result = subprocess.run(cmd, shell=True, cwd=task_path, env={**os.environ, **launch.get_env()},
+                                    stdout=out_file, stderr=subprocess.STDOUT, check=False)
+        if result.returncode != 0:
+            print(f'{task.name} failed, see {task_path / "stdout.txt"}')
+            return False
+
+        for file_name in task.outputs:
+            shutil.copy(task_path / file_name, work_path / DATA_DIR_NAME)
+        if self._cache is not None:
+            self._cache.store(key, task_path)
+        return True
+
+    def _fit_eos(self, work_path: Path) -> str:
+        """
+        Fit the equation of state and get the lattice constant.
+        """
+        eos_data_path: Path = work_path / TASKS_DIR_NAME / 'eos' / EOS_DATA_NAME
+        shutil.copy(eos_data_path, work_path / DATA_DIR_NAME / 'eos_mlip.csv')
+        result = fit_eos(*read_eos_data([eos_data_path]), 'birch_murnaghan',
+                         atoms_per_cell=self._material.atoms_per_cell)
+        write_eos_results(result, work_path / DATA_DIR_NAME / RESULTS_NAME)
+        with (work_path / DATA_DIR_NAME / PROPERTIES_DATA_NAME).open('a', encoding='utf-8') as file:
+            file.write(f'a0 {result.a0[0]}\ne0 {result.e0[0]}\nb0 {result.b0_gpa[0]}\nbp {result.bp[0]}\n')
+        return f'{result.a0[0]:f}'
+
+    def _merge_results(self, work_path: Path, status: dict[str, bool], tasks: list[PropertyTask]):
+        """
+        Append the results and the properties of the tasks to the ones of the potential,
+        in the order of the tasks.
+        """
+        for file_name in [RESULTS_NAME, PROPERTIES_DATA_NAME]:
+            with (work_path / DATA_DIR_NAME / file_name).open('a', encoding='utf-8') as file:
+                for task in tasks:
+                    task_file: Path = work_path / TASKS_DIR_NAME / task.name / DATA_DIR_NAME / file_name
+                    if status.get(task.name) and task_file.exists():
+                        file.write(task_file.read_text(encoding='utf-8'))
+
+    def _check_prescreen(self, work_path: Path) -> bool:
+        """
+        Check the pre-screened properties against their tolerance bands, the outcome is
+        written in the data directory.
+        """
+        record = PropertyRecord.from_data(work_path / DATA_DIR_NAME)
+        violations: dict[str, float | None] = {
+            name: record[name] for name, (low, high) in self._prescreen.items()
+            if record[name] is None or not low <= record[name] <= high
+        }
+        with (work_path / DATA_DIR_NAME / PRESCREEN_NAME).open('w', encoding='utf-8') as file:
+            yaml.safe_dump({'passed': not violations, 'violations': violations}, file, sort_keys=False)
+        if violations:
+            print(f'Rejected by the pre-screen, out of the tolerance bands: {violations}')
+        return not violations
+
+    def _write_curve_results(self, work_path: Path, record: PropertyRecord):
+        """
+        Append the maxima of the stacking fault energy and of the traction to the results.
+        """
+        with (work_path / DATA_DIR_NAME / RESULTS_NAME).open('a', encoding='utf-8') as file:
+            for title, fields in [('Max (110) SF energy', 'sfe_110_max'),
+                                  ('Max (112) SF energy', 'sfe_112_max'),
+                                  ('Max traction along (100) (GPa)', 'ts_100_peak'),
+                                  ('Max traction along (110) (GPa)', 'ts_110_peak')]:
+                if record[fields] is not None:
+                    file.write('=========================================\n')
+                    file.write(f'{title}\n{record[fields]}\n')
+
+def run_materials(materials: list[Material], work_path: Path, **engine_args) -> dict[str, dict[str, bool]]:
+    """
+    Run the properties simulations of several materials concurrently, each one on its own
+    partition of the allocated cores. A single material is simulated in the directory of the
+    potential, several ones in a sub-directory each.
+
+    Args:
+        - materials: materials to simulate
+        - work_path: directory of the potential
+        - engine_args: other arguments of the PropertyEngine
+
+    Returns:
+        dict: whether each task succeeded, by material name and task name.
+    """
+    if len(materials) == 1:
+        write_material_potential(work_path / POTENTIAL_NAME, work_path / POTENTIAL_NAME, materials[0].element)
+        return {materials[0].name: PropertyEngine(material=materials[0], **engine_args).run(work_path)}
+
+    cores: list[int] = sorted(os.sched_getaffinity(0))
+    partitions: list[list[int]] = [list(part) for part in
+                                   np.array_split(cores, min(len(materials), len(cores)))]
+    engines: list[tuple[Material, PropertyEngine]] = []
+    for i, material in enumerate(materials):
+        material_path: Path = work_path / material.name
+        material_path.mkdir(exist_ok=True)
+        write_material_potential(work_path / POTENTIAL_NAME, material_path / POTENTIAL_NAME, material.element)
+        engines.append((material, PropertyEngine(material=material, cores=partitions[i % len(partitions)],
+                                                 **engine_args)))
+
+    with ThreadPoolExecutor(max_workers=len(engines)) as executor:
+        results = executor.map(lambda engine: engine[1].run(work_path / engine[0].name), engines)
+        return {material.name: status for (material, _), status in zip(engines, results)}
@@ -0,0 +1,244 @@
+"""
+Batched plotting of the properties of the potentials against the reference data.
+Adapted from eos_bain.py, sfe.py and ts.py of Potential_benchmark_iron.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Callable
+
+import yaml
+import numpy as np
+from matplotlib.figure import Figure
+
+from .property_engine import DATA_DIR_NAME
+from .property_record import read_sfe, read_ts
+from .property_score import (
+    REF_LATTICE,
+    read_eos,
+    read_bain_path_mev,
+    read_ref_eos,
+    read_ref_bain_path,
+    read_ref_sfe,
+    read_ref_ts,
+    )
+
+PLOTS_DIR_NAME: str = 'plots'
+PLOT_CACHE_NAME: str = 'plot_cache.yaml'
+PLOT_STYLE_VERSION: int = 1 # increase to redraw all the cached figures
+
+Curve = tuple[np.ndarray, np.ndarray]
+CurveReader = Callable[[Path], Curve]
+
+def read_ref_sfe_j(csv_path: Path) -> Curve:
+    """
+    Read a reference stacking fault energy curve given in J/m^2.
+    """
+    data = np.atleast_2d(np.loadtxt(csv_path, delimiter=','))
+    return data[:, 0] * REF_LATTICE * np.sqrt(3) / 2, data[:, 1]
+
+REF_READERS: dict[str, CurveReader] = {
+    'eos_dft.csv': read_ref_eos,
+    'BainPath_DFT.csv': read_ref_bain_path,
+    'sfe_110_dft.csv': read_ref_sfe,
+    '110_111.csv': read_ref_sfe_j,
+    'dft2_112_111.csv': read_ref_sfe,
+    '112_111.csv': read_ref_sfe_j,
+    'ts_100_dft.csv': read_ref_ts,
+    'ts_110_dft.csv': read_ref_ts,
+}
+
+DATA_READERS: dict[str, CurveReader] = {
+    'eos_mlip.csv': read_eos,
+    'bain_path.csv': read_bain_path_mev,
+    'sfe_110.csv': read_sfe,
+    'sfe_112.csv': read_sfe,
+    'ts_100.csv': read_ts,
+    'ts_110.csv': read_ts,
+}
+
+def relative(curve: Curve) -> Curve:
+    return curve[0], curve[1] - np.nanmin(curve[1])
+
+def draw_eos_bain(fig: Figure, data: dict[str, Curve | None], refs: dict[str, Curve]):
+    """
+    Energy-volume curve and Bain path, relative to their minimum.
+    """
+    ax, bx = fig.subplots(nrows=1, ncols=2)
+    for axis, title, ref_name, data_name in [(ax, 'Energy volume curve', 'eos_dft.csv', 'eos_mlip.csv'),
+                                             (bx, 'Bain path', 'BainPath_DFT.csv', 'bain_path.csv')]:
+        axis.grid(c='gainsboro', ls='--', lw=0.7)
+        axis.set_title(title)
+        ref = relative(refs[ref_name])
+        axis.scatter(*ref, s=30, marker='o', c='dodgerblue', label='DFT')
+        axis.plot(*ref, lw=1.5)
+        if data[data_name] is not None:
+            curve = relative(data[data_name])
+            axis.scatter(*curve, s=30, marker='s', c='red', label='New_IAP')
+            axis.plot(*curve, lw=1.5)
+        axis.legend(loc='upper center', markerscale=1.5)
+    ax.set_xlabel(r'Volume, [$\AA^3$]')
+    ax.set_ylabel('Energy, [meV]')
+    bx.set_xlabel('c/a ratio')
+    bx.set_ylim(0, 400)
+
+def draw_sfe(fig: Figure, data: dict[str, Curve | None], refs: dict[str, Curve]):
+    """
+    Stacking fault energy curves of the {110} and {112} planes.
+    """
+    ax, bx = fig.subplots(nrows=1, ncols=2)
+    for axis, title, ref_names, data_name in [
+            (ax, '<111>{110}', ['sfe_110_dft.csv', '110_111.csv'], 'sfe_110.csv'),
+            (bx, '<111>{112}', ['dft2_112_111.csv', '112_111.csv'], 'sfe_112.csv')]:
+        axis.grid(c='gainsboro', ls='--', lw=0.7)
+        axis.set_title(title)
+        axis.scatter(*refs[ref_names[0]], s=60, marker='s', c='red', label='DFT')
+        axis.scatter(*refs[ref_names[1]], s=60, marker='v', c='blue', label='DFT2')
+        curve = data[data_name]
+        if curve is not None:
+            axis.scatter(*curve, s=60, marker='o', c='orange', label='ML-IAP')
+            axis.plot(*curve, c='orange', lw=2, ls='--')
+            axis.text(0.6, 0.2, f'IAP={np.round(curve[1].max(), 4)}', transform=axis.transAxes,
+                      fontsize='large', horizontalalignment='right', verticalalignment='bottom')
+        axis.set_xlim([0, 2.45])
+        axis.set_xlabel(r'Displacements, [$\AA$]')
+        axis.set_ylabel('Stacking Fault Energy, [J/m$^2$]')
+        axis.legend(loc='upper right')
+
+def draw_ts(fig: Figure, data: dict[str, Curve | None], refs: dict[str, Curve]):
+    """
+    Traction-separation curves of the (100) and (110) planes.
+    """
+    ax, bx = fig.subplots(nrows=1, ncols=2)
+    for axis, label, ref_name, data_name in [(ax, '(a)', 'ts_100_dft.csv', 'ts_100.csv'),
+                                             (bx, '(b)', 'ts_110_dft.csv', 'ts_110.csv')]:
+        if data[data_name] is not None:
+            axis.plot(*data[data_name], label='ML-IAP', c='#c1272d', lw=3)
+        axis.scatter(*refs[ref_name], facecolors='none', edgecolors='#eecc16', s=80)
+        axis.plot(*refs[ref_name], c='#eecc16', ls='--', lw=2.5, label='DFT')
+        axis.hlines(0, 0, 5, ls=':', color='grey', lw=2)
+        axis.set_xlim(0, 5)
+        axis.set_ylim(-2.5, 37.5)
+        axis.set_xlabel('Separation distance, (Å)', weight='bold')
+        axis.set_ylabel('Normal stress, (GPa)', weight='bold')
+        axis.annotate(label, xy=(-0.17, 1), weight='bold', xycoords='axes fraction', fontsize=26)
+    ax.legend()
+
+class PlotSpec():
+    """
+    Figure of the properties of a potential.
+
+    Args:
+        - name: file name of the figure
+        - data_names: files of the potential, in its data directory
+        - ref_names: reference files, in the reference data directory
+        - draw: function drawing the curves on the figure
+        - size: size of the figure in inches
+    """
+    def __init__(self, name: str, data_names: list[str], ref_names: list[str],
+                 draw: Callable[[Figure, dict[str, Curve | None], dict[str, Curve]], None],
+                 size: tuple[float, float]):
+        self.name: str = name
+        self.data_names: list[str] = data_names
+        self.ref_names: list[str] = ref_names
+        self.draw: Callable[[Figure, dict[str, Curve | None], dict[str, Curve]], None] = draw
+        self.size: tuple[float, float] = size
+
+PLOT_SPECS: list[PlotSpec] = [
+    PlotSpec('eos_bp.png', ['eos_mlip.csv', 'bain_path.csv'], ['eos_dft.csv', 'BainPath_DFT.csv'],
+             draw_eos_bain, (15, 7)),
+    PlotSpec('sfe.png', ['sfe_110.csv', 'sfe_112.csv'],
+             ['sfe_110_dft.csv', '110_111.csv', 'dft2_112_111.csv', '112_111.csv'], draw_sfe, (15, 8)),
+    PlotSpec('ts.png', ['ts_100.csv', 'ts_110.csv'], ['ts_100_dft.csv', 'ts_110_dft.csv'], draw_ts, (16, 8)),
+]
+
+class PropertyPlotter():
+    """
+    Class plotting the properties of many potentials in one process, out of the simulation jobs.
+    The figures are drawn without pyplot on the non-interactive Agg canvas, the reference data
+    is read once and a figure is redrawn only if its inputs changed.
+
+    Args:
+        - ref_data_path: directory of the reference data
+        - dpi: resolution of the figures
+        - specs: figures to draw
+    """
+    def __init__(self, ref_data_path: Path, dpi: int = 150, specs: list[PlotSpec] | None = None):
+        self._dpi = dpi
+        self._specs = specs if specs is not None else PLOT_SPECS
+        self._ref_paths: dict[str, Path] = {ref_name: ref_data_path / ref_name
+                                            for spec in self._specs for ref_name in spec.ref_names}
+        self._refs: dict[str, Curve] = {ref_name: REF_READERS[ref_name](path)
+                                        for ref_name, path in self._ref_paths.items()}
+        self._fig = Figure()
+
+    def get_hash(self, spec: PlotSpec, data_path: Path) -> str:
+        """
+        Get the hash of the inputs of a figure.
+        """
+        sha = hashlib.sha256(f'{PLOT_STYLE_VERSION} {self._dpi} {spec.name}'.encode())
+        paths: list[Path] = [data_path / name for name in spec.data_names] \
+            + [self._ref_paths[name] for name in spec.ref_names]
+        for path in paths:
+            sha.update(path.name.encode())
+            sha.update(path.read_bytes() if path.exists() else b'missing')
+        return sha.hexdigest()
+
+    def plot(self, data_path: Path, plots_path: Path, force: bool = False) -> list[str]:
+        """
+        Draw the figures of a potential whose inputs changed since the last call.
+
+        Args:
+            - data_path: data directory of the potential
+            - plots_path: directory of the figures
+            - force: draw all the figures
+
+        Returns:
+            list: names of the drawn figures.
+        """
+        plots_path.mkdir(exist_ok=True)
+        cache_path: Path = plots_path / PLOT_CACHE_NAME
+        cache: dict[str, str] = {}
+        if cache_path.exists():
+            with cache_path.open('r', encoding='utf-8') as file:
+                cache = yaml.safe_load(file) or {}
+
+        drawn: list[str] = []
+        for spec in self._specs:
+            if not any((data_path / name).exists() for name in spec.data_names):
+                continue
+            input_hash: str = self.get_hash(spec, data_path)
+            if not force and cache.get(spec.name) == input_hash and (plots_path / spec.name).exists():
+                continue
+            data: dict[str, Curve | None] = {
+                name: DATA_READERS[name](data_path / name) if (data_path / name).exists() else None
+                for name in spec.data_names
+            }
+            self._fig.clear()
+            self._fig.set_size_inches(*spec.size)
+            spec.draw(self._fig, data, self._refs)
+            self._fig.savefig(plots_path / spec.name, dpi=self._dpi)
+            cache[spec.name] = input_hash
+            drawn.append(spec.name)
+
+        with cache_path.open('w', encoding='utf-8') as file:
+            yaml.safe_dump(cache, file)
+        return drawn
+
+    def plot_all(self, model_paths: list[Path], force: bool = False):
+        """
+        Draw the figures of many potentials.
+
+        Args:
+            - model_paths: directories of the potentials, with the data directory
+            - force: draw all the figures
+        """
+        for model_path in model_paths:
+            try:
+                drawn: list[str] = self.plot(model_path / DATA_DIR_NAME, model_path / PLOTS_DIR_NAME, force)
+            except (OSError, ValueError) as exc:
+                print(f'Plotting of {model_path} failed: {exc}')
+                continue
+            print(f'{model_path.name}: {", ".join(drawn) if drawn else "up to date"}')
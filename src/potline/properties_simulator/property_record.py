@@ -0,0 +1,178 @@
+"""
+Machine-readable record of the properties of a potential and summary of a sweep.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import yaml
+import numpy as np
+import pandas as pd
+
+from ..loss_logger import INFO_FILENAME
+from .eos_fit import ATOMS_PER_CELL, EV_A3_TO_GPA
+from .lammps_analysis import PROPERTIES_BENCH_DIR_NAME
+from .material import Material, DEFAULT_MATERIAL, MATERIAL_NAME
+
+PROPERTIES_DATA_NAME: str = 'properties.dat'
+PROPERTIES_RECORD_NAME: str = 'properties.yaml'
+PROPERTIES_SUMMARY_NAME: str = 'properties_summary.csv'
+PRESCREEN_NAME: str = 'prescreen.yaml'
+DATA_DIR_NAME: str = 'data'
+TS_STEP: float = 0.05 # separation step of in.ts_100 and in.ts_110
+
+# Units: eV, angstrom, GPa, J/m^2
+PROPERTY_FIELDS: list[str] = [
+    'a0', 'e0', 'b0', 'bp',
+    'vacancy_formation_energy',
+    'c11', 'c12', 'c44', 'bulk_modulus', 'shear_modulus_1', 'shear_modulus_2', 'poisson_ratio',
+    'surface_energy_100', 'surface_energy_110', 'surface_energy_111', 'surface_energy_112',
+    'bain_barrier',
+    'sfe_110_max', 'sfe_112_max',
+    'ts_100_peak', 'ts_110_peak',
+]
+
+def read_bain_path(csv_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Read the Bain path written by in.bain_path. As in eos_bain.py, the energies are the ones
+    at fixed volume (pe0, second column), not the ones after the box relaxation (pe1).
+
+    Returns:
+        tuple: c/a ratios and energies per atom, sorted by ratio.
+    """
+    data = np.atleast_2d(np.loadtxt(csv_path))
+    order = np.argsort(data[:, 0])
+    return data[order, 0], data[order, 1] / ATOMS_PER_CELL
+
+def read_sfe(csv_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Read a stacking fault energy curve written by in.sfe_110 or in.sfe_112.
+
+    Returns:
+        tuple: displacements and energies in J/m^2.
+    """
+    data = np.atleast_2d(np.loadtxt(csv_path, skiprows=1))
+    return data[:, 0], data[:, 2]
+
+def read_ts(csv_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Read a traction-separation curve written by in.ts_100 or in.ts_110.
+    The traction is the derivative of the energy over the area, as in ts.py.
+
+    Returns:
+        tuple: separations and tractions in GPa.
+    """
+    data = np.atleast_2d(np.loadtxt(csv_path))
+    traction = EV_A3_TO_GPA * (data[1:, 2] - data[:-1, 2]) / (TS_STEP * data[1:, 3])
+    return data[1:, 0] - TS_STEP / 2, traction
+
+def get_bain_barrier(ratio: np.ndarray, energy: np.ndarray) -> float:
+    """
+    Get the energy barrier per atom from bcc (c/a = 1) to fcc (c/a = sqrt(2)).
+    """
+    on_path = (ratio >= 1) & (ratio <= np.sqrt(2))
+    if not on_path.any():
+        return float('nan')
+    return float(energy[on_path].max() - np.interp(1.0, ratio, energy))
+
+class PropertyRecord():
+    """
+    Properties of a potential, missing properties are None.
+
+    Args:
+        - values: properties by name, see PROPERTY_FIELDS
+    """
+    def __init__(self, values: dict[str, float | None] | None = None):
+        values = values if values is not None else {}
+        unknown: set[str] = set(values) - set(PROPERTY_FIELDS)
+        if unknown:
+            raise ValueError(f'Unknown properties: {sorted(unknown)}')
+        self.values: dict[str, float | None] = {
+            field: float(values[field]) if values.get(field) is not None else None
+            for field in PROPERTY_FIELDS
+        }
+
+    def __getitem__(self, field: str) -> float | None:
+        return self.values[field]
+
+    def save(self, out_path: Path):
+        with out_path.open('w', encoding='utf-8') as file:
+            yaml.safe_dump(self.values, file, sort_keys=False)
+
+    @staticmethod
+    def load(in_path: Path) -> PropertyRecord:
+        with in_path.open('r', encoding='utf-8') as file:
+            return PropertyRecord(yaml.safe_load(file))
+
+    @staticmethod
+    def from_data(data_path: Path) -> PropertyRecord:
+        """
+        Build the record from the data directory of a properties simulation.
+
+        Args:
+            - data_path: directory with the properties printed by LAMMPS and the curves
+
+        Returns:
+            PropertyRecord: the properties of the potential.
+        """
+        values: dict[str, float | None] = {}
+        if (data_path / PROPERTIES_DATA_NAME).exists():
+            with (data_path / PROPERTIES_DATA_NAME).open('r', encoding='utf-8') as file:
+                for line in file:
+                    if line.strip():
+                        name, value = line.split()[:2]
+                        values[name] = float(value)
+
+        if (data_path / 'bain_path.csv').exists():
+            values['bain_barrier'] = get_bain_barrier(*read_bain_path(data_path / 'bain_path.csv'))
+        for plane in ['110', '112']:
+            if (data_path / f'sfe_{plane}.csv').exists():
+                values[f'sfe_{plane}_max'] = float(read_sfe(data_path / f'sfe_{plane}.csv')[1].max())
+        for plane in ['100', '110']:
+            if (data_path / f'ts_{plane}.csv').exists():
+                values[f'ts_{plane}_peak'] = float(read_ts(data_path / f'ts_{plane}.csv')[1].max())
+        return PropertyRecord(values)
+
+def collect_properties(sweep_path: Path) -> pd.DataFrame:
+    """
+    Gather the property records of the models of a sweep in one table, with their losses.
+
+    Args:
+        - sweep_path: path to the sweep
+
+    Returns:
+        pd.DataFrame: one row per model and material.
+    """
+    rows: list[dict] = []
+    for info_path in sorted((sweep_path / PROPERTIES_BENCH_DIR_NAME).glob(f'*/{INFO_FILENAME}')):
+        model_path: Path = info_path.parent
+        with info_path.open('r', encoding='utf-8') as file:
+            model_info: dict = yaml.safe_load(file)
+        record_paths: list[Path] = sorted(model_path.glob(f'{DATA_DIR_NAME}/{PROPERTIES_RECORD_NAME}')) \
+            + sorted(model_path.glob(f'*/{DATA_DIR_NAME}/{PROPERTIES_RECORD_NAME}'))
+        for record_path in record_paths:
+            data_path: Path = record_path.parent
+            material: Material = Material.load(data_path / MATERIAL_NAME) \
+                if (data_path / MATERIAL_NAME).exists() else DEFAULT_MATERIAL
+            prescreen_passed: bool | None = None
+            if (data_path / PRESCREEN_NAME).exists():
+                with (data_path / PRESCREEN_NAME).open('r', encoding='utf-8') as file:
+                    prescreen_passed = bool(yaml.safe_load(file)['passed'])
+            rows.append({
+                'sweep_path': str(sweep_path),
+                'model_index': model_path.name,
+                'material': material.name,
+                'element': material.element,
+                'structure': material.structure,
+                'data_path': str(data_path),
+                'iteration': model_info.get('iteration'),
+                'subiteration': model_info.get('subiteration'),
+                'valid_energy_loss': model_info.get('valid_energy_loss'),
+                'valid_force_loss': model_info.get('valid_force_loss'),
+                'prescreen_passed': prescreen_passed,
+                **PropertyRecord.load(record_path).values,
+            })
+    return pd.DataFrame(rows, columns=['sweep_path', 'model_index', 'material', 'element', 'structure',
+                                       'data_path', 'iteration', 'subiteration', 'valid_energy_loss',
+                                       'valid_force_loss', 'prescreen_passed'] + PROPERTY_FIELDS)
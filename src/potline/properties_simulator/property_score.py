@@ -0,0 +1,175 @@
+"""
+Scoring of the properties of the potentials against the reference data.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from .eos_fit import read_eos_data
+from .material import Material, MATERIALS
+from .property_record import read_bain_path, read_sfe, read_ts
+
+MEV_A2_TO_J_M2: float = 0.0160217733
+REF_LATTICE: float = 2.834 # lattice constant of the DFT stacking fault displacements
+REF_MATERIAL: Material = MATERIALS['Fe'] # material of the reference data
+
+CurveReader = Callable[[Path], tuple[np.ndarray, np.ndarray]]
+
+# In the reference files, the displacements of the stacking faults are in units of the Burgers vector
+# with energies in meV/A^2, the energies of the EOS and of the Bain path are in meV with an offset.
+
+def read_ref_eos(csv_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    data = pd.read_csv(csv_path, delimiter=';', decimal=',', header=None).to_numpy(dtype=float)
+    return data[:, 0], data[:, 1]
+
+def read_ref_bain_path(csv_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    data = pd.read_csv(csv_path, delimiter=',', header=None).to_numpy(dtype=float)
+    return data[:, 0], data[:, 1]
+
+def read_ref_sfe(csv_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    data = pd.read_csv(csv_path, delimiter=',', header=None).to_numpy(dtype=float)
+    return data[:, 0] * REF_LATTICE * np.sqrt(3) / 2, data[:, 1] * MEV_A2_TO_J_M2
+
+def read_ref_ts(csv_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    data = np.atleast_2d(np.loadtxt(csv_path))
+    return data[:, 0], data[:, 1]
+
+def read_eos(csv_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    volumes, energies = read_eos_data([csv_path])
+    return volumes[0], energies[0] * 1000
+
+def read_bain_path_mev(csv_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    ratio, energy = read_bain_path(csv_path)
+    return ratio, energy * 1000
+
+class ScoredCurve():
+    """
+    Curve of a property compared with the reference data.
+
+    Args:
+        - name: name of the property
+        - ref_name: reference file, in the reference data directory
+        - data_name: file of the potential, in its data directory
+        - read_ref: reader of the reference file, in the units of read_data
+        - read_data: reader of the file of the potential
+        - relative: whether the curves are compared relative to their minimum
+    """
+    def __init__(self, name: str, ref_name: str, data_name: str, read_ref: CurveReader,
+                 read_data: CurveReader, relative: bool):
+        self.name: str = name
+        self.ref_name: str = ref_name
+        self.data_name: str = data_name
+        self.read_ref: CurveReader = read_ref
+        self.read_data: CurveReader = read_data
+        self.relative: bool = relative
+
+SCORED_CURVES: list[ScoredCurve] = [
+    ScoredCurve('eos', 'eos_dft.csv', 'eos_mlip.csv', read_ref_eos, read_eos, True),
+    ScoredCurve('bain_path', 'BainPath_DFT.csv', 'bain_path.csv',
+                read_ref_bain_path, read_bain_path_mev, True),
+    ScoredCurve('sfe_110', 'sfe_110_dft.csv', 'sfe_110.csv', read_ref_sfe, read_sfe, False),
+    ScoredCurve('sfe_112', 'dft2_112_111.csv', 'sfe_112.csv', read_ref_sfe, read_sfe, False),
+    ScoredCurve('ts_100', 'ts_100_dft.csv', 'ts_100.csv', read_ref_ts, read_ts, False),
+    ScoredCurve('ts_110', 'ts_110_dft.csv', 'ts_110.csv', read_ref_ts, read_ts, False),
+]
+
+def interp_curves(x_ref: np.ndarray, curves: list[tuple[np.ndarray, np.ndarray] | None]) -> np.ndarray:
+    """
+    Interpolate curves on the reference grid, points out of the range of a curve are NaN.
+
+    Args:
+        - x_ref: reference grid, shape (n_points,)
+        - curves: (x, y) of each curve, None if missing
+
+    Returns:
+        np.ndarray: interpolated values, shape (n_curves, n_points).
+    """
+    values = np.full((len(curves), len(x_ref)), np.nan)
+    for i, curve in enumerate(curves):
+        if curve is None:
+            continue
+        order = np.argsort(curve[0])
+        x, y = curve[0][order], curve[1][order]
+        inside = (x_ref >= x[0]) & (x_ref <= x[-1])
+        values[i, inside] = np.interp(x_ref[inside], x, y)
+    return values
+
+class PropertyScorer():
+    """
+    Class computing the errors of the property curves of the potentials against the reference data,
+    and a weighted score. The reference files are read once, the errors of all the potentials
+    are computed at once on the reference grids.
+
+    Args:
+        - ref_data_path: directory of the reference data
+        - weights: weight of each curve in the score, by name, 1 by default
+        - curves: curves to score
+    """
+    def __init__(self, ref_data_path: Path, weights: dict[str, float] | None = None,
+                 curves: list[ScoredCurve] | None = None):
+        self._curves = curves if curves is not None else SCORED_CURVES
+        weights = weights if weights is not None else {}
+        unknown: set[str] = set(weights) - {curve.name for curve in self._curves}
+        if unknown:
+            raise ValueError(f'Unknown scored properties: {sorted(unknown)}')
+        self._weights: dict[str, float] = {curve.name: float(weights.get(curve.name, 1.0))
+                                           for curve in self._curves}
+        self._references: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for curve in self._curves:
+            x_ref, y_ref = curve.read_ref(ref_data_path / curve.ref_name)
+            order = np.argsort(x_ref)
+            self._references[curve.name] = (x_ref[order], y_ref[order])
+
+    def get_errors(self, data_paths: list[Path]) -> pd.DataFrame:
+        """
+        Get the root mean square error of each curve on the reference grid.
+
+        Args:
+            - data_paths: data directories of the potentials
+
+        Returns:
+            pd.DataFrame: one row per potential, one <name>_rmse column per curve,
+                NaN if the curve is missing or does not overlap the reference.
+        """
+        errors: dict[str, np.ndarray] = {}
+        for curve in self._curves:
+            x_ref, y_ref = self._references[curve.name]
+            values = interp_curves(x_ref, [curve.read_data(path / curve.data_name)
+                                           if (path / curve.data_name).exists() else None
+                                           for path in data_paths])
+            ref_values = np.where(np.isfinite(values), y_ref, np.nan)
+            if curve.relative:
+                values = values - np.fmin.reduce(values, axis=1)[:, None]
+                ref_values = ref_values - np.fmin.reduce(ref_values, axis=1)[:, None]
+            with np.errstate(all='ignore'):
+                errors[f'{curve.name}_rmse'] = np.sqrt(np.nansum((values - ref_values)**2, axis=1)
+                                                       / np.isfinite(values).sum(axis=1))
+        return pd.DataFrame(errors)
+
+    def score(self, data_paths: list[Path]) -> pd.DataFrame:
+        """
+        Get the errors and the score of the potentials, the score is the weighted mean
+        of the errors normalised by the range of the reference, over the available curves.
+        Lower is better.
+
+        Args:
+            - data_paths: data directories of the potentials
+
+        Returns:
+            pd.DataFrame: errors and score column, one row per potential.
+        """
+        errors: pd.DataFrame = self.get_errors(data_paths)
+        scales = np.array([np.ptp(self._references[curve.name][1]) for curve in self._curves])
+        weights = np.array([self._weights[curve.name] for curve in self._curves])
+        normalised = errors.to_numpy() / scales
+        available = np.isfinite(normalised)
+        total_weight = (weights * available).sum(axis=1)
+        with np.errstate(all='ignore'):
+            errors['score'] = np.where(total_weight > 0,
+                                       np.nansum(normalised * weights, axis=1) / total_weight, np.nan)
+        return errors
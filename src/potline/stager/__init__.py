@@ -0,0 +1,13 @@
+"""
+Staging of the run directories of the pipeline phases.
+"""
+
+from .stager import (
+    Stager,
+    RunDir,
+    load_template,
+    render_template,
+    write_atomic,
+    copy_atomic,
+    link_input,
+    )
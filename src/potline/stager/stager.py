@@ -0,0 +1,111 @@
+"""
+Staging of the run directories of a phase in one pass: the files are rendered from precompiled templates
+and written atomically, the immutable inputs are linked instead of copied.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+from string import Template
+from functools import lru_cache
+from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+@lru_cache(maxsize=None)
+def load_template(template_path: Path) -> Template:
+    """
+    Read and compile a template once per process, the templates are immutable inputs of the package.
+    """
+    with template_path.open('r', encoding='utf-8') as file:
+        return Template(file.read())
+
+def render_template(template_path: Path, values: dict) -> str:
+    return load_template(template_path).safe_substitute(values)
+
+def write_atomic(out_path: Path, content: str):
+    """
+    Write a file through a temporary file in the same directory,
+    so that readers never see it partially written.
+    """
+    tmp_path: Path = out_path.with_name(f'.{out_path.name}.{os.getpid()}')
+    with tmp_path.open('w', encoding='utf-8') as file:
+        file.write(content)
+    os.replace(tmp_path, out_path)
+
+def copy_atomic(src_path: Path, dst_path: Path):
+    """
+    Copy a file through a temporary file in the same directory, a link at the destination is replaced.
+    """
+    tmp_path: Path = dst_path.with_name(f'.{dst_path.name}.{os.getpid()}')
+    shutil.copy2(src_path, tmp_path)
+    os.replace(tmp_path, dst_path)
+
+def link_input(src_path: Path, dst_path: Path):
+    """
+    Link an immutable input, an existing file or link at the destination is replaced atomically.
+    """
+    src_path = src_path.resolve()
+    if dst_path.is_symlink() and Path(os.readlink(dst_path)) == src_path:
+        return
+    tmp_path: Path = dst_path.with_name(f'.{dst_path.name}.{os.getpid()}')
+    tmp_path.unlink(missing_ok=True)
+    tmp_path.symlink_to(src_path)
+    os.replace(tmp_path, dst_path)
+
+class RunDir():
+    """
+    Content of a run directory.
+
+    Args:
+        - path: path of the directory
+        - links: immutable inputs linked in the directory, by file name
+        - copies: inputs copied in the directory (e.g. potentials rewritten later), by file name
+        - renders: files rendered from a template, by file name: template path and values
+        - writers: functions writing the other files, called with the path of the directory
+    """
+    def __init__(self, path: Path, links: dict[str, Path] | None = None,
+                 copies: dict[str, Path] | None = None,
+                 renders: dict[str, tuple[Path, dict]] | None = None,
+                 writers: list[Callable[[Path], None]] | None = None):
+        self.path: Path = path
+        self.links: dict[str, Path] = links if links is not None else {}
+        self.copies: dict[str, Path] = copies if copies is not None else {}
+        self.renders: dict[str, tuple[Path, dict]] = renders if renders is not None else {}
+        self.writers: list[Callable[[Path], None]] = writers if writers is not None else []
+
+    def stage(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        for name, src_path in self.links.items():
+            link_input(src_path, self.path / name)
+        for name, src_path in self.copies.items():
+            copy_atomic(src_path, self.path / name)
+        for name, (template_path, values) in self.renders.items():
+            write_atomic(self.path / name, render_template(template_path, values))
+        for writer in self.writers:
+            writer(self.path)
+
+class Stager():
+    """
+    Class staging the run directories of a phase concurrently, the operations on the shared storage
+    are dominated by their latency rather than by the bandwidth.
+
+    Args:
+        - n_workers: number of concurrent directories
+    """
+    def __init__(self, n_workers: int = 16):
+        self._n_workers = n_workers
+
+    def stage(self, run_dirs: list[RunDir]) -> list[Path]:
+        """
+        Stage the run directories.
+
+        Returns:
+            list: paths of the staged directories.
+        """
+        if not run_dirs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self._n_workers, len(run_dirs))) as executor:
+            list(executor.map(RunDir.stage, run_dirs))
+        return [run_dir.path for run_dir in run_dirs]
@@ -7,12 +7,50 @@ from pathlib import Path
 from .loss_logger import ModelTracker
 from .hyper_searcher import PotOptimizer
 from .deep_trainer import DeepTrainer
+from .model_selector import SelectionStrategy, filter_best_pareto
+from .cost_model import get_measured_costs
+from .config_reader import ConfigReader, MainSectionKW
+from .properties_simulator import Material, get_materials
 
 def filter_best_loss(model_list: list[ModelTracker], energy_weight: float, n: int) -> list[ModelTracker]:
     sorted_models = sorted(model_list,
                         key=lambda model: model.get_total_valid_loss(energy_weight))
     return sorted_models[:n]
 
+def filter_best(model_list: list[ModelTracker], energy_weight: float, n: int,
+                selection: str, sweep_path: Path) -> list[ModelTracker]:
+    """
+    Select the best models with the configured strategy.
+
+    Args:
+        - model_list: models to select from
+        - energy_weight: weight of the energy loss
+        - n: number of models to select
+        - selection: selection strategy, one of SelectionStrategy
+        - sweep_path: path to the sweep, used to recover the measured inference costs
+
+    Returns:
+        - list of the selected model trackers
+    """
+    if selection == SelectionStrategy.LOSS.value:
+        return filter_best_loss(model_list, energy_weight, n)
+    return filter_best_pareto(model_list, energy_weight, n, selection, get_measured_costs(sweep_path))
+
+def get_bench_material(config_path: Path) -> Material:
+    """
+    Get the material of the benchmark structures (micro-benchmark, variants and committee):
+    the first material of the properties simulation, the default material without one.
+
+    Args:
+        - config_path: path to the configuration file
+
+    Returns:
+        - the material of the benchmark structures
+    """
+    config_reader = ConfigReader(config_path)
+    materials: list | None = config_reader.get_prop_config().materials \
+        if MainSectionKW.PROP_SIM.value in config_reader.config_data else None
+    return get_materials(materials)[0]
 
 def get_model_trackers(sweep_path: Path, model_name: str,
                        force_from_hyp: bool = False) -> list[ModelTracker]:
@@ -0,0 +1,12 @@
+"""
+Evaluation of the converted potentials on a common test set.
+"""
+
+from .validator import (
+    BatchEvaluator,
+    TestBatch,
+    VALIDATION_NAME,
+    VALIDATION_SUMMARY_NAME,
+    read_test_set,
+    save_validation,
+    )
@@ -0,0 +1,205 @@
+"""
+Evaluation of the converted potentials on a common test set through the LAMMPS Python module,
+so that the models of all the frameworks are ranked on the same errors.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from pathlib import Path
+from typing import Any, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import yaml
+import numpy as np
+import pandas as pd
+from xpot import maths # type: ignore
+
+from ..model import RawLosses, Losses, read_pair_cmds
+
+VALIDATION_NAME: str = 'validation.yaml'
+VALIDATION_SUMMARY_NAME: str = 'validation_summary.csv'
+PICKLE_SUFFIXES: list[str] = ['.pckl', '.pkl']
+COMPRESSED_SUFFIXES: list[str] = ['.gzip', '.gz']
+
+class TestBatch():
+    """
+    Batch of structures of the test set with their reference energies and forces.
+
+    Args:
+        - structures: ase.Atoms of the batch, without calculator
+        - energies: reference energies, shape (n_structures,)
+        - forces: reference forces of all the atoms, shape (n_atoms, 3)
+    """
+    def __init__(self, structures: list, energies: np.ndarray, forces: np.ndarray):
+        self.structures: list = structures
+        self.energies: np.ndarray = energies
+        self.forces: np.ndarray = forces
+        self.atom_counts: np.ndarray = np.array([len(atoms) for atoms in structures])
+
+def batch_frame(test_set: pd.DataFrame, batch_size: int) -> Iterator[TestBatch]:
+    """
+    Split a test set in the pacemaker format (ase_atoms, energy_corrected or energy, forces) in batches.
+    """
+    energy_column: str = 'energy_corrected' if 'energy_corrected' in test_set else 'energy'
+    for start in range(0, len(test_set), batch_size):
+        rows: pd.DataFrame = test_set.iloc[start:start + batch_size]
+        yield TestBatch([atoms.copy() for atoms in rows['ase_atoms']],
+                        rows[energy_column].to_numpy(dtype=float),
+                        np.concatenate([np.asarray(forces, dtype=float).reshape(-1, 3)
+                                        for forces in rows['forces']]))
+
+def read_test_set(dataset_path: Path, batch_size: int, energy_key: str | None = None,
+                  forces_key: str | None = None) -> Iterator[TestBatch]:
+    """
+    Stream the test set in batches. The pandas pickles of pacemaker and gracemaker are read at once,
+    the other formats (e.g. the extxyz of MACE) are read lazily by ASE.
+
+    Args:
+        - dataset_path: path to the test set
+        - batch_size: number of structures per batch
+        - energy_key: key of the reference energy in the info of the structures, the calculator by default
+        - forces_key: key of the reference forces in the arrays of the structures, the calculator by default
+
+    Returns:
+        Iterator: the batches of the test set.
+    """
+    if any(suffix in PICKLE_SUFFIXES for suffix in dataset_path.suffixes):
+        compression: str | None = 'gzip' if dataset_path.suffix in COMPRESSED_SUFFIXES else None
+        yield from batch_frame(pd.read_pickle(dataset_path, compression=compression), batch_size)
+        return
+
+    from ase.io import iread # type: ignore # pylint: disable=import-outside-toplevel
+
+    structures: list = []
+    energies: list[float] = []
+    forces: list[np.ndarray] = []
+    for atoms in iread(str(dataset_path), index=':'):
+        energies.append(float(atoms.info[energy_key]) if energy_key is not None
+                        else atoms.get_potential_energy())
+        forces.append(np.asarray(atoms.arrays[forces_key] if forces_key is not None else atoms.get_forces(),
+                                 dtype=float))
+        atoms.calc = None
+        structures.append(atoms)
+        if len(structures) == batch_size:
+            yield TestBatch(structures, np.array(energies), np.concatenate(forces))
+            structures, energies, forces = [], [], []
+    if structures:
+        yield TestBatch(structures, np.array(energies), np.concatenate(forces))
+
+_CALCULATORS: dict[str, Any] = {}
+
+def evaluate_batch(pot_path: Path, structures: list) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluate a batch with a potential, the LAMMPS instance is kept by the worker for the next batches.
+
+    Returns:
+        tuple: energies, shape (n_structures,), and forces of all the atoms, shape (n_atoms, 3).
+    """
+    if str(pot_path) not in _CALCULATORS:
+        from ase.calculators.lammpslib import LAMMPSlib # type: ignore # pylint: disable=import-outside-toplevel
+        elements: list[str] = read_pair_cmds(pot_path)[1].split()[1:]
+        _CALCULATORS[str(pot_path)] = LAMMPSlib(
+            lmpcmds=[f'include {pot_path}'],
+            atom_types={element: i + 1 for i, element in enumerate(elements)},
+            keep_alive=True,
+        )
+    calculator = _CALCULATORS[str(pot_path)]
+
+    energies = np.empty(len(structures))
+    forces: list[np.ndarray] = []
+    for i, atoms in enumerate(structures):
+        atoms.calc = calculator
+        energies[i] = atoms.get_potential_energy()
+        forces.append(atoms.get_forces())
+    return energies, np.concatenate(forces)
+
+def get_raw_losses(batch: TestBatch, energies: np.ndarray, forces: np.ndarray) -> RawLosses:
+    """
+    Get the errors of each structure of a batch: the energy error per atom,
+    and the RMSE of the force components.
+    """
+    offsets: np.ndarray = np.concatenate([[0], np.cumsum(batch.atom_counts)[:-1]])
+    force_sq: np.ndarray = np.add.reduceat(((forces - batch.forces)**2).sum(axis=1), offsets)
+    return RawLosses(((energies - batch.energies) / batch.atom_counts).tolist(),
+                     np.sqrt(force_sq / (3 * batch.atom_counts)).tolist(),
+                     batch.atom_counts.astype(float).tolist())
+
+class BatchEvaluator():
+    """
+    Class evaluating the converted potentials on the same test set. The test set is read once in batches,
+    each batch is evaluated by all the potentials in parallel, one spawned process per potential with
+    its own LAMMPS instance, and the errors of the structures are computed as arrays.
+
+    Args:
+        - batch_size: number of structures per batch
+        - energy_key: key of the reference energy in the info of the structures, for the ASE formats
+        - forces_key: key of the reference forces in the arrays of the structures, for the ASE formats
+    """
+    def __init__(self, batch_size: int = 64, energy_key: str | None = None, forces_key: str | None = None):
+        self._batch_size = batch_size
+        self._energy_key = energy_key
+        self._forces_key = forces_key
+
+    def evaluate(self, pot_paths: list[Path], test_set: Path | pd.DataFrame) -> dict[Path, RawLosses]:
+        """
+        Evaluate the potentials on the test set.
+
+        Args:
+            - pot_paths: potential files
+            - test_set: path to the test set, or test split in the pacemaker format
+
+        Returns:
+            dict: errors of each structure by potential file.
+        """
+        batches: Iterator[TestBatch] = batch_frame(test_set, self._batch_size) \
+            if isinstance(test_set, pd.DataFrame) \
+            else read_test_set(test_set, self._batch_size, self._energy_key, self._forces_key)
+        executors: list[ProcessPoolExecutor] = [
+            ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+            for _ in pot_paths
+        ]
+        raw_losses: dict[Path, RawLosses] = {path: RawLosses([], [], []) for path in pot_paths}
+        try:
+            for batch in batches:
+                futures: list[Future] = [executor.submit(evaluate_batch, path, batch.structures)
+                                         for path, executor in zip(pot_paths, executors)]
+                for path, future in zip(pot_paths, futures):
+                    losses: RawLosses = get_raw_losses(batch, *future.result())
+                    raw_losses[path].energies.extend(losses.energies)
+                    raw_losses[path].forces.extend(losses.forces)
+                    raw_losses[path].atom_counts.extend(losses.atom_counts)
+        finally:
+            for executor in executors:
+                executor.shutdown()
+        return raw_losses
+
+def save_validation(raw_losses: dict[Path, RawLosses], energy_weight: float, out_path: Path) -> pd.DataFrame:
+    """
+    Write the losses of each potential in validation.yaml next to it, and the ranking of the potentials.
+
+    Args:
+        - raw_losses: errors of each structure by potential file
+        - energy_weight: weight of the energy loss
+        - out_path: path of the ranking (csv)
+
+    Returns:
+        pd.DataFrame: one row per potential, by increasing total loss.
+    """
+    rows: list[dict] = []
+    for pot_path, model_losses in raw_losses.items():
+        losses: Losses = model_losses.get_losses()
+        row: dict = {
+            'pot_path': str(pot_path),
+            'n_structures': len(model_losses.energies),
+            'energy_rmse': losses.energy,
+            'force_rmse': losses.force,
+            'loss': float(maths.calculate_loss(losses.energy, losses.force, energy_weight)),
+        }
+        with (pot_path.parent / VALIDATION_NAME).open('w', encoding='utf-8') as file:
+            yaml.safe_dump(row, file, sort_keys=False)
+        rows.append(row)
+    ranking = pd.DataFrame(rows, columns=['pot_path', 'n_structures', 'energy_rmse', 'force_rmse', 'loss'])
+    ranking = ranking.sort_values('loss', ignore_index=True)
+    ranking.to_csv(out_path, index=False)
+    return ranking
@@ -6,12 +6,13 @@ from argparse import Namespace, ArgumentParser
 from pathlib import Path
 
 from potline.dispatcher import DispatcherManager, JobType
-from potline.config_reader import ConfigReader
+from potline.config_reader import ConfigReader, MainSectionKW
 from potline.model import get_fit_cmd, get_lammps_params
 from potline.hyper_searcher import OPTIM_DIR_NAME
 from potline.deep_trainer import DEEP_TRAIN_DIR_NAME
 from potline.inference_bencher import BENCH_SCRIPT_NAME, INFERENCE_BENCH_DIR_NAME
-from potline.properties_simulator import PROPERTIES_BENCH_DIR_NAME, SUBMIT_SCRIPT_NAME, PropertiesSimulator
+from potline.launch_tuner import LAUNCH_SCRIPT_NAME
+from potline.properties_simulator import PROPERTIES_BENCH_DIR_NAME
 
 def parse_args() -> Namespace:
     """
@@ -23,6 +24,7 @@ def parse_args() -> Namespace:
     parser.add_argument('--hypiter', type=int, default=1, help='Hyperparameter search startibg iteration')
     parser.add_argument('--nodeep', action='store_false', help='Disable deep training')
     parser.add_argument('--noconversion', action='store_false', help='Disable yace conversion')
+    parser.add_argument('--nocommittee', action='store_false', help='Disable committee of the best models')
     parser.add_argument('--noinference', action='store_false', help='Disable inference benchmark')
     parser.add_argument('--noproperties', action='store_false', help='Disable properties simulation')
     return parser.parse_args()
@@ -90,7 +92,8 @@ def run_deep(config_path: Path, dependency: int | None = None) -> int:
     init_id = watch_manager.dispatch_job()
 
     # fit jobs
-    deep_cmd: str = get_fit_cmd(deep_config.model_name, deep=True)
+    deep_cmd: str = get_fit_cmd(deep_config.model_name, deep=True) if deep_config.early_stopping is None \
+        else f'python {cli_path} --config {config_path} --monitor'
     deep_manager.set_job([deep_cmd], out_path, deep_config.job_config, dependency=init_id,
                          array_ids=list(range(1, deep_config.best_n_models+1)))
     fit_id = deep_manager.dispatch_job()
@@ -118,7 +121,26 @@ def run_conv(config_path: Path, dependency: int | None = None) -> int:
     conv_manager.set_job([conv_cmd], gen_config.sweep_path, gen_config.job_config, dependency=dependency)
     return conv_manager.dispatch_job()
 
-def run_inf(config_path: Path, dependency: int | None = None) -> int:
+def run_comm(config_path: Path, dependency: int | None = None) -> int:
+    """
+    Run the committee of the best models.
+
+    Args:
+        - config_path: the path to the configuration file.
+        - dependency: the job dependency.
+
+    Returns:
+        int: The id of the committee job.
+    """
+    comm_config = ConfigReader(config_path).get_committee_config()
+    cli_path: Path = Path(__file__).resolve().parent / 'run_comm.py'
+    comm_cmd: str = f'python {cli_path} --config {config_path}'
+    comm_manager = DispatcherManager(
+        JobType.COMM.value, comm_config.model_name, comm_config.job_config.cluster)
+    comm_manager.set_job([comm_cmd], comm_config.sweep_path, comm_config.job_config, dependency=dependency)
+    return comm_manager.dispatch_job()
+
+def run_inf(config_path: Path, dependency: int | None = None) -> tuple[int, int | None]:
     """
     Run inference benchmark.
 
@@ -127,7 +149,7 @@ def run_inf(config_path: Path, dependency: int | None = None) -> int:
         - dependency: the job dependency.
 
     Returns:
-        int: The id of the last watcher job.
+        tuple: The id of the last watcher job and the id of the launch tuning job, None if not tuned.
     """
     inf_config = ConfigReader(config_path).get_bench_config()
     cli_path: Path = Path(__file__).resolve().parent / 'run_inf.py'
@@ -142,16 +164,34 @@ def run_inf(config_path: Path, dependency: int | None = None) -> int:
     watch_manager.set_job([init_cmd], out_path, inf_config.job_config, dependency=dependency)
     init_id = watch_manager.dispatch_job()
 
+    # launch tuning job, on the node of the first model
+    tune_id: int | None = None
+    if inf_config.launch_tuning is not None:
+        tune_cmd: str = f'python {cli_path} --config {config_path} --tune'
+        inf_manager.set_job([tune_cmd], out_path, inf_config.job_config, dependency=init_id, array_ids=[1])
+        init_id = tune_id = inf_manager.dispatch_job()
+
     # run jobs
     n_cpu = int(inf_config.job_config.slurm_opts['cpus_per_task'])
     bench_cmd: str = ' '.join([str(cmd) for cmd in [
         'srun', BENCH_SCRIPT_NAME, n_cpu,
         f'"{inf_config.lammps_bin_path} {get_lammps_params(inf_config.model_name)}"',
-        inf_config.prerun_steps, inf_config.max_steps
+        inf_config.prerun_steps, inf_config.max_steps, inf_config.sweep_path / LAUNCH_SCRIPT_NAME
     ]])
-    inf_manager.set_job([bench_cmd], out_path, inf_config.job_config, dependency=init_id,
-                        array_ids=list(range(1,inf_config.best_n_models+1)))
-    return inf_manager.dispatch_job()
+    micro_cmds: list[str] = [f'python {cli_path} --config {config_path} --micro'] \
+        if inf_config.micro_bench is not None else []
+    history_cmds: list[str] = [f'python {cli_path} --config {config_path} --fingerprint'] \
+        if inf_config.perf_history_path is not None else []
+    inf_manager.set_job([bench_cmd] + micro_cmds + history_cmds, out_path, inf_config.job_config,
+                        dependency=init_id, array_ids=list(range(1,inf_config.best_n_models+1)))
+    inf_id = inf_manager.dispatch_job()
+    if inf_config.perf_history_path is None:
+        return inf_id, tune_id
+
+    # performance history job
+    collect_cmd: str = f'python {cli_path} --config {config_path} --collect'
+    watch_manager.set_job([collect_cmd], out_path, inf_config.job_config, dependency=inf_id)
+    return watch_manager.dispatch_job(), tune_id
 
 def run_sim(config_path: Path, dependency: int | None = None) -> int:
     """
@@ -178,17 +218,15 @@ def run_sim(config_path: Path, dependency: int | None = None) -> int:
     init_id = watch_manager.dispatch_job()
 
     # run jobs
-    n_cpu = int(sim_config.job_config.slurm_opts['cpus_per_task'])
-    sim_cmd: str = ' '.join([str(cmd) for cmd in [
-        'bash', SUBMIT_SCRIPT_NAME,
-        f'"{sim_config.lammps_bin_path} {get_lammps_params(sim_config.model_name)}"',
-        PropertiesSimulator.LAMMPS_INPS_PATH,
-        PropertiesSimulator.PPS_PYTHON_PATH,
-        PropertiesSimulator.REF_DATA_PATH, n_cpu
-    ]])
+    sim_cmd: str = f'python {cli_path} --config {config_path} --run'
     sim_manager.set_job([sim_cmd], out_path, sim_config.job_config, dependency=init_id,
                         array_ids=list(range(1, sim_config.best_n_models+1)))
-    return sim_manager.dispatch_job()
+    sim_id = sim_manager.dispatch_job()
+
+    # summary job
+    collect_cmd: str = f'python {cli_path} --config {config_path} --collect'
+    watch_manager.set_job([collect_cmd], out_path, sim_config.job_config, dependency=sim_id)
+    return watch_manager.dispatch_job()
 
 if __name__ == '__main__':
     args: Namespace = parse_args()
@@ -204,8 +242,15 @@ if __name__ == '__main__':
     if args.noconversion:
         next_id = run_conv(conf_path, dependency=next_id)
 
+    tune_id: int | None = None
     if args.noinference:
-        run_inf(conf_path, dependency=next_id)
+        _, tune_id = run_inf(conf_path, dependency=next_id)
+
+    # the committee and the properties use the launch tuned by the inference benchmark
+    launch_id: int | None = tune_id if tune_id is not None else next_id
+
+    if args.nocommittee and MainSectionKW.COMMITTEE.value in ConfigReader(conf_path).config_data:
+        run_comm(conf_path, dependency=launch_id)
 
     if args.noproperties:
-        run_sim(conf_path, dependency=next_id)
+        run_sim(conf_path, dependency=launch_id)
@@ -0,0 +1,51 @@
+"""
+CLI entry point for running the committee of the best models.
+"""
+
+from argparse import Namespace, ArgumentParser
+from pathlib import Path
+
+from potline.utils import get_model_trackers, filter_best, get_bench_material
+from potline.config_reader import ConfigReader
+from potline.committee import Committee, COMMITTEE_DIR_NAME
+from potline.inference_bencher import get_structures
+from potline.model import get_lammps_params
+from potline.launch_tuner import LaunchConfig, LAUNCH_CONFIG_NAME
+
+def parse_config() -> Namespace:
+    """
+    Parse the command line arguments.
+    """
+    parser: ArgumentParser = ArgumentParser(description='Process some parameters.')
+    parser.add_argument('--config', type=str, help='Path to the config file')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args: Namespace = parse_config()
+    config_path: Path = Path(args.config).resolve()
+    opt_config = ConfigReader(config_path).get_optimizer_config()
+    gen_config = ConfigReader(config_path).get_general_config()
+    comm_config = ConfigReader(config_path).get_committee_config()
+
+    tracker_list = get_model_trackers(gen_config.sweep_path, gen_config.model_name)
+    best_trackers = filter_best(tracker_list, opt_config.energy_weight, comm_config.n_members,
+                                gen_config.selection, gen_config.sweep_path)
+
+    # the members are run with the tuned launch configuration of the inference benchmark, if any
+    launch_path: Path = comm_config.sweep_path / LAUNCH_CONFIG_NAME
+    lmp_args: list[str] = get_lammps_params(comm_config.model_name).split() \
+        + (LaunchConfig.load(launch_path).get_lammps_args().split() if launch_path.exists() else [])
+    committee = Committee([tracker.model.get_pot_path() for tracker in best_trackers],
+                          comm_config.sweep_path / COMMITTEE_DIR_NAME,
+                          comm_config.energy_threshold, comm_config.force_threshold, lmp_args)
+    committee.export()
+    material = get_bench_material(config_path)
+    structures = get_structures(material.structure,
+                                comm_config.lattice if comm_config.lattice is not None else material.lattice,
+                                material.mass, [comm_config.bulk_size])
+    samples = committee.run_md(structures[f'bulk_{comm_config.bulk_size}'], comm_config.temperature,
+                               comm_config.n_steps, comm_config.sample_interval, comm_config.timestep)
+    overhead = committee.bench_overhead(structures, comm_config.n_repeats)
+    summary = committee.save_summary(samples, overhead)
+    print(f'{summary["n_flagged"]} of {summary["n_samples"]} configurations flagged, '
+          f'committee overhead {summary["mean_overhead"]:.2f}x')
@@ -2,11 +2,18 @@
 CLI entry point for running model conversion.
 """
 
+import sys
 from argparse import Namespace, ArgumentParser
 from pathlib import Path
 
-from potline.utils import get_model_trackers, filter_best_loss
-from potline.config_reader import ConfigReader
+import pandas as pd
+
+from potline.utils import get_model_trackers, filter_best, get_bench_material
+from potline.config_reader import ConfigReader, MainSectionKW, VariantsKW, ValidationKW
+from potline.model import ModelConverter, get_lammps_params
+from potline.launch_tuner import LaunchConfig, LAUNCH_CONFIG_NAME
+from potline.inference_bencher import VariantSelector, get_structures
+from potline.validator import BatchEvaluator, VALIDATION_SUMMARY_NAME, save_validation
 
 def parse_config() -> Namespace:
     """
@@ -14,6 +21,7 @@ def parse_config() -> Namespace:
     """
     parser: ArgumentParser = ArgumentParser(description='Process some parameters.')
     parser.add_argument('--config', type=str, help='Path to the config file')
+    parser.add_argument('--force', action='store_true', help='Convert the models even if up to date')
     return parser.parse_args()
 
 if __name__ == '__main__':
@@ -21,10 +29,56 @@ if __name__ == '__main__':
     config_path: Path = Path(args.config).resolve()
     opt_config = ConfigReader(config_path).get_optimizer_config()
     gen_config = ConfigReader(config_path).get_general_config()
+    variants_config: dict | None = ConfigReader(config_path).get_bench_config().variants \
+        if MainSectionKW.INFERENCE.value in ConfigReader(config_path).config_data else None
 
     tracker_list = get_model_trackers(gen_config.sweep_path, gen_config.model_name)
-    best_trackers = filter_best_loss(tracker_list, opt_config.energy_weight, gen_config.best_n_models)
+    best_trackers = filter_best(tracker_list, opt_config.energy_weight, gen_config.best_n_models,
+                                gen_config.selection, gen_config.sweep_path)
+
+    converter = ModelConverter()
+    potentials = converter.convert([tracker.model for tracker in best_trackers], args.force)
+    if any(potential is None for potential in potentials.values()):
+        sys.exit(1)
+
+    # the variants and the validation use the same held-out test set
+    validation_config: dict = gen_config.validation or {}
+    evaluator = BatchEvaluator(
+        int(validation_config.get(ValidationKW.BATCH_SIZE.value, 64)),
+        validation_config.get(ValidationKW.ENERGY_KEY.value),
+        validation_config.get(ValidationKW.FORCES_KEY.value),
+    )
+    test_set: Path | pd.DataFrame | None = None
+    if variants_config is not None or gen_config.validation is not None:
+        dataset_path: str | None = validation_config.get(ValidationKW.DATASET_PATH.value)
+        test_set = Path(dataset_path) if dataset_path is not None \
+            else best_trackers[0].model.collect_test_set()
+        if test_set is None:
+            raise ValueError(f'No test set available for {gen_config.model_name}, '
+                             'set the validation dataset_path.')
+
+    if variants_config is not None and test_set is not None:
+        # the variants are timed with the tuned accelerator, if the launch was already tuned
+        launch_path: Path = gen_config.sweep_path / LAUNCH_CONFIG_NAME
+        lmp_args: list[str] = get_lammps_params(gen_config.model_name).split() \
+            + (LaunchConfig.load(launch_path).get_lammps_args().split() if launch_path.exists() else [])
+        material = get_bench_material(config_path)
+        selector = VariantSelector(
+            test_set,
+            evaluator,
+            get_structures(material.structure,
+                           float(variants_config.get(VariantsKW.LATTICE.value, material.lattice)),
+                           material.mass, [3]),
+            float(variants_config.get(VariantsKW.ENERGY_TOL.value, 1e-3)),
+            float(variants_config.get(VariantsKW.FORCE_TOL.value, 1e-2)),
+            int(variants_config.get(VariantsKW.N_REPEATS.value, 10)),
+            lmp_args,
+            converter,
+        )
+        for out_path, variant in selector.select([tracker.model for tracker in best_trackers]).items():
+            print(f'{out_path}: {variant} variant selected')
 
-    for tracker in best_trackers:
-        tracker.model.lampify()
-        tracker.model.create_potential()
+    if gen_config.validation is not None and test_set is not None:
+        raw_losses = evaluator.evaluate([tracker.model.get_pot_path() for tracker in best_trackers], test_set)
+        print(save_validation(raw_losses, opt_config.energy_weight,
+                              gen_config.sweep_path / VALIDATION_SUMMARY_NAME))
@@ -2,12 +2,14 @@
 CLI entry point for running deep training.
 """
 
+import sys
 from argparse import Namespace, ArgumentParser
 from pathlib import Path
 
-from potline.utils import get_model_trackers, filter_best_loss
-from potline.deep_trainer import DeepTrainer
-from potline.config_reader import ConfigReader
+from potline.utils import get_model_trackers, filter_best
+from potline.deep_trainer import DeepTrainer, CurveMonitor
+from potline.config_reader import ConfigReader, EarlyStoppingKW
+from potline.model import create_model, get_fit_cmd
 
 def parse_deep() -> Namespace:
     """
@@ -16,16 +18,34 @@ def parse_deep() -> Namespace:
     parser: ArgumentParser = ArgumentParser(description='Process some parameters.')
     parser.add_argument('--config', type=str, help='Path to the config file')
     parser.add_argument('--collect', action='store_true', help='Collect losses')
+    parser.add_argument('--monitor', action='store_true',
+                        help='Run the fit in the current directory, stopped early once converged')
     return parser.parse_args()
 
 if __name__ == '__main__':
     deep_args: Namespace = parse_deep()
     config_path: Path = Path(deep_args.config).resolve()
     deep_config = ConfigReader(config_path).get_deep_train_config()
+    gen_config = ConfigReader(config_path).get_general_config()
+
+    if deep_args.monitor:
+        stop_config: dict = deep_config.early_stopping or {}
+        top_k: int | None = stop_config.get(EarlyStoppingKW.TOP_K.value)
+        sys.exit(CurveMonitor(
+            create_model(deep_config.model_name, Path.cwd()),
+            deep_config.model_name,
+            deep_config.energy_weight,
+            float(stop_config.get(EarlyStoppingKW.MIN_IMPROVEMENT.value, 0.01)),
+            int(top_k) if top_k is not None else None,
+            int(stop_config.get(EarlyStoppingKW.MIN_POINTS.value, 10)),
+            float(stop_config.get(EarlyStoppingKW.INTERVAL.value, 300)),
+            deep_config.max_epochs,
+        ).run(get_fit_cmd(deep_config.model_name, deep=True)))
 
     tracker_list = get_model_trackers(deep_config.sweep_path, deep_config.model_name,
                                       force_from_hyp=not deep_args.collect)
-    best_trackers = filter_best_loss(tracker_list, deep_config.energy_weight, deep_config.best_n_models)
+    best_trackers = filter_best(tracker_list, deep_config.energy_weight, deep_config.best_n_models,
+                                gen_config.selection, gen_config.sweep_path)
 
     if not deep_args.collect:
         DeepTrainer(config_path, best_trackers).prep_deep()
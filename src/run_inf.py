@@ -5,9 +5,22 @@ CLI entry point for running inference benchmark.
 from argparse import Namespace, ArgumentParser
 from pathlib import Path
 
-from potline.utils import get_model_trackers, filter_best_loss
-from potline.inference_bencher import InferenceBencher
-from potline.config_reader import ConfigReader
+from potline.utils import get_model_trackers, filter_best, get_bench_material
+from potline.inference_bencher import (
+    InferenceBencher,
+    MicroBencher,
+    INFERENCE_BENCH_DIR_NAME,
+    LAMMPS_IN_NAME,
+    MICRO_BENCH_SUMMARY_NAME,
+    get_structures,
+    collect_micro_bench,
+    summarize_micro_bench,
+    )
+from potline.model import POTENTIAL_NAME, get_lammps_params
+from potline.launch_tuner import LaunchTuner, LAUNCH_CACHE_NAME
+from potline.perf_history import PerfHistory, write_machine_info
+from potline.config_reader import ConfigReader, MicroBenchKW, LaunchTuningKW
+from potline.stager import copy_atomic
 
 def parse_config() -> Namespace:
     """
@@ -15,6 +28,17 @@ def parse_config() -> Namespace:
     """
     parser: ArgumentParser = ArgumentParser(description='Process some parameters.')
     parser.add_argument('--config', type=str, help='Path to the config file')
+    parser.add_argument('--micro', action='store_true',
+                        help='Run the micro-benchmark of the potential in the current directory')
+    parser.add_argument('--micro_summary', type=str, nargs='*', default=None,
+                        help='Summarize the micro-benchmark results of this sweep and of the given sweeps')
+    parser.add_argument('--fingerprint', action='store_true',
+                        help='Record the machine and software stack of the benchmark '
+                        'in the current directory')
+    parser.add_argument('--collect', action='store_true',
+                        help='Add the benchmark results to the performance history and check for regressions')
+    parser.add_argument('--tune', action='store_true',
+                        help='Tune the launch configuration of LAMMPS on the current node')
     return parser.parse_args()
 
 if __name__ == '__main__':
@@ -22,8 +46,49 @@ if __name__ == '__main__':
     config_path: Path = Path(args.config).resolve()
     opt_config = ConfigReader(config_path).get_optimizer_config()
     gen_config = ConfigReader(config_path).get_general_config()
+    inf_config = ConfigReader(config_path).get_bench_config()
 
-    tracker_list = get_model_trackers(gen_config.sweep_path, gen_config.model_name)
-    best_trackers = filter_best_loss(tracker_list, opt_config.energy_weight, gen_config.best_n_models)
+    if args.micro:
+        micro_config: dict = inf_config.micro_bench or {}
+        material = get_bench_material(config_path)
+        structures = get_structures(material.structure,
+                                    float(micro_config.get(MicroBenchKW.LATTICE.value, material.lattice)),
+                                    material.mass,
+                                    list(micro_config.get(MicroBenchKW.BULK_SIZES.value, [2, 4, 8, 16])))
+        MicroBencher(Path.cwd() / POTENTIAL_NAME, inf_config.model_name,
+                     int(micro_config.get(MicroBenchKW.N_REPEATS.value, 20))).run(structures, Path.cwd())
+    elif args.micro_summary is not None:
+        sweep_paths: list[Path] = [inf_config.sweep_path] + [Path(path) for path in args.micro_summary]
+        summary = summarize_micro_bench(collect_micro_bench(sweep_paths))
+        summary.to_csv(inf_config.sweep_path / INFERENCE_BENCH_DIR_NAME / MICRO_BENCH_SUMMARY_NAME)
+        print(summary)
+    elif args.fingerprint:
+        write_machine_info(Path.cwd(), inf_config.lammps_bin_path, inf_config.model_name)
+    elif args.collect:
+        if inf_config.perf_history_path is None:
+            raise ValueError('No performance history path found in the inference configuration.')
+        perf_history = PerfHistory(inf_config.perf_history_path)
+        perf_history.ingest(inf_config.sweep_path, inf_config.model_name)
+        print(perf_history.trend_report())
+    else:
+        tracker_list = get_model_trackers(gen_config.sweep_path, gen_config.model_name)
+        best_trackers = filter_best(tracker_list, opt_config.energy_weight, gen_config.best_n_models,
+                                    gen_config.selection, gen_config.sweep_path)
 
-    InferenceBencher(config_path, best_trackers).prep_inf()
+        if not args.tune:
+            InferenceBencher(config_path, best_trackers).prep_inf()
+        else:
+            tune_config: dict = inf_config.launch_tuning or {}
+            LaunchTuner(
+                inf_config.model_name,
+                f'{inf_config.lammps_bin_path} {get_lammps_params(inf_config.model_name)}',
+                int(inf_config.job_config.slurm_opts['cpus_per_task']),
+                Path(tune_config.get(LaunchTuningKW.CACHE_PATH.value,
+                                     inf_config.sweep_path / LAUNCH_CACHE_NAME)),
+                tune_config.get(LaunchTuningKW.SUFFIXES.value),
+                int(tune_config.get(LaunchTuningKW.PROBE_STEPS.value, 20)),
+            ).run(best_trackers, Path.cwd() / LAMMPS_IN_NAME, Path.cwd(), inf_config.sweep_path)
+            # potentials of the benchmarks may depend on the number of ranks
+            for i, tracker in enumerate(best_trackers):
+                copy_atomic(tracker.model.get_pot_path(),
+                            inf_config.sweep_path / INFERENCE_BENCH_DIR_NAME / str(i+1) / POTENTIAL_NAME)
@@ -5,9 +5,23 @@ CLI entry point for running properties simulations.
 from argparse import Namespace, ArgumentParser
 from pathlib import Path
 
-from potline.utils import get_model_trackers, filter_best_loss
-from potline.properties_simulator import PropertiesSimulator
+from potline.utils import get_model_trackers, filter_best
+from potline.properties_simulator import (
+    PropertiesSimulator,
+    PROPERTIES_BENCH_DIR_NAME,
+    PROPERTIES_SUMMARY_NAME,
+    PropertyScorer,
+    PropertyPlotter,
+    PropertyCache,
+    PROPERTY_CACHE_DIR_NAME,
+    REF_MATERIAL,
+    get_materials,
+    collect_properties,
+    run_materials,
+    )
 from potline.config_reader import ConfigReader
+from potline.model import get_lammps_params
+from potline.launch_tuner import LaunchConfig, LAUNCH_CONFIG_NAME
 
 def parse_config() -> Namespace:
     """
@@ -15,6 +29,13 @@ def parse_config() -> Namespace:
     """
     parser: ArgumentParser = ArgumentParser(description='Process some parameters.')
     parser.add_argument('--config', type=str, help='Path to the config file')
+    parser.add_argument('--run', action='store_true',
+                        help='Run the properties simulations of the potential in the current directory')
+    parser.add_argument('--collect', action='store_true',
+                        help='Gather the properties of all the models of the sweep in one table '
+                        'and plot them')
+    parser.add_argument('--plot', action='store_true',
+                        help='Plot the properties of all the models of the sweep, only the outdated figures')
     return parser.parse_args()
 
 if __name__ == '__main__':
@@ -23,7 +44,44 @@ if __name__ == '__main__':
     opt_config = ConfigReader(config_path).get_optimizer_config()
     gen_config = ConfigReader(config_path).get_general_config()
 
-    tracker_list = get_model_trackers(gen_config.sweep_path, gen_config.model_name)
-    best_trackers = filter_best_loss(tracker_list, opt_config.energy_weight, gen_config.best_n_models)
+    if args.run:
+        sim_config = ConfigReader(config_path).get_prop_config()
+        launch_path: Path = sim_config.sweep_path / LAUNCH_CONFIG_NAME
+        lammps_cmd: str = f'{sim_config.lammps_bin_path} {get_lammps_params(sim_config.model_name)}'
+        cache_path: Path = sim_config.cache_path if sim_config.cache_path is not None \
+            else sim_config.sweep_path / PROPERTIES_BENCH_DIR_NAME / PROPERTY_CACHE_DIR_NAME
+        run_materials(
+            get_materials(sim_config.materials),
+            Path.cwd(),
+            lammps_cmd=lammps_cmd,
+            lmp_inps_path=PropertiesSimulator.LAMMPS_INPS_PATH,
+            launch=LaunchConfig.load(launch_path) if launch_path.exists() else None,
+            prescreen=sim_config.prescreen,
+            cache=PropertyCache(cache_path, lammps_cmd),
+        )
+    elif args.collect:
+        sim_config = ConfigReader(config_path).get_prop_config()
+        summary = collect_properties(gen_config.sweep_path)
+        # the reference data is of bcc Fe, the other materials are not scored nor plotted
+        reference = summary[(summary['element'] == REF_MATERIAL.element)
+                            & (summary['structure'] == REF_MATERIAL.structure)]
+        scorer = PropertyScorer(PropertiesSimulator.REF_DATA_PATH, sim_config.score_weights)
+        scores = scorer.score([Path(data_path) for data_path in reference['data_path']])
+        summary = summary.join(scores.set_index(reference.index))
+        summary.to_csv(gen_config.sweep_path / PROPERTIES_BENCH_DIR_NAME / PROPERTIES_SUMMARY_NAME,
+                       index=False)
+        print(summary)
+        PropertyPlotter(PropertiesSimulator.REF_DATA_PATH).plot_all(
+            [Path(data_path).parent for data_path in reference['data_path']])
+    elif args.plot:
+        summary = collect_properties(gen_config.sweep_path)
+        PropertyPlotter(PropertiesSimulator.REF_DATA_PATH).plot_all(
+            [Path(data_path).parent for data_path, element, structure
+             in zip(summary['data_path'], summary['element'], summary['structure'])
+             if element == REF_MATERIAL.element and structure == REF_MATERIAL.structure])
+    else:
+        tracker_list = get_model_trackers(gen_config.sweep_path, gen_config.model_name)
+        best_trackers = filter_best(tracker_list, opt_config.energy_weight, gen_config.best_n_models,
+                                    gen_config.selection, gen_config.sweep_path)
 
-    PropertiesSimulator(config_path, best_trackers).prep_sim()
+        PropertiesSimulator(config_path, best_trackers).prep_sim()
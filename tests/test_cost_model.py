@@ -0,0 +1,45 @@
+"""
+Tests of the inference cost model.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from potline.cost_model import InferenceCostModel
+
+def _cost(features: dict[str, float]) -> float:
+    return 2e-6 * (1 + features['n_functions'])**0.5 * (1 + features['cutoff'])**1.5
+
+SAMPLES: list[tuple[dict[str, float], float]] = [
+    (features, _cost(features)) for features in [
+        {'n_functions': n_functions, 'cutoff': cutoff}
+        for n_functions in [100.0, 400.0, 1600.0] for cutoff in [4.0, 5.0, 7.0]
+    ]
+]
+
+def test_fit_recovers_power_law():
+    model = InferenceCostModel.fit(SAMPLES, ridge=0.0)
+    assert model.feature_names == ['cutoff', 'n_functions']
+    np.testing.assert_allclose(model.coeffs, [math.log(2e-6), 1.5, 0.5], rtol=1e-8)
+    features = {'n_functions': 800.0, 'cutoff': 6.0}
+    assert model.predict(features) == pytest.approx(_cost(features), rel=1e-8)
+
+def test_predict_relative_to_median_cost():
+    model = InferenceCostModel.fit(SAMPLES, ridge=0.0)
+    median_features = {'n_functions': 400.0, 'cutoff': 5.0}
+    assert model.reference_cost == pytest.approx(_cost(median_features), rel=1e-8)
+    assert model.predict_relative(median_features) == pytest.approx(1.0, rel=1e-8)
+
+def test_save_and_load(tmp_path):
+    model = InferenceCostModel.fit(SAMPLES)
+    model.save(tmp_path / 'cost_model.yaml')
+    loaded = InferenceCostModel.load(tmp_path / 'cost_model.yaml')
+    features = {'n_functions': 200.0, 'cutoff': 4.5}
+    assert loaded.predict(features) == pytest.approx(model.predict(features))
+    assert loaded.reference_cost == model.reference_cost
+
+def test_fit_without_samples():
+    with pytest.raises(ValueError):
+        InferenceCostModel.fit([])
@@ -0,0 +1,28 @@
+"""
+Tests of the learning curve extrapolation of the deep training monitor.
+"""
+
+import numpy as np
+import pytest
+
+from potline.deep_trainer import fit_learning_curve
+
+EPOCHS: np.ndarray = np.arange(0, 101, 5, dtype=float)
+
+def _power_law(epochs: np.ndarray) -> np.ndarray:
+    return 0.1 + 2.0 * (epochs / 100)**-0.5
+
+def test_power_law_asymptote():
+    losses = np.append(5.0, _power_law(EPOCHS[1:])) # the evaluation at epoch 0 is not fitted
+    fit = fit_learning_curve(EPOCHS, losses)
+    assert fit is not None
+    assert fit[0] == 'power_law'
+    assert fit[1] == pytest.approx(0.1, abs=1e-6)
+
+def test_power_law_at_max_epochs():
+    fit = fit_learning_curve(EPOCHS[1:], _power_law(EPOCHS[1:]), max_epochs=400)
+    assert fit is not None
+    assert fit[1] == pytest.approx(_power_law(np.array(400.0)), rel=1e-6)
+
+def test_too_few_points():
+    assert fit_learning_curve(np.array([0.0, 1.0, 2.0]), np.array([3.0, 2.0, 1.5])) is None
@@ -0,0 +1,54 @@
+"""
+Tests of the vectorised EOS fitting.
+"""
+
+import numpy as np
+import pytest
+
+from potline.properties_simulator.eos_fit import EOS_FUNCTIONS, EOS_NAMES, fit_eos, fit_all_eos
+
+# bcc Fe like parameters (E0 in eV, B0 in eV/A^3, Bp, V0 in A^3 per atom)
+PARAMS: np.ndarray = np.array([[-8.3, 1.1, 4.5, 11.8]])
+VOLUMES: np.ndarray = np.linspace(0.9, 1.1, 15) * PARAMS[0, 3]
+
+@pytest.mark.parametrize('eos', EOS_NAMES)
+def test_jacobian_matches_finite_differences(eos):
+    vol = VOLUMES[None, :]
+    _, jac = EOS_FUNCTIONS[eos](PARAMS, vol)
+    for k in range(4):
+        step = np.zeros_like(PARAMS)
+        step[0, k] = 1e-6 * max(abs(PARAMS[0, k]), 1.0)
+        numeric = (EOS_FUNCTIONS[eos](PARAMS + step, vol)[0]
+                   - EOS_FUNCTIONS[eos](PARAMS - step, vol)[0]) / (2 * step[0, k])
+        np.testing.assert_allclose(jac[..., k], numeric, rtol=1e-5, atol=1e-8)
+
+def test_fit_recovers_birch_murnaghan():
+    energies, _ = EOS_FUNCTIONS['birch_murnaghan'](PARAMS, VOLUMES[None, :])
+    result = fit_eos(VOLUMES, energies[0])
+    assert result.converged.all()
+    np.testing.assert_allclose([result.e0[0], result.b0[0], result.bp[0], result.v0[0]], PARAMS[0],
+                               rtol=1e-6)
+    assert result.rmse[0] < 1e-8
+    np.testing.assert_allclose(result.a0, (2 * PARAMS[0, 3])**(1/3))
+
+def test_fit_batch_with_missing_points():
+    other = PARAMS * np.array([[1.0, 0.8, 1.1, 1.05]])
+    volumes = np.stack([VOLUMES, VOLUMES * 1.05])
+    energies = np.concatenate([EOS_FUNCTIONS['birch_murnaghan'](params[None, :], vol[None, :])[0]
+                               for params, vol in zip([PARAMS[0], other[0]], volumes)])
+    energies[1, 3] = np.nan
+    result = fit_eos(volumes, energies)
+    np.testing.assert_allclose(result.v0, [PARAMS[0, 3], other[0, 3]], rtol=1e-6)
+    np.testing.assert_allclose(result.b0, [PARAMS[0, 1], other[0, 1]], rtol=1e-5)
+
+def test_fit_all_eos_agree_on_the_minimum():
+    energies, _ = EOS_FUNCTIONS['birch_murnaghan'](PARAMS, VOLUMES[None, :])
+    results = fit_all_eos(VOLUMES, energies[0])
+    assert set(results) == set(EOS_NAMES)
+    for result in results.values():
+        np.testing.assert_allclose(result.v0, PARAMS[0, 3], rtol=1e-3)
+        np.testing.assert_allclose(result.e0, PARAMS[0, 0], rtol=1e-4)
+
+def test_unsupported_eos():
+    with pytest.raises(ValueError):
+        fit_eos(VOLUMES, VOLUMES, eos='unknown')
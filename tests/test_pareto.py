@@ -0,0 +1,52 @@
+"""
+Tests of the multi-objective selection of the models.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from potline.model_selector import pareto_ranks, hypervolume, crowding_distance, select_pareto, get_costs
+
+# front (1, 3), (2, 2), (3, 1), then (2, 3) and (3, 3) behind it
+POINTS: np.ndarray = np.array([[1.0, 3.0], [2.0, 2.0], [3.0, 1.0], [2.0, 3.0], [3.0, 3.0]])
+
+def test_pareto_ranks():
+    np.testing.assert_array_equal(pareto_ranks(POINTS), [0, 0, 0, 1, 2])
+
+def test_hypervolume_of_a_known_front():
+    # staircase of the front under (4, 4): 3*1 + 2*1 + 1*1
+    assert hypervolume(POINTS[:3], np.array([4.0, 4.0])) == 6.0
+    # the dominated points add nothing
+    assert hypervolume(POINTS, np.array([4.0, 4.0])) == 6.0
+    assert hypervolume(POINTS, np.array([0.5, 0.5])) == 0.0
+
+def test_hypervolume_3d_box():
+    assert hypervolume(np.array([[1.0, 1.0, 1.0]]), np.array([2.0, 3.0, 4.0])) == 6.0
+
+def test_crowding_distance():
+    distance = crowding_distance(POINTS[:3])
+    assert np.isinf(distance[0]) and np.isinf(distance[2])
+    assert distance[1] == 2.0
+
+def test_select_pareto_front_first():
+    assert sorted(select_pareto(POINTS, 3, 'crowding')) == [0, 1, 2]
+    assert sorted(select_pareto(POINTS, 4, 'hypervolume')) == [0, 1, 2, 3]
+    assert select_pareto(POINTS, 10, 'crowding') == [0, 1, 2, 3, 4]
+
+def _tracker(subiter: int, predicted_cost: float | None) -> SimpleNamespace:
+    return SimpleNamespace(iteration=1, subiter=subiter, predicted_cost=predicted_cost)
+
+def test_get_costs_measured_and_predicted():
+    models = [_tracker(1, 1.0), _tracker(2, 2.0), _tracker(3, 3.0), _tracker(4, 4.0)]
+    # measured costs are 10 times the predicted ones, the others are scaled alike
+    assert get_costs(models, {(1, 1): 10.0, (1, 2): 20.0}) == [10.0, 20.0, 30.0, 40.0]
+    assert get_costs(models, {}) == [1.0, 2.0, 3.0, 4.0]
+
+def test_get_costs_without_common_models():
+    models = [_tracker(1, None), _tracker(2, 1.0), _tracker(3, 3.0)]
+    # median measured 4 over median predicted 2
+    assert get_costs(models, {(1, 1): 4.0}) == [4.0, 2.0, 6.0]
+
+def test_get_costs_missing():
+    assert get_costs([_tracker(1, None), _tracker(2, 1.0)], {}) is None
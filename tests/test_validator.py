@@ -0,0 +1,33 @@
+"""
+Tests of the errors of the batched validation.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from potline.model import RawLosses
+from potline.validator import validator
+
+def _batch(atom_counts: list[int], energies: list[float], forces: np.ndarray) -> validator.TestBatch:
+    return validator.TestBatch([[SimpleNamespace()] * n for n in atom_counts], np.array(energies), forces)
+
+def test_get_raw_losses():
+    batch = _batch([1, 2], [-4.0, -8.0], np.zeros((3, 3)))
+    forces = np.array([[0.3, 0.0, 0.0], [0.0, 0.6, 0.0], [0.0, 0.0, 0.0]])
+    raw = validator.get_raw_losses(batch, np.array([-3.0, -9.0]), forces)
+    np.testing.assert_allclose(raw.energies, [1.0, -0.5])
+    np.testing.assert_allclose(raw.forces, [np.sqrt(0.09 / 3), np.sqrt(0.36 / 6)])
+    np.testing.assert_allclose(raw.atom_counts, [1.0, 2.0])
+
+def test_raw_losses_are_weighted_by_atoms():
+    losses = RawLosses([1.0, -0.5], [0.3, 0.6], [1.0, 2.0]).get_losses()
+    assert losses.energy == pytest.approx(np.sqrt((1.0 + 0.25) / 2))
+    assert losses.force == pytest.approx(np.sqrt((0.09 + 2 * 0.36) / 3))
+
+def test_exact_potential_has_no_error():
+    forces = np.arange(9, dtype=float).reshape(3, 3)
+    batch = _batch([3], [-12.0], forces)
+    raw = validator.get_raw_losses(batch, np.array([-12.0]), forces.copy())
+    assert raw.energies == [0.0] and raw.forces == [0.0]